@@ -0,0 +1,488 @@
+import bisect
+import hashlib
+import mmap
+import os
+import re
+import struct
+import zlib
+from collections import Counter
+from urllib.parse import urlparse
+
+# Built-in ad and tracker rules, always compiled in ahead of any filter lists
+DEFAULT_FILTERS = [
+    "||doubleclick.net^", "||googleadservices.com^", "||googlesyndication.com^",
+    "||amazon-adsystem.com^", "||ads.yahoo.com^", "||facebook.com/tr",
+    "||google-analytics.com^", "||googletagmanager.com^"
+]
+
+FILTER_LIST_DIR = "filter_lists"
+CACHE_FILE = "adblock.cache"
+
+# Binary index layout: header, then 8-byte aligned sections
+#   block hosts    uint64[]  sorted hashes of blocked host names
+#   allow hosts    uint64[]  sorted hashes of @@||host^ exceptions
+#   block tokens   uint32[]  sorted token hashes of blocking URL patterns
+#   block rules    uint32[]  rule index for each entry in block tokens
+#   allow tokens   uint32[]  same for exception patterns
+#   allow rules    uint32[]
+#   rule offsets   uint32[]  n_rules + 1 offsets into the rule text blob
+#   rule text      bytes     utf-8 rule bodies, compiled lazily on first hit
+CACHE_MAGIC = b"NBFILTR1"
+CACHE_VERSION = 1
+_HEADER = struct.Struct("<8sI32s" + "II" * 8)
+_SECTIONS = ("block_hosts", "allow_hosts", "block_tokens", "block_rules",
+             "allow_tokens", "allow_rules", "rule_offsets", "rule_text")
+_SECTION_TYPES = ("Q", "Q", "I", "I", "I", "I", "I", "B")
+
+# Tokens are maximal runs of these characters in a lowercased URL
+_TOKEN_RE = re.compile(r"[a-z0-9%]{2,}")
+_HOST_RE = re.compile(r"^[a-z0-9][a-z0-9.-]*[a-z0-9]$")
+_COMMON_TOKENS = frozenset(["http", "https", "www", "com", "net", "org", "js", "html"])
+_HOSTS_ADDRESSES = frozenset(["0.0.0.0", "127.0.0.1", "::", "::0", "::1"])
+_HOSTS_IGNORED = frozenset([
+    "localhost", "localhost.localdomain", "local", "broadcasthost", "0.0.0.0"
+])
+
+# Resource types understood in $options; anything else in the option list
+# makes the rule unsupported and it is dropped at compile time
+RESOURCE_TYPES = frozenset([
+    "script", "image", "stylesheet", "object", "xmlhttprequest", "subdocument",
+    "ping", "media", "font", "other", "websocket"
+])
+_OPTION_ALIASES = {
+    "xhr": "xmlhttprequest", "frame": "subdocument", "css": "stylesheet",
+    "3p": "third-party", "1p": "~third-party", "first-party": "~third-party",
+}
+_IGNORED_OPTIONS = frozenset(["important", "match-case", "all"])
+
+
+def _host_hash(host):
+    return int.from_bytes(hashlib.blake2b(host.encode(), digest_size=8).digest(), "little")
+
+
+def _token_hash(token):
+    # Token hits are always verified against the rule itself, so a 32-bit
+    # hash is enough; collisions only cost an extra rule check
+    return zlib.crc32(token.encode())
+
+
+def _base_domain(host):
+    labels = host.split(".")
+    if (len(labels) >= 3 and len(labels[-1]) == 2
+            and labels[-2] in ("co", "com", "net", "org", "gov", "ac", "edu")):
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith("." + domain)
+
+
+class FilterRule:
+    """A single URL pattern rule, compiled from Adblock Plus syntax."""
+
+    def __init__(self, text):
+        pattern, options = text, ""
+        dollar = text.rfind("$")
+        if dollar > 0 and "/" not in text[dollar:]:
+            pattern, options = text[:dollar], text[dollar + 1:]
+
+        self.third_party = None
+        self.include_types = set()
+        self.exclude_types = set()
+        self.include_domains = []
+        self.exclude_domains = []
+        self.supported = self._parse_options(options)
+
+        self.substring = None
+        self.regex = None
+        if not any(ch in pattern for ch in "|*^"):
+            self.substring = pattern
+        else:
+            self.regex = re.compile(_pattern_to_regex(pattern))
+
+    def _parse_options(self, options):
+        for option in filter(None, options.lower().split(",")):
+            option = _OPTION_ALIASES.get(option, option)
+            if option in _IGNORED_OPTIONS:
+                continue
+            if option == "third-party":
+                self.third_party = True
+            elif option == "~third-party":
+                self.third_party = False
+            elif option.startswith("domain="):
+                for domain in option[7:].split("|"):
+                    if domain.startswith("~"):
+                        self.exclude_domains.append(domain[1:])
+                    elif domain:
+                        self.include_domains.append(domain)
+            elif option in RESOURCE_TYPES:
+                self.include_types.add(option)
+            elif option.startswith("~") and option[1:] in RESOURCE_TYPES:
+                self.exclude_types.add(option[1:])
+            else:
+                return False
+        return True
+
+    def matches(self, url, host, first_party_host, resource_type):
+        if self.include_types and resource_type not in self.include_types:
+            return False
+        if resource_type in self.exclude_types:
+            return False
+        if self.third_party is not None and first_party_host:
+            is_third_party = _base_domain(host) != _base_domain(first_party_host)
+            if is_third_party != self.third_party:
+                return False
+        if self.include_domains or self.exclude_domains:
+            if not first_party_host:
+                return False
+            if self.include_domains and not any(
+                    _host_matches(first_party_host, d) for d in self.include_domains):
+                return False
+            if any(_host_matches(first_party_host, d) for d in self.exclude_domains):
+                return False
+        if self.substring is not None:
+            return self.substring in url
+        return self.regex.search(url) is not None
+
+
+def _pattern_to_regex(pattern):
+    parts = []
+    if pattern.startswith("||"):
+        parts.append(r"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?")
+        pattern = pattern[2:]
+    elif pattern.startswith("|"):
+        parts.append("^")
+        pattern = pattern[1:]
+    end = ""
+    if pattern.endswith("|"):
+        end = "$"
+        pattern = pattern[:-1]
+    for ch in pattern:
+        if ch == "*":
+            parts.append(".*")
+        elif ch == "^":
+            parts.append(r"(?:[^a-z0-9_\-.%]|$)")
+        else:
+            parts.append(re.escape(ch))
+    return "".join(parts) + end
+
+
+def _rule_tokens(pattern):
+    """List the tokens a URL must contain for this pattern to match.
+
+    Only runs bounded by separators or anchors on both sides qualify, since
+    the URL is split into maximal runs when matching. Patterns without any
+    such token are checked against every URL.
+    """
+    dollar = pattern.rfind("$")
+    if dollar > 0 and "/" not in pattern[dollar:]:
+        pattern = pattern[:dollar]
+    start_anchored = pattern.startswith("|")
+    end_anchored = pattern.endswith("|")
+    body = pattern.strip("|")
+
+    tokens = []
+    for match in _TOKEN_RE.finditer(body):
+        start, end = match.span()
+        if start > 0 and body[start - 1] == "*":
+            continue
+        if start == 0 and not start_anchored:
+            continue
+        if end < len(body) and body[end] == "*":
+            continue
+        if end == len(body) and not end_anchored:
+            continue
+        tokens.append(match.group())
+    return tokens
+
+
+def _pick_token(tokens, frequency):
+    # The rarest token across the list keeps each index bucket short
+    if not tokens:
+        return None
+    return min(tokens, key=lambda t: (t in _COMMON_TOKENS, frequency[t], -len(t)))
+
+
+def parse_filter_line(line):
+    """Classify one filter list line.
+
+    Returns (kind, exception, value) where kind is "host" or "pattern", or
+    None for comments, cosmetic filters and unsupported rules. Both
+    Adblock Plus / EasyList syntax and hosts-file lines are accepted.
+    """
+    line = line.strip()
+    if not line or line[0] in "!#[":
+        return None
+
+    fields = line.split()
+    if len(fields) >= 2 and fields[0] in _HOSTS_ADDRESSES:
+        host = fields[1].lower().rstrip(".")
+        if host in _HOSTS_IGNORED or not _HOST_RE.match(host):
+            return None
+        return ("host", False, host)
+
+    if "##" in line or "#@#" in line or "#?#" in line or "#$#" in line:
+        return None
+
+    exception = line.startswith("@@")
+    if exception:
+        line = line[2:]
+    line = line.lower()
+    if len(line) > 1 and line.startswith("/") and line.endswith("/"):
+        return None  # regular expression rules are not supported
+
+    if line.startswith("||") and line.endswith("^"):
+        host = line[2:-1]
+        if _HOST_RE.match(host):
+            return ("host", exception, host)
+
+    if not FilterRule(line).supported:
+        return None
+    return ("pattern", exception, line)
+
+
+def _fingerprint(paths):
+    digest = hashlib.sha256(b"%d" % CACHE_VERSION)
+    digest.update("\n".join(DEFAULT_FILTERS).encode())
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return digest.digest()
+
+
+def _iter_list_lines(paths):
+    yield from DEFAULT_FILTERS
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            yield from f
+
+
+def compile_filter_lists(paths, fingerprint=None):
+    """Compile filter list files into the binary index format."""
+    block_hosts, allow_hosts = set(), set()
+    rule_texts, rule_ids = [], {}
+    patterns = []
+    frequency = Counter()
+
+    for line in _iter_list_lines(paths):
+        parsed = parse_filter_line(line)
+        if parsed is None:
+            continue
+        kind, exception, value = parsed
+        if kind == "host":
+            (allow_hosts if exception else block_hosts).add(_host_hash(value))
+            continue
+
+        rule_id = rule_ids.get(value)
+        if rule_id is None:
+            rule_id = rule_ids[value] = len(rule_texts)
+            rule_texts.append(value.encode())
+        tokens = _rule_tokens(value)
+        frequency.update(tokens)
+        patterns.append((exception, rule_id, tokens))
+
+    block_tokens, allow_tokens = [], []
+    for exception, rule_id, tokens in patterns:
+        token = _pick_token(tokens, frequency)
+        token_hash = 0 if token is None else _token_hash(token)
+        (allow_tokens if exception else block_tokens).append((token_hash, rule_id))
+    block_tokens.sort()
+    allow_tokens.sort()
+    offsets = [0]
+    for text in rule_texts:
+        offsets.append(offsets[-1] + len(text))
+
+    sections = [
+        struct.pack(f"<{len(block_hosts)}Q", *sorted(block_hosts)),
+        struct.pack(f"<{len(allow_hosts)}Q", *sorted(allow_hosts)),
+        struct.pack(f"<{len(block_tokens)}I", *(t for t, _ in block_tokens)),
+        struct.pack(f"<{len(block_tokens)}I", *(r for _, r in block_tokens)),
+        struct.pack(f"<{len(allow_tokens)}I", *(t for t, _ in allow_tokens)),
+        struct.pack(f"<{len(allow_tokens)}I", *(r for _, r in allow_tokens)),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        b"".join(rule_texts),
+    ]
+
+    layout = []
+    position = _HEADER.size
+    for data in sections:
+        position += -position % 8
+        layout.extend((position, len(data)))
+        position += len(data)
+
+    out = bytearray(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION,
+                                 fingerprint or bytes(32), *layout))
+    for (offset, _), data in zip(zip(layout[::2], layout[1::2]), sections):
+        out.extend(bytes(offset - len(out)))
+        out.extend(data)
+    return bytes(out)
+
+
+class CompiledIndex:
+    """Read-only view over a compiled index held in bytes or an mmap."""
+
+    def __init__(self, buffer):
+        header = _HEADER.unpack_from(buffer, 0)
+        magic, version, self.fingerprint = header[:3]
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError("not a compiled filter index")
+
+        self.buffer = buffer
+        view = memoryview(buffer)
+        layout = header[3:]
+        for i, (name, typecode) in enumerate(zip(_SECTIONS, _SECTION_TYPES)):
+            offset, length = layout[2 * i], layout[2 * i + 1]
+            setattr(self, name, view[offset:offset + length].cast(typecode))
+        self.rule_count = len(self.rule_offsets) - 1
+        self._rules = {}
+
+    def host_listed(self, table, host_hash):
+        i = bisect.bisect_left(table, host_hash)
+        return i < len(table) and table[i] == host_hash
+
+    def candidates(self, tokens, rules, token_hashes):
+        # Rules without a token are stored under hash 0 and always checked
+        for token_hash in (0, *token_hashes):
+            i = bisect.bisect_left(tokens, token_hash)
+            while i < len(tokens) and tokens[i] == token_hash:
+                yield rules[i]
+                i += 1
+
+    def rule(self, rule_id):
+        rule = self._rules.get(rule_id)
+        if rule is None:
+            start, end = self.rule_offsets[rule_id], self.rule_offsets[rule_id + 1]
+            rule = FilterRule(bytes(self.rule_text[start:end]).decode())
+            self._rules[rule_id] = rule
+        return rule
+
+
+class FilterEngine:
+    """Request filter backed by a compiled, optionally memory-mapped index.
+
+    Host rules (||example.com^ and hosts-file entries) are looked up by
+    hashing each suffix of the request host and binary-searching a sorted
+    hash table. Other URL patterns are indexed by one token they require,
+    so only rules sharing a token with the URL are evaluated.
+    """
+
+    def __init__(self, index=None):
+        self.enabled = True
+        self.index = index or CompiledIndex(compile_filter_lists([]))
+        self._host_cache = {}
+
+    @property
+    def rule_count(self):
+        index = self.index
+        return (len(index.block_hosts) + len(index.allow_hosts)
+                + len(index.block_rules) + len(index.allow_rules))
+
+    def set_index(self, index):
+        self.index = index
+        self._host_cache = {}
+
+    def load_lists(self, list_dir=FILTER_LIST_DIR, cache_path=CACHE_FILE):
+        """Load the compiled index for list_dir, recompiling if it is stale."""
+        self.set_index(load_filter_index(list_dir, cache_path))
+
+    def _host_state(self, host):
+        # 1 = blocked host, -1 = excepted host, 0 = no host rule
+        state = self._host_cache.get(host)
+        if state is not None:
+            return state
+        index = self.index
+        state = 0
+        suffix = host
+        while suffix:
+            suffix_hash = _host_hash(suffix)
+            if index.host_listed(index.allow_hosts, suffix_hash):
+                state = -1
+                break
+            if not state and index.host_listed(index.block_hosts, suffix_hash):
+                state = 1
+            dot = suffix.find(".")
+            suffix = suffix[dot + 1:] if dot >= 0 else ""
+        if len(self._host_cache) > 4096:
+            self._host_cache.clear()
+        self._host_cache[host] = state
+        return state
+
+    def _pattern_hit(self, tokens, rules, token_hashes, url, host,
+                     first_party_host, resource_type):
+        index = self.index
+        for rule_id in index.candidates(tokens, rules, token_hashes):
+            if index.rule(rule_id).matches(url, host, first_party_host, resource_type):
+                return True
+        return False
+
+    def should_block(self, url, host=None, first_party_host="", resource_type=None):
+        if not self.enabled:
+            return False
+        url = url.lower()
+        if host is None:
+            host = urlparse(url).hostname or ""
+        host = host.lower()
+        first_party_host = (first_party_host or "").lower()
+
+        host_state = self._host_state(host) if host else 0
+        if host_state < 0:
+            return False
+
+        index = self.index
+        token_hashes = {_token_hash(t) for t in _TOKEN_RE.findall(url)}
+        if host_state == 0 and not self._pattern_hit(
+                index.block_tokens, index.block_rules, token_hashes,
+                url, host, first_party_host, resource_type):
+            return False
+
+        return not self._pattern_hit(
+            index.allow_tokens, index.allow_rules, token_hashes,
+            url, host, first_party_host, resource_type)
+
+    def should_block_url(self, url):
+        return self.should_block(url)
+
+
+def list_filter_files(list_dir=FILTER_LIST_DIR):
+    if not os.path.isdir(list_dir):
+        return []
+    return sorted(os.path.join(list_dir, name) for name in os.listdir(list_dir)
+                  if name.endswith((".txt", ".hosts")) or name == "hosts")
+
+
+def load_filter_index(list_dir=FILTER_LIST_DIR, cache_path=CACHE_FILE):
+    """Open the cached index for the lists in list_dir via mmap.
+
+    The cache is rebuilt when any list file is added, removed or modified,
+    so the text lists are only parsed once per change.
+    """
+    paths = list_filter_files(list_dir)
+    fingerprint = _fingerprint(paths)
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            index = _open_cache(cache_path)
+            if index.fingerprint == fingerprint:
+                return index
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Ignoring invalid filter cache {cache_path}: {e}")
+
+    data = compile_filter_lists(paths, fingerprint)
+    if not cache_path:
+        return CompiledIndex(data)
+    try:
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, cache_path)
+        return _open_cache(cache_path)
+    except OSError as e:
+        print(f"Error writing filter cache: {e}")
+        return CompiledIndex(data)
+
+
+def _open_cache(cache_path):
+    with open(cache_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return CompiledIndex(mapped)
@@ -0,0 +1,276 @@
+import json
+import os
+import re
+import time
+
+from PyQt5.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt5.QtWebEngineWidgets import QWebEngineProfile, QWebEngineView
+
+from single_instance import normalize_url
+
+POOL_SIZE = 4  # pages rendering at once
+PAGE_TIMEOUT = 30  # seconds for a page to load and be saved
+VIEWPORT = (1280, 800)
+SETTLE_DELAY = 100  # ms between loadFinished and the screenshot, for the first paint
+FORMATS = ("png", "html", "pdf")
+RESULTS_FILE = "results.jsonl"
+SUMMARY_FILE = "summary.json"
+
+
+def read_urls(path):
+    """Yield URLs from a file, one per line, without reading it all at once."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield normalize_url(line)
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class RenderJob:
+    __slots__ = ("index", "url", "name", "started", "load_ms", "pending", "files", "error",
+                 "pdf_path")
+
+    def __init__(self, index, url):
+        self.index = index
+        self.url = url
+        host = re.sub(r'[^A-Za-z0-9.-]+', '_', QUrl(url).host() or "page")
+        self.name = f"{index:05d}-{host}"
+        self.started = time.perf_counter()
+        self.load_ms = None
+        self.pending = 0  # outputs still being written
+        self.files = []
+        self.error = None
+        self.pdf_path = None
+
+
+class RenderSlot:
+    """One view and page of the pool, and the job it is working on."""
+
+    def __init__(self):
+        self.view = None
+        self.page = None
+        self.job = None
+        self.timer = None
+
+
+class BatchRenderer(QObject):
+    """Renders a stream of URLs headless through a fixed pool of pages.
+
+    pool_size views, each with a page from create_page(parent, profile),
+    are created once and reused: every finished URL hands its slot the
+    next one from the iterator, so memory stays flat however long the list
+    is. Each page gets the requested formats written to out_dir as
+    <index>-<host>.png/.html/.pdf. Results go to results.jsonl as they
+    finish, and the summary to summary.json. The pages share one
+    off-the-record profile, so nothing is left in the browser's profile.
+    """
+    finished = pyqtSignal()
+
+    def __init__(self, urls, out_dir, create_page, pool_size=POOL_SIZE, formats=("png",),
+                 timeout=PAGE_TIMEOUT, viewport=VIEWPORT, settle=SETTLE_DELAY, parent=None):
+        super().__init__(parent)
+        self.urls = enumerate(urls, 1)
+        self.out_dir = out_dir
+        self.create_page = create_page
+        self.formats = set(formats)
+        self.timeout = timeout
+        self.viewport = viewport
+        self.settle = settle
+        os.makedirs(out_dir, exist_ok=True)
+
+        self.load_times = []
+        self.failures = []  # (url, error)
+        self.completed = 0
+        self.started = None
+        self.summary = None
+        self.results = open(os.path.join(out_dir, RESULTS_FILE), 'w')
+
+        # A profile without a storage name is off the record
+        self.profile = QWebEngineProfile(self)
+        self.slots = [self.create_slot() for _ in range(max(1, pool_size))]
+
+    def create_slot(self):
+        slot = RenderSlot()
+        slot.view = QWebEngineView()
+        slot.view.resize(*self.viewport)
+        if "png" in self.formats:
+            # Views that were never shown don't paint
+            slot.view.show()
+        slot.timer = QTimer(self)
+        slot.timer.setSingleShot(True)
+        slot.timer.timeout.connect(lambda: self.timed_out(slot))
+        self.attach_page(slot)
+        return slot
+
+    def attach_page(self, slot):
+        old_page = slot.page
+        slot.page = self.create_page(slot.view, self.profile)
+        slot.page.loadFinished.connect(lambda ok: self.load_finished(slot, ok))
+        slot.page.pdfPrintingFinished.connect(lambda path, ok: self.pdf_finished(slot, path, ok))
+        slot.view.setPage(slot.page)
+        if old_page is not None:
+            old_page.loadFinished.disconnect()
+            old_page.pdfPrintingFinished.disconnect()
+            old_page.deleteLater()
+
+    def start(self):
+        self.started = time.perf_counter()
+        for slot in self.slots:
+            self.next_url(slot)
+
+    def next_url(self, slot):
+        try:
+            index, url = next(self.urls)
+        except StopIteration:
+            slot.job = None
+            if all(other.job is None for other in self.slots):
+                self.finish()
+            return
+        slot.job = RenderJob(index, url)
+        slot.timer.start(int(self.timeout * 1000))
+        slot.page.setUrl(QUrl(url))
+
+    def load_finished(self, slot, ok):
+        job = slot.job
+        if job is None or job.load_ms is not None:
+            return  # A late signal, or a load started by the page itself
+        job.load_ms = (time.perf_counter() - job.started) * 1000
+        if not ok:
+            self.job_done(slot, "load failed")
+            return
+
+        base = os.path.join(self.out_dir, job.name)
+        if "html" in self.formats:
+            job.pending += 1
+            slot.page.toHtml(lambda html: self.save_html(slot, job, base + ".html", html))
+        if "pdf" in self.formats:
+            job.pending += 1
+            job.pdf_path = base + ".pdf"
+            slot.page.printToPdf(job.pdf_path)
+        if "png" in self.formats:
+            job.pending += 1
+            QTimer.singleShot(self.settle, lambda: self.save_png(slot, job, base + ".png"))
+        if not job.pending:
+            self.job_done(slot)
+
+    def save_html(self, slot, job, path, html):
+        if slot.job is not job:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            self.output_done(slot, job, path)
+        except OSError as e:
+            self.output_done(slot, job, error=f"Error saving HTML: {e}")
+
+    def save_png(self, slot, job, path):
+        if slot.job is not job:
+            return
+        if slot.view.grab().save(path, "PNG"):
+            self.output_done(slot, job, path)
+        else:
+            self.output_done(slot, job, error="Error saving screenshot")
+
+    def pdf_finished(self, slot, path, ok):
+        job = slot.job
+        if job is None or path != job.pdf_path:
+            return
+        if ok:
+            self.output_done(slot, job, path)
+        else:
+            self.output_done(slot, job, error="Error printing PDF")
+
+    def output_done(self, slot, job, path=None, error=None):
+        if slot.job is not job:
+            return  # The job timed out meanwhile
+        job.pending -= 1
+        if path:
+            job.files.append(os.path.basename(path))
+        job.error = job.error or error
+        if job.pending == 0:
+            self.job_done(slot)
+
+    def timed_out(self, slot):
+        if slot.job is None:
+            return
+        # The page may still be busy with the old URL; start over with a new one
+        self.attach_page(slot)
+        self.job_done(slot, f"timed out after {self.timeout} s")
+
+    def job_done(self, slot, error=None):
+        job = slot.job
+        slot.timer.stop()
+        job.error = job.error or error
+        total_ms = (time.perf_counter() - job.started) * 1000
+        self.completed += 1
+        if job.error:
+            self.failures.append((job.url, job.error))
+            print(f"Error rendering {job.url}: {job.error}")
+        else:
+            self.load_times.append(job.load_ms)
+        self.results.write(json.dumps({
+            'index': job.index, 'url': job.url, 'ok': job.error is None, 'error': job.error,
+            'load_ms': job.load_ms, 'total_ms': total_ms, 'files': job.files,
+        }) + "\n")
+        # Not from inside the page's own signal
+        slot.job = None
+        QTimer.singleShot(0, lambda: self.next_url(slot))
+
+    def finish(self):
+        if self.summary is not None:
+            return
+        elapsed = time.perf_counter() - self.started
+        self.results.close()
+        self.summary = {
+            'pages': self.completed,
+            'failed': len(self.failures),
+            'elapsed_s': elapsed,
+            'pages_per_s': self.completed / elapsed if elapsed else 0,
+            'load_p50_ms': percentile(self.load_times, 0.5),
+            'load_p95_ms': percentile(self.load_times, 0.95),
+            'pool_size': len(self.slots),
+        }
+        try:
+            with open(os.path.join(self.out_dir, SUMMARY_FILE), 'w') as f:
+                json.dump(self.summary, f, indent=2)
+        except OSError as e:
+            print(f"Error saving batch summary: {e}")
+
+        # Pages have to go before the profile they use
+        for slot in self.slots:
+            slot.page.deleteLater()
+            slot.view.deleteLater()
+        QTimer.singleShot(0, self.finished.emit)
+
+    def report(self):
+        summary = self.summary
+        lines = [f"Rendered {summary['pages']} pages in {summary['elapsed_s']:.1f} s "
+                 f"with {summary['pool_size']} pages: {summary['pages_per_s']:.1f} pages/s"]
+        if self.load_times:
+            lines.append(f"Load time p50 {summary['load_p50_ms']:.0f} ms, "
+                         f"p95 {summary['load_p95_ms']:.0f} ms")
+        lines.append(f"{summary['failed']} failed")
+        lines += [f"  {url}: {error}" for url, error in self.failures[:20]]
+        return "\n".join(lines)
+
+
+def run_batch(app, urls_path, out_dir, create_page, pool_size=POOL_SIZE, formats=("png",),
+              timeout=PAGE_TIMEOUT, viewport=VIEWPORT):
+    """Render every URL in urls_path and return the process exit code."""
+    if not os.path.isfile(urls_path):
+        print(f"Error: URL list {urls_path} not found")
+        return 2
+    renderer = BatchRenderer(read_urls(urls_path), out_dir, create_page, pool_size, formats,
+                             timeout, viewport)
+    renderer.finished.connect(app.quit)
+    QTimer.singleShot(0, renderer.start)
+    app.exec_()
+    print(renderer.report())
+    return 1 if renderer.failures else 0
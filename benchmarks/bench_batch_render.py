@@ -0,0 +1,95 @@
+"""Headless batch rendering throughput for several page pool sizes.
+
+Serves generated pages from a ThreadingHTTPServer on localhost, with
+--latency ms of simulated server time per response, writes a URL list of
+--pages of them plus --broken unreachable ones, and runs
+`browser_ver_2.0.py --batch` over it once per --pool size. Reports the
+renderer's own pages/s, p50/p95 load times and failures from summary.json,
+and the wall clock of the whole process including start-up.
+
+    python benchmarks/bench_batch_render.py --pages 200 --pool 1 4 8 --formats png,html
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BROWSER = os.path.join(ROOT, "browser_ver_2.0.py")
+SUMMARY_FILE = "summary.json"  # written by batch_render.py
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    paragraphs = 50
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = "".join(f"<p>Paragraph {i} of {self.path}</p>" for i in range(self.paragraphs))
+        page = (f"<!DOCTYPE html><html><head><title>Fixture {self.path}</title></head>"
+                f"<body><h1>{self.path}</h1>{body}</body></html>").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--broken", type=int, default=2,
+                        help="unreachable URLs mixed in, reported as failures")
+    parser.add_argument("--pool", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--formats", default="png")
+    parser.add_argument("--latency", type=float, default=50, help="ms per response")
+    args = parser.parse_args()
+
+    FixtureHandler.latency = args.latency / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        urls_path = os.path.join(tmp, "urls.txt")
+        with open(urls_path, 'w') as f:
+            for i in range(args.pages):
+                f.write(f"{base_url}/page/{i}\n")
+                if args.broken and i % max(1, args.pages // args.broken) == 0:
+                    # Nothing listens on port 9
+                    f.write(f"http://127.0.0.1:9/broken/{i}\n")
+
+        env = dict(os.environ, XDG_DATA_HOME=tmp)
+        try:
+            for pool in args.pool:
+                out_dir = os.path.join(tmp, f"out-{pool}")
+                start = time.perf_counter()
+                process = subprocess.run(
+                    [sys.executable, BROWSER, "--batch", urls_path, "--out", out_dir,
+                     "--pool", str(pool), "--formats", args.formats],
+                    env=env, cwd=tmp, stdout=subprocess.DEVNULL)
+                wall = time.perf_counter() - start
+                summary_path = os.path.join(out_dir, SUMMARY_FILE)
+                if not os.path.exists(summary_path):
+                    sys.exit(f"Batch run failed with exit code {process.returncode}")
+                with open(summary_path) as f:
+                    summary = json.load(f)
+                print(f"pool {pool:3}: {summary['pages_per_s']:6.1f} pages/s  "
+                      f"load p50 {summary['load_p50_ms'] or 0:7.1f} ms  "
+                      f"p95 {summary['load_p95_ms'] or 0:7.1f} ms  "
+                      f"failed {summary['failed']}/{summary['pages']}  "
+                      f"process wall clock {wall:6.1f} s")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Bookmark lookup and import benchmark.
+
+Times the "is this page bookmarked" check made on every URL change, as a
+scan over the old {title: url} dict and as a BookmarkStore index lookup,
+then imports a generated Netscape bookmark file and reports how long the
+GUI thread would be busy with the largest single batch.
+
+    python benchmarks/bench_bookmarks.py --bookmarks 50000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bookmark_store import BookmarkStore, read_netscape_bookmarks
+
+
+def write_bookmark_file(path, count, folders=50):
+    per_folder = max(1, count // folders)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE NETSCAPE-Bookmark-file-1>\n<TITLE>Bookmarks</TITLE>\n'
+                '<H1>Bookmarks</H1>\n<DL><p>\n')
+        written = 0
+        folder = 0
+        while written < count:
+            f.write(f'<DT><H3 ADD_DATE="1600000000">Folder {folder}</H3>\n<DL><p>\n')
+            for _ in range(min(per_folder, count - written)):
+                f.write(f'<DT><A HREF="https://site{written % 997}.example/page/{written}" '
+                        f'ADD_DATE="1600000000" TAGS="news,folder{folder}">'
+                        f'Page {written} &amp; more</A>\n')
+                written += 1
+            f.write('</DL><p>\n')
+            folder += 1
+        f.write('</DL><p>\n')
+
+
+def time_lookups(is_bookmarked, urls):
+    start = time.perf_counter()
+    for url in urls:
+        is_bookmarked(url)
+    return (time.perf_counter() - start) / len(urls) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookmarks", type=int, default=50000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bookmarks.html")
+        write_bookmark_file(path, args.bookmarks)
+
+        store = BookmarkStore()
+        batches = []
+        start = time.perf_counter()
+        for batch in read_netscape_bookmarks(path):
+            # What the GUI thread does per batch_ready signal
+            batch_start = time.perf_counter()
+            for url, title, folder, tags, added in batch:
+                store.add(url, title, folder, tags, added)
+            batches.append(time.perf_counter() - batch_start)
+        total = time.perf_counter() - start
+        print(f"import: {len(store)} bookmarks in {total:.2f} s, {len(batches)} batches, "
+              f"GUI thread {sum(batches) * 1000:.0f} ms total, "
+              f"largest batch {max(batches) * 1000:.2f} ms")
+
+    legacy = {bookmark.title + str(bookmark.id): bookmark.url for bookmark in store}
+    rng = random.Random(args.seed)
+    bookmarked = list(legacy.values())
+    urls = [rng.choice(bookmarked) if i % 2 else f"https://not-bookmarked.example/{i}"
+            for i in range(args.lookups)]
+    before = time_lookups(lambda url: url in legacy.values(), urls)
+    after = time_lookups(store.is_bookmarked, urls)
+    print(f"is bookmarked: scan {before:9.1f} us  index {after:6.2f} us per URL change")
+
+
+if __name__ == "__main__":
+    main()
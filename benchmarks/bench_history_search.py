@@ -0,0 +1,92 @@
+"""History search latency benchmark.
+
+Fills a history database with synthetic visits and times the ranked search
+for every prefix of a few typed queries, as the history dialog issues them.
+
+    python benchmarks/bench_history_search.py --visits 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore
+
+WORDS = ["github", "python", "release", "notes", "issue", "pull", "request", "docs",
+         "weather", "news", "recipe", "video", "music", "review", "guide", "forum",
+         "download", "account", "settings", "search", "travel", "map", "sport", "blog"]
+HOSTS = ["github.com", "docs.python.org", "news.ycombinator.com", "youtube.com",
+         "wikipedia.org", "stackoverflow.com", "reddit.com", "example.com"]
+QUERIES = ["github issue", "python docs", "weather", "stackoverflow review guide"]
+SYLLABLES = ["ka", "lo", "mi", "ren", "tas", "vo", "zu", "pel", "dor", "fin", "gar", "hu"]
+
+
+def vocabulary(rng, size=5000):
+    # Mostly rare words, so common ones like "github" are not in every title
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randrange(2, 5))))
+    return WORDS + sorted(words)
+
+
+def populate(store, visits, rng):
+    url_count = max(1, visits // 3)
+    now = time.time()
+    vocab = vocabulary(rng)
+    urls = []
+    for i in range(url_count):
+        host = rng.choice(HOSTS) if i % 4 else f"site{i}.{rng.choice(['com', 'net', 'io'])}"
+        words = [rng.choice(WORDS)] + rng.sample(vocab, 3)
+        urls.append((i + 1, f"https://{host}/{'/'.join(words)}/{i}",
+                     " ".join(w.capitalize() for w in words) + f" {i}", host))
+
+    conn = store.conn
+    with conn:
+        conn.executemany(
+            "INSERT INTO urls (id, url, title, host, visit_count, last_visit) "
+            "VALUES (?, ?, ?, ?, 0, 0)", urls)
+        conn.executemany(
+            "INSERT INTO visits (url_id, visit_time) VALUES (?, ?)",
+            ((rng.randrange(url_count) + 1, now - rng.random() * 3e7) for _ in range(visits)))
+        conn.execute(
+            "UPDATE urls SET visit_count = (SELECT COUNT(*) FROM visits WHERE url_id = urls.id), "
+            "last_visit = (SELECT COALESCE(MAX(visit_time), 0) FROM visits WHERE url_id = urls.id)")
+    return url_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visits", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "history.db"), legacy_path=None)
+        start = time.perf_counter()
+        url_count = populate(store, args.visits, random.Random(args.seed))
+        print(f"populated {args.visits} visits / {url_count} urls "
+              f"in {time.perf_counter() - start:.1f} s (fts5: {store.has_fts})")
+
+        timings = []
+        for query in QUERIES:
+            for length in range(2, len(query) + 1):
+                prefix = query[:length]
+                start = time.perf_counter()
+                results = store.search(prefix, limit=100)
+                elapsed = (time.perf_counter() - start) * 1000
+                timings.append(elapsed)
+                print(f"  {prefix!r:32} {len(results):4} results  {elapsed:7.2f} ms")
+
+        timings.sort()
+        print(f"keystrokes: {len(timings)}  median {statistics.median(timings):.2f} ms  "
+              f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms  max {timings[-1]:.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Address bar suggestion latency benchmark.
+
+Loads a suggestion index with synthetic history URLs and times suggest()
+for every prefix of a few typed addresses and titles, as the address bar
+issues them on each keystroke, plus the cost of recording new visits.
+
+    python benchmarks/bench_omnibox.py --urls 500000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from omnibox import SuggestionIndex
+
+WORDS = ["github", "python", "release", "notes", "issue", "pull", "request", "docs",
+         "weather", "news", "recipe", "video", "music", "review", "guide", "forum",
+         "download", "account", "settings", "search", "travel", "map", "sport", "blog"]
+HOSTS = ["github.com", "docs.python.org", "news.ycombinator.com", "youtube.com",
+         "wikipedia.org", "stackoverflow.com", "reddit.com", "example.com"]
+QUERIES = ["https://github.com/python/cpython/issues", "www.youtube.com/watch",
+           "docs.python.org/3/library", "site12345.com", "python release notes",
+           "weather forecast"]
+
+
+def make_rows(count, rng):
+    now = time.time()
+    rows = []
+    for i in range(count):
+        host = rng.choice(HOSTS) if i % 4 else f"site{i}.{rng.choice(['com', 'net', 'io'])}"
+        words = rng.sample(WORDS, 3)
+        rows.append((f"https://{host}/{'/'.join(words)}/{i}",
+                     " ".join(w.capitalize() for w in words) + f" {i}",
+                     rng.randrange(1, 50), now - rng.random() * 3e7))
+    return rows
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = make_rows(args.urls, rng)
+    index = SuggestionIndex()
+    start = time.perf_counter()
+    index.load(rows, bookmarks=[(url, title) for url, title, _, _ in rows[::1000]])
+    print(f"indexed {len(index)} urls in {time.perf_counter() - start:.1f} s")
+
+    timings = []
+    for query in QUERIES:
+        for length in range(1, len(query) + 1):
+            start = time.perf_counter()
+            index.suggest(query[:length])
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"keystrokes: {len(timings)}  median {statistics.median(timings):.3f} ms  "
+          f"p95 {percentile(timings, 0.95):.3f} ms  max {timings[-1]:.3f} ms")
+
+    updates = []
+    for i in range(1000):
+        url, title, _, _ = rng.choice(rows) if i % 2 else (f"https://new{i}.org/", f"New {i}", 0, 0)
+        start = time.perf_counter()
+        index.add_visit(url, title)
+        updates.append((time.perf_counter() - start) * 1000)
+    updates.sort()
+    print(f"visits recorded: {len(updates)}  median {statistics.median(updates):.3f} ms  "
+          f"max {updates[-1]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Private tab creation benchmark.
+
+Opens a batch of private pages the old way, with a new off-the-record
+QWebEngineProfile per tab, and through the shared PrivateProfileManager.
+Reports the time to create them and to finish loading, plus the RSS of
+the browser and renderer processes afterwards. Needs a working
+QtWebEngine; use QT_QPA_PLATFORM=offscreen on a headless machine.
+
+    python benchmarks/bench_private_tabs.py --tabs 50
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from memory_monitor import format_bytes, sample_rss
+
+
+def load_browser_module():
+    # The main script's file name is not importable as a module name
+    spec = importlib.util.spec_from_file_location(
+        "browser_main", os.path.join(ROOT, "browser_ver_2.0.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def open_tabs(browser, count, shared):
+    from PyQt5.QtCore import QEventLoop, QTimer
+    from PyQt5.QtWebEngineWidgets import QWebEngineProfile, QWebEngineView
+
+    manager = browser.PrivateProfileManager() if shared else None
+    profiles = []
+    views = []
+    loop = QEventLoop()
+    loaded = []
+
+    def page_loaded(ok):
+        loaded.append(ok)
+        if len(loaded) == count:
+            loop.quit()
+
+    start = time.perf_counter()
+    for i in range(count):
+        view = QWebEngineView()
+        if shared:
+            page = manager.create_page(view)
+        else:
+            profile = QWebEngineProfile()
+            profiles.append(profile)
+            page = browser.SecureWebEnginePage(view, profile=profile)
+        view.setPage(page)
+        page.loadFinished.connect(page_loaded)
+        page.setHtml(f"<title>Private tab {i}</title><p>Private tab {i}</p>")
+        views.append(view)
+    created = time.perf_counter() - start
+
+    QTimer.singleShot(60000, loop.quit)
+    loop.exec_()
+    finished = time.perf_counter() - start
+
+    pids = {os.getpid()} | {view.page().renderProcessPid() for view in views}
+    rss = sum(sample_rss(pids - {0}).values())
+
+    for view in views:
+        view.deleteLater()
+    QTimer.singleShot(200, loop.quit)
+    loop.exec_()
+    for profile in profiles:
+        profile.deleteLater()
+    return created, finished, len(loaded), len(pids - {0}) - 1, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tabs", type=int, default=50)
+    args = parser.parse_args()
+
+    browser = load_browser_module()
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    for label, shared in (("profile per tab", False), ("shared profile", True)):
+        created, finished, loaded, renderers, rss = open_tabs(browser, args.tabs, shared)
+        print(f"{label:16} create {created * 1000:7.1f} ms  loaded {loaded}/{args.tabs} "
+              f"in {finished * 1000:7.1f} ms  {renderers} renderers  rss {format_bytes(rss)}")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Throughput of the JSON-RPC endpoint against a local HTTP fixture server.
+
+Serves generated pages from a ThreadingHTTPServer on localhost, starts the
+browser with --rpc on a socket in a temporary data directory (or connects
+to --socket), then runs --pages pages through open_tab, wait_load, run_js,
+get_html and close_tab with 1, 4, 16... pages in flight at once over one
+pipelined connection. Reports pages and commands per second and the
+median and p95 time per page.
+
+    python benchmarks/bench_rpc.py --pages 200 --concurrency 1 4 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rpc_client import RpcClient
+
+BROWSER = os.path.join(ROOT, "browser_ver_2.0.py")
+COMMANDS_PER_PAGE = 5
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    paragraphs = 50
+
+    def do_GET(self):
+        body = "".join(f"<p>Paragraph {i} of {self.path}</p>" for i in range(self.paragraphs))
+        page = (f"<!DOCTYPE html><html><head><title>Fixture {self.path}</title></head>"
+                f"<body><h1>{self.path}</h1>{body}</body></html>").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):
+        pass
+
+
+async def connect(path, timeout, browser=None):
+    start = time.perf_counter()
+    while True:
+        try:
+            return await RpcClient.connect(path)
+        except OSError:
+            if browser is not None and browser.poll() is not None:
+                sys.exit(f"Browser exited with code {browser.returncode}")
+            if time.perf_counter() - start > timeout:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_page(client, url):
+    start = time.perf_counter()
+    tab = await client.open_tab(url)
+    state = await client.wait_load(tab)
+    title = await client.run_js(tab, "document.title")
+    html = await client.get_html(tab)
+    await client.close_tab(tab)
+    if not state['ok'] or not title or url.rsplit("/", 1)[-1] not in html:
+        raise RuntimeError(f"Unexpected result for {url}: {state}")
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_level(client, base_url, pages, concurrency):
+    queue = list(range(pages))
+    timings = []
+
+    async def worker():
+        while queue:
+            timings.append(await run_page(client, f"{base_url}/page/{queue.pop()}"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(timings)
+
+
+async def bench(args, base_url, path, browser):
+    client = await connect(path, args.timeout, browser)
+    async with client:
+        # Warm up the renderer process and the HTTP connection
+        await run_page(client, f"{base_url}/warmup")
+        for concurrency in args.concurrency:
+            elapsed, timings = await run_level(client, base_url, args.pages, concurrency)
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{concurrency:3} in flight: {args.pages / elapsed:7.1f} pages/s  "
+                  f"{args.pages * COMMANDS_PER_PAGE / elapsed:8.1f} commands/s  "
+                  f"per page median {statistics.median(timings):7.1f} ms  p95 {p95:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--socket", help="use a browser already started with --rpc=SOCKET")
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="seconds to wait for the browser to start listening")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        browser = None
+        path = args.socket
+        if path is None:
+            path = os.path.join(tmp, "rpc.sock")
+            env = dict(os.environ, XDG_DATA_HOME=tmp)
+            env.setdefault("QT_QPA_PLATFORM", "offscreen")
+            browser = subprocess.Popen(
+                [sys.executable, BROWSER, "--new-instance", f"--rpc={path}"], env=env, cwd=tmp)
+        try:
+            asyncio.run(bench(args, base_url, path, browser))
+        finally:
+            if browser is not None:
+                browser.terminate()
+                browser.wait()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
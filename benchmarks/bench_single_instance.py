@@ -0,0 +1,104 @@
+"""Wall-clock time of a second launch that forwards URLs to a running browser.
+
+Starts a first browser with its own data directory (so it doesn't talk to
+a browser you already have open), waits until it accepts connections, then
+times `python browser_ver_2.0.py URL...` for each batch size. Those runs
+should exit as soon as the running browser has taken the URLs, without
+loading QtWebEngine. Also reports how long the first browser took to start,
+for comparison.
+
+With --stand-in the first process is a bare InstanceServer instead of the
+browser. The second launch runs the same code either way, so this measures
+it on machines where QtWebEngine can't start, and checks that every URL
+arrived.
+
+    python benchmarks/bench_single_instance.py --urls 1 100 500 --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from single_instance import forward_urls, server_name
+
+BROWSER = os.path.join(ROOT, "browser_ver_2.0.py")
+
+STAND_IN = """
+import sys
+sys.path.insert(0, {root!r})
+from PyQt5.QtCore import QCoreApplication
+from single_instance import InstanceServer
+app = QCoreApplication(sys.argv)
+server = InstanceServer()
+server.urls_received.connect(lambda urls: print(len(urls), flush=True))
+server.listen()
+app.exec_()
+"""
+
+
+def wait_for_server(process, timeout):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            sys.exit(f"First instance exited with code {process.returncode}")
+        # An empty batch only brings the window forward
+        if forward_urls([]):
+            return (time.perf_counter() - start) * 1000
+        time.sleep(0.05)
+    sys.exit(f"First instance not listening after {timeout} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, nargs="+", default=[1, 100, 500])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--stand-in", action="store_true",
+                        help="serve with a bare InstanceServer instead of the browser")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, XDG_DATA_HOME=tmp)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        # server_name() follows the data directory, as in the child processes
+        os.environ["XDG_DATA_HOME"] = tmp
+        print(f"server {server_name()}")
+
+        if args.stand_in:
+            command = [sys.executable, "-c", STAND_IN.format(root=ROOT)]
+        else:
+            command = [sys.executable, BROWSER]
+        first = subprocess.Popen(command, env=env, cwd=tmp, stdout=subprocess.PIPE, text=True)
+        try:
+            ready = wait_for_server(first, args.timeout)
+            print(f"first launch   ready after {ready:8.1f} ms")
+
+            for count in args.urls:
+                urls = [f"https://example.com/page/{i}" for i in range(count)]
+                timings = []
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    subprocess.run([sys.executable, BROWSER, *urls], env=env, cwd=tmp, check=True)
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                print(f"second launch {count:4} URLs: median {statistics.median(timings):7.1f} ms"
+                      f"  max {timings[-1]:7.1f} ms")
+        finally:
+            first.terminate()
+            output, _ = first.communicate()
+
+        if args.stand_in:
+            received = [int(line) for line in output.split()]
+            expected = [0] + [count for count in args.urls for _ in range(args.runs)]
+            print("all URLs delivered" if received == expected
+                  else f"URL counts differ: expected {expected}, got {received}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Loading spinner CPU benchmark.
+
+Runs the event loop with a number of tabs loading at once, all spinning,
+and reports the process CPU time used. Compares CircularLoader with a
+copy of the previous implementation, which redrew all twelve bars with
+antialiasing on every tick and kept ticking in background tabs. Needs a
+working QtWebEngine to import the browser; QT_QPA_PLATFORM=offscreen
+works on a headless machine.
+
+    python benchmarks/bench_spinner.py --tabs 20 --seconds 5
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_browser_module():
+    # The main script's file name is not importable as a module name
+    sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location(
+        "browser_main", os.path.join(ROOT, "browser_ver_2.0.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_loader_class(CircularLoader):
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QPainter
+
+    class LegacyLoader(CircularLoader):
+        """The loader as it was: full redraw per tick, never paused."""
+
+        def paintEvent(self, event):
+            painter = QPainter(self)
+            painter.fillRect(self.rect(), Qt.transparent)
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            painter.setPen(Qt.NoPen)
+            for i in range(self.numberOfLines):
+                painter.save()
+                painter.translate(self.width() / 2, self.height() / 2)
+                painter.rotate(360.0 * i / self.numberOfLines)
+                painter.translate(self.innerRadius, 0)
+                distance = self.lineCountDistanceFromPrimary(i, self.currentCounter,
+                                                             self.numberOfLines)
+                painter.setBrush(self.currentLineColor(distance, self.numberOfLines, 70.0, 20.0,
+                                                       self.color))
+                painter.drawRoundedRect(0, -self.penWidth // 2, self.lineLength, self.penWidth,
+                                        70.0, 70.0)
+                painter.restore()
+
+        def start(self):
+            self.isSpinning = True
+            self.show()
+            if not self.timer.isActive():
+                self.timer.start(1000 // (self.numberOfLines * 2))
+
+        def showEvent(self, event):
+            pass
+
+        def hideEvent(self, event):
+            pass
+
+    return LegacyLoader
+
+
+def run(loader_class, tabs, seconds, visible):
+    """CPU seconds used while tabs spinners run, visible of them on screen."""
+    from PyQt5.QtCore import QEventLoop, QTimer
+    from PyQt5.QtWidgets import QGridLayout, QTabWidget, QWidget
+
+    window = QTabWidget()
+    # The first page holds the on-screen spinners, one tab each for the rest
+    grid_page = QWidget()
+    grid = QGridLayout(grid_page)
+    loaders = []
+    for i in range(tabs):
+        loader = loader_class()
+        if i < visible:
+            grid.addWidget(loader, i // 5, i % 5)
+        else:
+            page = QWidget()
+            loader.setParent(page)
+            window.addTab(page, f"Tab {i}")
+        loaders.append(loader)
+    window.insertTab(0, grid_page, "Visible")
+    window.setCurrentIndex(0)
+    window.resize(600, 500)
+    window.show()
+    for loader in loaders:
+        loader.start()
+
+    loop = QEventLoop()
+    QTimer.singleShot(200, loop.quit)  # settle and render the frame cache
+    loop.exec_()
+
+    start = time.process_time()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
+    used = time.process_time() - start
+
+    for loader in loaders:
+        loader.stop()
+    window.close()
+    window.deleteLater()
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tabs", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    browser = load_browser_module()
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    CircularLoader = browser.CircularLoader
+    LegacyLoader = legacy_loader_class(CircularLoader)
+
+    for label, visible in (("all on screen", args.tabs), ("one tab on screen", 1)):
+        before = run(LegacyLoader, args.tabs, args.seconds, visible)
+        after = run(CircularLoader, args.tabs, args.seconds, visible)
+        print(f"{args.tabs} spinners, {label:18} before {before / args.seconds * 100:5.1f}% CPU  "
+              f"after {after / args.seconds * 100:5.1f}% CPU  "
+              f"saved {(before - after) / args.seconds * 100:5.1f}%")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
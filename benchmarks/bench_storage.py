@@ -0,0 +1,73 @@
+"""GUI-thread time spent saving bookmarks and settings.
+
+Replays a burst of edits, each followed by a save the way the browser does
+after every bookmark or zoom change, first with the previous synchronous
+json.dump into the working directory and then through JsonStore. Reports
+the time the calling (GUI) thread spends per save and how many files were
+actually written.
+
+    python benchmarks/bench_storage.py --bookmarks 5000 --saves 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import JsonStore
+
+
+def make_bookmarks(count):
+    return {f"Bookmark {i} - some page title": f"https://example{i % 97}.com/path/{i}"
+            for i in range(count)}
+
+
+def save_legacy(directory, bookmarks):
+    with open(os.path.join(directory, 'bookmarks.json'), 'w') as f:
+        json.dump(bookmarks, f, indent=2)
+
+
+def replay(save, bookmarks, saves):
+    timings = []
+    for i in range(saves):
+        bookmarks[f"New bookmark {i}"] = f"https://example.org/{i}"
+        start = time.perf_counter()
+        save(bookmarks)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings, writes, extra=""):
+    timings = sorted(timings)
+    print(f"{label:7} GUI thread: total {sum(timings):8.1f} ms  "
+          f"median {statistics.median(timings):6.3f} ms  max {timings[-1]:6.2f} ms  "
+          f"files written {writes}{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookmarks", type=int, default=5000)
+    parser.add_argument("--saves", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = replay(lambda bookmarks: save_legacy(tmp, bookmarks),
+                         make_bookmarks(args.bookmarks), args.saves)
+        report("before", timings, args.saves)
+
+        store = JsonStore(os.path.join(tmp, "data"), legacy_dir=None)
+        timings = replay(lambda bookmarks: store.save('bookmarks.json', dict(bookmarks), indent=2),
+                         make_bookmarks(args.bookmarks), args.saves)
+        start = time.perf_counter()
+        store.close()
+        final_flush = (time.perf_counter() - start) * 1000
+        report("after", timings, store.write_count,
+               f"  (final flush on close {final_flush:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
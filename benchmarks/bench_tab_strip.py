@@ -0,0 +1,118 @@
+"""Tab strip scaling benchmark.
+
+Opens tabs one by one in a CustomTabWidget, the way add_new_tab does
+(addTab, then select it, then let the event loop run), and reports the
+time spent placing the new-tab button per block of tabs, next to the
+total time per block. Placing the button from the last tab keeps the
+per-block cost flat; the previous implementation, which summed every
+tab's width on each change, grows with the tab count. The total also
+includes QTabBar's own layout, which Qt redoes for the whole strip on
+every insert. Needs a working QtWebEngine to import the browser;
+QT_QPA_PLATFORM=offscreen works on a headless machine.
+
+    python benchmarks/bench_tab_strip.py --tabs 500
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_browser_module():
+    # The main script's file name is not importable as a module name
+    sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location(
+        "browser_main", os.path.join(ROOT, "browser_ver_2.0.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_tab_widget_class(CustomTabWidget):
+    class LegacyTabWidget(CustomTabWidget):
+        """Repositions synchronously by summing every tab's width."""
+
+        def update_new_tab_button_position(self):
+            total_width = 0
+            for i in range(self.tabBar().count()):
+                total_width += self.tabBar().tabRect(i).width()
+            button_x = min(total_width + 5, self.width() - self.new_tab_button.width() - 10)
+            self.new_tab_button.move(button_x, 5)
+            self.new_tab_button.show()
+
+    return LegacyTabWidget
+
+
+def timed_tab_widget_class(tab_widget_class, method_name):
+    """Subclass that adds the time spent in method_name to .positioning."""
+    method = getattr(tab_widget_class, method_name)
+
+    def timed(self):
+        start = time.perf_counter()
+        try:
+            return method(self)
+        finally:
+            self.positioning += time.perf_counter() - start
+
+    return type(tab_widget_class.__name__, (tab_widget_class,),
+                {"positioning": 0.0, method_name: timed})
+
+
+def open_tabs(tab_widget_class, count, block):
+    from PyQt5.QtWidgets import QApplication, QWidget
+
+    tabs = tab_widget_class()
+    tabs.resize(1200, 800)
+    tabs.show()
+    QApplication.processEvents()
+
+    blocks = []
+    start = time.perf_counter()
+    tabs.positioning = 0.0
+    for i in range(count):
+        index = tabs.addTab(QWidget(), f"🔒 Tab {i}")
+        tabs.setCurrentIndex(index)
+        QApplication.processEvents()
+        if (i + 1) % block == 0:
+            now = time.perf_counter()
+            blocks.append((tabs.positioning, now - start))
+            start = now
+            tabs.positioning = 0.0
+    tabs.close()
+    tabs.deleteLater()
+    QApplication.processEvents()
+    return blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tabs", type=int, default=500)
+    parser.add_argument("--block", type=int, default=100)
+    args = parser.parse_args()
+
+    browser = load_browser_module()
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    runs = (
+        ("before", legacy_tab_widget_class(browser.CustomTabWidget),
+         "update_new_tab_button_position"),
+        ("after", browser.CustomTabWidget, "position_new_tab_button"),
+    )
+    for label, tab_widget_class, method_name in runs:
+        blocks = open_tabs(timed_tab_widget_class(tab_widget_class, method_name),
+                           args.tabs, args.block)
+        positioning = [placed for placed, _ in blocks]
+        print(f"{label:6} button ms per {args.block} tabs: "
+              + "  ".join(f"{seconds * 1000:7.1f}" for seconds in positioning)
+              + f"  (last/first {positioning[-1] / positioning[0]:.1f}x)")
+        print(f"{'':6} total  ms per {args.block} tabs: "
+              + "  ".join(f"{seconds * 1000:7.0f}" for _, seconds in blocks))
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import bisect
+import html.parser
+import time
+
+BOOKMARKS_FILE = "bookmarks.json"
+BOOKMARKS_VERSION = 2
+FOLDER_SEPARATOR = "/"
+IMPORT_CHUNK_SIZE = 64 * 1024  # characters fed to the parser at a time
+IMPORT_BATCH_SIZE = 500  # bookmarks handed over per batch while importing
+
+
+class Bookmark:
+    __slots__ = ("id", "url", "title", "folder", "tags", "added")
+
+    def __init__(self, bookmark_id, url, title="", folder="", tags=(), added=None):
+        self.id = bookmark_id
+        self.url = url
+        self.title = title or url
+        self.folder = folder
+        self.tags = tuple(tags)
+        self.added = added or time.time()
+
+    def to_dict(self):
+        return {'id': self.id, 'url': self.url, 'title': self.title,
+                'folder': self.folder, 'tags': list(self.tags), 'added': self.added}
+
+
+class BookmarkStore:
+    """Bookmarks keyed by a stable id, with a reverse URL -> ids index.
+
+    Titles no longer have to be unique, and is_bookmarked() is a single
+    dict lookup however many bookmarks there are. Folders are "/"-separated
+    paths, "" being the top level.
+    """
+
+    def __init__(self):
+        self.bookmarks = {}  # id -> Bookmark, in insertion order
+        self.ids = []  # sorted ids, so page() can resume after any id
+        self.by_url = {}  # url -> set of ids
+        self.next_id = 1
+
+    def __len__(self):
+        return len(self.bookmarks)
+
+    def __iter__(self):
+        return iter(self.bookmarks.values())
+
+    def get(self, bookmark_id):
+        return self.bookmarks.get(bookmark_id)
+
+    def add(self, url, title="", folder="", tags=(), added=None):
+        bookmark = Bookmark(self.next_id, url, title, folder, tags, added)
+        self.next_id += 1
+        self._index(bookmark)
+        return bookmark
+
+    def _index(self, bookmark):
+        if bookmark.id not in self.bookmarks:
+            if not self.ids or bookmark.id > self.ids[-1]:
+                self.ids.append(bookmark.id)
+            else:
+                bisect.insort(self.ids, bookmark.id)
+        self.bookmarks[bookmark.id] = bookmark
+        self.by_url.setdefault(bookmark.url, set()).add(bookmark.id)
+
+    def remove(self, bookmark_id):
+        bookmark = self.bookmarks.pop(bookmark_id, None)
+        if bookmark is None:
+            return None
+        del self.ids[bisect.bisect_left(self.ids, bookmark_id)]
+        ids = self.by_url[bookmark.url]
+        ids.discard(bookmark_id)
+        if not ids:
+            del self.by_url[bookmark.url]
+        return bookmark
+
+    def remove_url(self, url):
+        return [self.remove(bookmark_id) for bookmark_id in list(self.by_url.get(url, ()))]
+
+    def update(self, bookmark_id, title=None, folder=None, tags=None):
+        bookmark = self.bookmarks[bookmark_id]
+        if title is not None:
+            bookmark.title = title
+        if folder is not None:
+            bookmark.folder = folder
+        if tags is not None:
+            bookmark.tags = tuple(tags)
+        return bookmark
+
+    def page(self, after_id, limit):
+        """Up to limit bookmarks in id order, starting after after_id."""
+        start = bisect.bisect_right(self.ids, after_id)
+        return [self.bookmarks[bookmark_id] for bookmark_id in self.ids[start:start + limit]]
+
+    def is_bookmarked(self, url):
+        return url in self.by_url
+
+    def for_url(self, url):
+        return [self.bookmarks[bookmark_id] for bookmark_id in self.by_url.get(url, ())]
+
+    def folders(self):
+        return sorted({bookmark.folder for bookmark in self.bookmarks.values()})
+
+    def to_json(self):
+        return {'version': BOOKMARKS_VERSION, 'next_id': self.next_id,
+                'bookmarks': [bookmark.to_dict() for bookmark in self.bookmarks.values()]}
+
+    @classmethod
+    def from_json(cls, data):
+        """Build a store from to_json() output or the old {title: url} dict.
+
+        Raises ValueError for anything else, such as a file written by a
+        newer version, rather than reading its keys as bookmark titles.
+        """
+        store = cls()
+        if not data:
+            return store
+        if not isinstance(data, dict):
+            raise ValueError("bookmarks must be a JSON object")
+        if 'version' not in data:
+            for title, url in data.items():
+                if isinstance(url, str):
+                    store.add(url, title)
+            return store
+        if data['version'] != BOOKMARKS_VERSION:
+            raise ValueError(f"unsupported bookmarks version {data['version']!r}")
+        for entry in data.get('bookmarks', ()):
+            store._index(Bookmark(entry['id'], entry['url'], entry.get('title', ''),
+                                  entry.get('folder', ''), entry.get('tags', ()),
+                                  entry.get('added')))
+        store.next_id = max(data.get('next_id', 1), max(store.bookmarks, default=0) + 1)
+        return store
+
+
+def split_tags(text):
+    return tuple(tag.strip() for tag in text.split(',') if tag.strip())
+
+
+class NetscapeBookmarkParser(html.parser.HTMLParser):
+    """Incremental parser for the Netscape bookmark HTML every browser exports.
+
+    Folders are <H3> headings followed by a <DL> list of entries; bookmarks
+    are <A HREF=...> tags, with optional ADD_DATE and TAGS attributes.
+    Parsed bookmarks collect in `pending` as (url, title, folder, tags,
+    added) tuples for the caller to drain between feed() calls.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pending = []
+        self.folders = []  # the folder path each open <DL> belongs to
+        self.next_folder = None  # title of the last <H3>, opened by the next <DL>
+        self.text = None  # collects the text of the current <A> or <H3>
+        self.link = None
+
+    def folder(self):
+        return self.folders[-1] if self.folders else ""
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            attrs = dict(attrs)
+            if attrs.get('href', '').startswith(('http://', 'https://', 'ftp://', 'file:')):
+                self.link = attrs
+                self.text = []
+        elif tag == 'h3':
+            self.text = []
+        elif tag == 'dl':
+            folder = self.folder()
+            if self.next_folder is not None:
+                folder = (folder + FOLDER_SEPARATOR if folder else "") + self.next_folder
+                self.next_folder = None
+            self.folders.append(folder)
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self.link is not None:
+            try:
+                added = float(self.link.get('add_date') or 0) or None
+            except ValueError:
+                added = None
+            self.pending.append((self.link['href'], "".join(self.text).strip(), self.folder(),
+                                 split_tags(self.link.get('tags') or ""), added))
+            self.link = self.text = None
+        elif tag == 'h3' and self.text is not None:
+            self.next_folder = "".join(self.text).strip().replace(FOLDER_SEPARATOR, "-")
+            self.text = None
+        elif tag == 'dl' and self.folders:
+            self.folders.pop()
+
+    def handle_data(self, data):
+        if self.text is not None:
+            self.text.append(data)
+
+
+def read_netscape_bookmarks(path, batch_size=IMPORT_BATCH_SIZE):
+    """Yield lists of parsed bookmarks while reading the file in chunks.
+
+    Memory stays bounded by the chunk and batch sizes, not the file size.
+    """
+    parser = NetscapeBookmarkParser()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        while True:
+            chunk = f.read(IMPORT_CHUNK_SIZE)
+            if chunk:
+                parser.feed(chunk)
+            else:
+                parser.close()
+            while len(parser.pending) >= batch_size or (not chunk and parser.pending):
+                batch, parser.pending = parser.pending[:batch_size], parser.pending[batch_size:]
+                yield batch
+            if not chunk:
+                return
@@ -0,0 +1,31 @@
+from PyQt5.QtWebEngineWidgets import QWebEngineSettings
+
+# Zoom new tabs start at, 130% for readability
+DEFAULT_ZOOM = 1.3
+
+# Web content settings shared by every tab
+class BrowserSettings:
+    """Central copy of the settings that apply to web content.
+
+    JavaScript, images and plugins are set on the profiles' settings, which
+    every page of a profile inherits, so changing them costs the same
+    whatever the number of open tabs. Zoom is per site: site_zoom maps a
+    host to the factor chosen for it and every other host gets
+    default_zoom. Pages look it up as navigation to a host starts.
+    """
+
+    def __init__(self):
+        self.javascript_enabled = True
+        self.images_enabled = True
+        self.plugins_enabled = False
+        self.default_zoom = DEFAULT_ZOOM
+        self.site_zoom = {}  # host -> zoom factor
+
+    def zoom_for(self, url):
+        return self.site_zoom.get(url.host(), self.default_zoom)
+
+    def apply(self, profile):
+        settings = profile.settings()
+        settings.setAttribute(QWebEngineSettings.JavascriptEnabled, self.javascript_enabled)
+        settings.setAttribute(QWebEngineSettings.AutoLoadImages, self.images_enabled)
+        settings.setAttribute(QWebEngineSettings.PluginsEnabled, self.plugins_enabled)
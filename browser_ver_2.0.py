@@ -1,50 +1,161 @@
 import sys
-import json
 import os
-from datetime import datetime
-import hashlib
+import time
+
+from startup import STARTUP_TRACE, StartupTimeline
+
+# Started before the Qt imports so the timeline covers them
+startup_timeline = StartupTimeline()
+
+import argparse
 import base64
 from urllib.parse import urlparse
 
-# FIXED: Enable proper high DPI scaling
-os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
-os.environ["QT_SCALE_FACTOR"] = "1.3"  # Increased for better visibility
-os.environ["QT_FONT_DPI"] = "120"      # Higher DPI for better text
+# Qt switches that take the next argument as their value. They are set
+# aside before parsing, so the value isn't taken for a URL to open
+QT_VALUE_SWITCHES = {
+    "platform", "platformpluginpath", "platformtheme", "plugin", "qwindowgeometry",
+    "qwindowicon", "qwindowtitle", "session", "display", "style", "stylesheet",
+    "geometry", "title", "name",
+}
+
+
+def split_qt_arguments(argv):
+    """(Qt switches with their values, everything else) from argv."""
+    qt_args, rest = [], []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--":
+            rest += argv[i:]
+            break
+        if (arg.startswith("-") and arg.lstrip("-") in QT_VALUE_SWITCHES
+                and i + 1 < len(argv)):
+            qt_args += argv[i:i + 2]
+            i += 2
+            continue
+        # --rpc and --profile-startup only take a value after "=", so
+        # "--rpc example.com" opens example.com
+        if arg == "--rpc":
+            arg = "--rpc="
+        elif arg == "--profile-startup":
+            arg = f"--profile-startup={STARTUP_TRACE}"
+        rest.append(arg)
+        i += 1
+    return qt_args, rest
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Enhanced Secure Browser", allow_abbrev=False)
+    parser.add_argument("urls", nargs="*", metavar="URL",
+                        help="pages to open, in the running browser if there is one")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="start a separate browser even if one is already running "
+                             "(implied by --rpc and --profile-startup)")
+    parser.add_argument("--rpc", nargs="?", const="", metavar="SOCKET",
+                        help="accept JSON-RPC commands on a Unix socket, given as "
+                             "--rpc=SOCKET (default rpc.sock in the data directory)")
+    parser.add_argument("--profile-startup", nargs="?", const=STARTUP_TRACE, metavar="TRACE",
+                        help="write a Chrome trace of the startup phases, given as "
+                             f"--profile-startup=TRACE (default {STARTUP_TRACE})")
+    batch = parser.add_argument_group("batch rendering, headless, see batch_render.py")
+    batch.add_argument("--batch", metavar="URLS",
+                       help="render every URL in this file (one per line) and exit")
+    batch.add_argument("--out", default="batch_out", metavar="DIR",
+                       help="where the rendered files go (default batch_out)")
+    batch.add_argument("--formats", default="png",
+                       help="comma-separated, from png, html and pdf (default png)")
+    batch.add_argument("--pool", type=int, default=4, metavar="N",
+                       help="pages rendering at once (default 4)")
+    batch.add_argument("--page-timeout", type=float, default=30, metavar="SECONDS",
+                       help="time allowed per URL (default 30)")
+    batch.add_argument("--viewport", default="1280x800", metavar="WxH",
+                       help="page size for screenshots (default 1280x800)")
+    # Everything else (Qt and Chromium switches) is left for QApplication
+    qt_args, argv = split_qt_arguments(sys.argv[1:])
+    args, unknown = parser.parse_known_args(argv)
+    return args, qt_args + unknown
+
+
+# Single instance: a second launch hands its URLs to the running browser and
+# exits here, before paying for the QtWidgets and QtWebEngine imports below
+if __name__ == "__main__":
+    args, qt_args = parse_arguments()
+    from single_instance import InstanceServer, forward_urls, normalize_url
+    args.urls = [normalize_url(url) for url in args.urls]
+    if args.batch:
+        # Batch rendering never shows a window, and its screenshots are
+        # taken at the size asked for
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        os.environ.setdefault("QT_SCALE_FACTOR", "1")
+    elif args.rpc is not None or args.profile_startup:
+        # A running browser couldn't honour these, so this process has to
+        # be the browser rather than forward its URLs and exit
+        args.new_instance = True
+    elif not args.new_instance and forward_urls(args.urls):
+        sys.exit(0)
+
+# FIXED: Enable proper high DPI scaling, unless the user's environment
+# already chose a scaling
+os.environ.setdefault("QT_AUTO_SCREEN_SCALE_FACTOR", "1")
+os.environ.setdefault("QT_SCALE_FACTOR", "1.3")  # Increased for better visibility
+os.environ.setdefault("QT_FONT_DPI", "120")      # Higher DPI for better text
 
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QToolBar, QAction, QLineEdit, QTabWidget,
-    QWidget, QVBoxLayout, QHBoxLayout, QMessageBox, QMenu, QMenuBar,
-    QProgressBar, QLabel, QSplitter, QListWidget, QTextEdit, QPushButton,
-    QDialog, QFormLayout, QSpinBox, QCheckBox, QComboBox, QGroupBox,
-    QScrollArea, QFrame, QSizePolicy, QShortcut, QInputDialog, QFileDialog,
-    QTabBar, QToolButton, QSlider, QStatusBar, QSystemTrayIcon, QStyle,
-    QColorDialog, QFontDialog, QTextBrowser, QTreeWidget, QTreeWidgetItem
+    QApplication, QMainWindow, QToolBar, QAction, QLineEdit, QTabWidget, QWidget,
+    QVBoxLayout, QHBoxLayout, QMessageBox, QMenu, QLabel, QListWidget, QPushButton,
+    QDialog, QShortcut, QInputDialog, QFileDialog, QToolButton, QTextBrowser, QCompleter
 )
 
 from PyQt5.QtWebEngineWidgets import (
     QWebEngineView, QWebEngineProfile, QWebEngineSettings, QWebEnginePage,
-    QWebEngineScript, QWebEngineDownloadItem
+    QWebEngineScript
 )
 
 from PyQt5.QtCore import (
-    QUrl, QTimer, pyqtSignal, Qt, QThread, pyqtSlot, QPropertyAnimation,
-    QRect, QSize, QSettings, QStandardPaths, QByteArray, QBuffer, QIODevice
+    QUrl, QTimer, pyqtSignal, Qt, QSize, QByteArray, QIODevice, QAbstractListModel,
+    QModelIndex, QObject, QDataStream
 )
 
 from PyQt5.QtGui import (
-    QIcon, QFont, QKeySequence, QPixmap, QPainter, QColor, QGuiApplication,
-    QContextMenuEvent, QPalette, QLinearGradient, QRadialGradient, QBrush,
-    QFontDatabase, QDesktopServices
+    QFont, QKeySequence, QPixmap, QPainter, QColor, QGuiApplication
 )
 
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+
 from math import ceil
+from collections import deque
+import threading
+
+from adblock import CACHE_FILE, FilterEngine
+from history_store import HISTORY_DB, LEGACY_HISTORY_FILE, HistoryStore
+from omnibox import SuggestionIndex
+from session import SAVE_DELAY, load_session, save_session
+from storage import JsonStore, data_path
+from bookmark_store import BOOKMARKS_FILE, BookmarkStore
+from browser_settings import DEFAULT_ZOOM, BrowserSettings
+from download_queue import (
+    DownloadQueue, PRIORITY_NORMAL, PRIORITY_LOW, MAX_ACTIVE_DOWNLOADS,
+    MAX_DOWNLOADS_PER_HOST, MAX_PENDING_LINK_SAVES, link_filename
+)
+from memory_monitor import (
+    MEMORY_BUDGET_MB, SAMPLE_INTERVAL, sample_rss, choose_evictions, format_bytes
+)
 
 # Enhanced Circular Loading Indicator
 class CircularLoader(QWidget):
-    def __init__(self, parent=None, color=QColor(70, 130, 180), penWidth=6, animationDuration=1000):
+    """Spinner of fading bars around a circle.
+
+    The numberOfLines frames are drawn once per size, colour and device
+    pixel ratio into pixmaps shared by every loader, so a tick blits one
+    pixmap. The timer only runs while the spinner is actually on screen.
+    """
+    _frame_cache = {}
+
+    def __init__(self, parent=None, color=None, penWidth=6, animationDuration=1000):
         super().__init__(parent)
-        self.color = color
+        # Copied so no two loaders (or default arguments) share one QColor
+        self.color = QColor(color) if color is not None else QColor(70, 130, 180)
         self.penWidth = penWidth
         self.animationDuration = animationDuration
         self.numberOfLines = 12
@@ -63,23 +174,41 @@ class CircularLoader(QWidget):
             self.currentCounter = 0
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.fillRect(self.rect(), Qt.transparent)
+    def frames(self):
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), ratio, self.color.rgba(), self.numberOfLines,
+               self.lineLength, self.innerRadius, self.penWidth)
+        frames = CircularLoader._frame_cache.get(key)
+        if frames is None:
+            frames = [self.render_frame(counter, ratio) for counter in range(self.numberOfLines)]
+            CircularLoader._frame_cache[key] = frames
+        return frames
+
+    def render_frame(self, counter, ratio):
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing, True)
         painter.setPen(Qt.NoPen)
-
         for i in range(self.numberOfLines):
             painter.save()
             painter.translate(self.width() / 2, self.height() / 2)
             rotateAngle = 360.0 * i / self.numberOfLines
             painter.rotate(rotateAngle)
             painter.translate(self.innerRadius, 0)
-            distance = self.lineCountDistanceFromPrimary(i, self.currentCounter, self.numberOfLines)
+            distance = self.lineCountDistanceFromPrimary(i, counter, self.numberOfLines)
             color = self.currentLineColor(distance, self.numberOfLines, 70.0, 20.0, self.color)
             painter.setBrush(color)
             painter.drawRoundedRect(0, -self.penWidth // 2, self.lineLength, self.penWidth, 70.0, 70.0)
             painter.restore()
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.frames()[self.currentCounter])
 
     def lineCountDistanceFromPrimary(self, current, primary, totalNrOfLines):
         distance = primary - current
@@ -88,6 +217,7 @@ class CircularLoader(QWidget):
         return distance
 
     def currentLineColor(self, countDistance, totalNrOfLines, trailFadePerc, minOpacity, color):
+        color = QColor(color)
         if countDistance == 0:
             return color
         minAlphaF = minOpacity / 100.0
@@ -105,7 +235,7 @@ class CircularLoader(QWidget):
     def start(self):
         self.isSpinning = True
         self.show()
-        if not self.timer.isActive():
+        if self.isVisible() and not self.timer.isActive():
             self.timer.start(1000 // (self.numberOfLines * 2))
 
     def stop(self):
@@ -114,31 +244,53 @@ class CircularLoader(QWidget):
         if self.timer.isActive():
             self.timer.stop()
 
-# FIXED: Security-Enhanced Network Access Manager
-class SecureNetworkAccessManager(QNetworkAccessManager):
-    def __init__(self, parent=None):
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.isSpinning and not self.timer.isActive():
+            self.timer.start(1000 // (self.numberOfLines * 2))
+
+    def hideEvent(self, event):
+        # Also sent when the tab holding the spinner goes to the background
+        super().hideEvent(event)
+        self.timer.stop()
+
+# Resource type names used by $script, $image, ... filter options
+RESOURCE_TYPE_NAMES = {
+    QWebEngineUrlRequestInfo.ResourceTypeSubFrame: "subdocument",
+    QWebEngineUrlRequestInfo.ResourceTypeStylesheet: "stylesheet",
+    QWebEngineUrlRequestInfo.ResourceTypeScript: "script",
+    QWebEngineUrlRequestInfo.ResourceTypeImage: "image",
+    QWebEngineUrlRequestInfo.ResourceTypeFontResource: "font",
+    QWebEngineUrlRequestInfo.ResourceTypeObject: "object",
+    QWebEngineUrlRequestInfo.ResourceTypeMedia: "media",
+    QWebEngineUrlRequestInfo.ResourceTypeFavicon: "image",
+    QWebEngineUrlRequestInfo.ResourceTypeXhr: "xmlhttprequest",
+    QWebEngineUrlRequestInfo.ResourceTypePing: "ping",
+    QWebEngineUrlRequestInfo.ResourceTypePluginResource: "object",
+}
+
+# Ad/tracker blocking request interceptor
+class RequestInterceptor(QWebEngineUrlRequestInterceptor):
+    def __init__(self, filter_engine, parent=None):
         super().__init__(parent)
-        self.blocked_domains = set()
-        self.ad_filters = [
-            "doubleclick.net", "googleadservices.com", "googlesyndication.com",
-            "amazon-adsystem.com", "ads.yahoo.com", "facebook.com/tr",
-            "google-analytics.com", "googletagmanager.com"
-        ]
-
-    def createRequest(self, operation, request, outgoingData=None):
-        url = request.url().toString()
-        domain = urlparse(url).netloc
-        
-        # Block ads and trackers
-        if any(ad_domain in domain for ad_domain in self.ad_filters):
-            return super().createRequest(QNetworkAccessManager.GetOperation,
-                                       QNetworkRequest(QUrl("about:blank")))
-        
-        # Add security headers
-        request.setRawHeader(b"X-Requested-With", b"SecureBrowser")
-        request.setRawHeader(b"DNT", b"1")  # Do Not Track
-        
-        return super().createRequest(operation, request, outgoingData)
+        self.filter_engine = filter_engine
+        self.blocked_count = 0
+        self.allowed_count = 0
+
+    def interceptRequest(self, info):
+        # Top-level navigations are never filtered, only what pages pull in
+        if info.resourceType() != QWebEngineUrlRequestInfo.ResourceTypeMainFrame:
+            url = info.requestUrl()
+            resource_type = RESOURCE_TYPE_NAMES.get(info.resourceType(), "other")
+            if self.filter_engine.should_block(url.toString(), url.host(),
+                                               info.firstPartyUrl().host(),
+                                               resource_type):
+                info.block(True)
+                self.blocked_count += 1
+                return
+
+        self.allowed_count += 1
+        info.setHttpHeader(b"DNT", b"1")  # Do Not Track
 
 # Enhanced Tab Widget with proper new tab button
 class CustomTabWidget(QTabWidget):
@@ -203,23 +355,60 @@ class CustomTabWidget(QTabWidget):
         
         self.setTabsClosable(True)
         self.setMovable(True)
+
+        # Repositioning requests are coalesced into one move per event loop
+        # pass, so opening or restoring many tabs moves the button once
+        self.button_timer = QTimer(self)
+        self.button_timer.setSingleShot(True)
+        self.button_timer.setInterval(0)
+        self.button_timer.timeout.connect(self.position_new_tab_button)
         
         # Connect signals for button positioning
         self.tabBar().tabMoved.connect(self.update_new_tab_button_position)
         self.currentChanged.connect(self.update_new_tab_button_position)
         self.update_new_tab_button_position()
 
+        self.tabBar().setContextMenuPolicy(Qt.CustomContextMenu)
+        self.tabBar().customContextMenuRequested.connect(self.show_tab_context_menu)
+
     def on_new_tab_clicked(self):
         if self.parent_browser and hasattr(self.parent_browser, 'add_new_tab'):
             self.parent_browser.add_new_tab()
 
+    def show_tab_context_menu(self, pos):
+        index = self.tabBar().tabAt(pos)
+        tab = self.widget(index)
+        if not isinstance(tab, BrowserTab) or not self.parent_browser:
+            return
+
+        menu = QMenu(self)
+        menu.setFont(QFont("Arial", 11))
+        pin_action = menu.addAction("📌 Unpin Tab" if tab.pinned else "📌 Pin Tab")
+        discard_action = menu.addAction("💤 Discard Tab")
+        discard_action.setEnabled(self.parent_browser.tab_lifecycle.can_discard(tab))
+        menu.addSeparator()
+        close_action = menu.addAction("❌ Close Tab")
+
+        action = menu.exec_(self.tabBar().mapToGlobal(pos))
+        if action == pin_action:
+            self.parent_browser.set_tab_pinned(tab, not tab.pinned)
+        elif action == discard_action:
+            self.parent_browser.tab_lifecycle.discard_tab(tab)
+        elif action == close_action:
+            self.parent_browser.close_current_tab(self.indexOf(tab))
+
     def update_new_tab_button_position(self):
+        self.button_timer.start()
+
+    def position_new_tab_button(self):
         try:
-            total_width = 0
-            for i in range(self.tabBar().count()):
-                total_width += self.tabBar().tabRect(i).width()
-            
-            button_x = total_width + 5
+            # Only the last tab's right edge matters, whatever the tab count
+            tab_bar = self.tabBar()
+            if tab_bar.count():
+                last_tab = tab_bar.tabRect(tab_bar.count() - 1)
+                button_x = tab_bar.mapTo(self, last_tab.topRight()).x() + 5
+            else:
+                button_x = 5
             button_y = 5  # Adjusted for larger tabs
             
             max_x = self.width() - self.new_tab_button.width() - 10
@@ -245,12 +434,19 @@ class CustomTabWidget(QTabWidget):
 
 # Security-Enhanced WebEngine classes
 class SecureWebEnginePage(QWebEnginePage):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        
-        # Set up secure network access manager
-        self.secure_nam = SecureNetworkAccessManager(self)
-        
+    def __init__(self, parent=None, filter_engine=None, profile=None):
+        # The profile can only be chosen at construction time
+        if profile is not None:
+            super().__init__(profile, parent)
+        else:
+            super().__init__(parent)
+
+        # Per-page interceptor so blocked/allowed counts are tracked per tab
+        self.interceptor = None
+        if filter_engine is not None and hasattr(self, 'setUrlRequestInterceptor'):
+            self.interceptor = RequestInterceptor(filter_engine, self)
+            self.setUrlRequestInterceptor(self.interceptor)
+
         # Configure security settings
         settings = self.settings()
         settings.setAttribute(QWebEngineSettings.JavascriptCanOpenWindows, False)
@@ -258,17 +454,66 @@ class SecureWebEnginePage(QWebEnginePage):
         settings.setAttribute(QWebEngineSettings.LocalStorageEnabled, False)
         settings.setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, False)
 
+    def acceptNavigationRequest(self, url, nav_type, is_main_frame):
+        browser = getattr(self.view(), 'browser_window', None)
+        if is_main_frame and browser is not None:
+            # Zoom before the new document lays out, so it renders once at
+            # the site's zoom instead of being reflowed afterwards
+            zoom = browser.web_settings.zoom_for(url)
+            if self.zoomFactor() != zoom:
+                self.setZoomFactor(zoom)
+        return super().acceptNavigationRequest(url, nav_type, is_main_frame)
+
     def createWindow(self, window_type):
         if hasattr(self.view(), 'browser_window'):
             browser = self.view().browser_window
+            # Links opened from a private tab stay private
+            add_tab = browser.add_private_tab if self.profile().isOffTheRecord() else browser.add_new_tab
             if window_type == QWebEnginePage.WebBrowserTab:
-                new_tab = browser.add_new_tab()
+                new_tab = add_tab()
                 return new_tab.webview.page() if new_tab else None
             elif window_type == QWebEnginePage.WebBrowserWindow:
-                new_tab = browser.add_new_tab()
+                new_tab = add_tab()
                 return new_tab.webview.page() if new_tab else None
         return super().createWindow(window_type)
 
+# One off-the-record profile shared by the private tabs of a window
+class PrivateProfileManager(QObject):
+    """Hands out the off-the-record profile used by private tabs.
+
+    The profile is created with the first private page and shared by the
+    rest, so they share one network context and in-memory cache instead of
+    each starting their own. Every page releases it when destroyed; once
+    the last one is gone the profile is deleted along with its cookies and
+    cache, and the next private tab starts a fresh session.
+    """
+
+    def __init__(self, parent=None, web_settings=None):
+        super().__init__(parent)
+        self.web_settings = web_settings
+        self.profile = None
+        self.page_count = 0
+        self.profiles_created = 0
+
+    def create_page(self, parent=None, filter_engine=None):
+        if self.profile is None:
+            # A profile without a storage name is off the record
+            self.profile = QWebEngineProfile(self)
+            self.profiles_created += 1
+            if self.web_settings is not None:
+                self.web_settings.apply(self.profile)
+        page = SecureWebEnginePage(parent, filter_engine=filter_engine, profile=self.profile)
+        self.page_count += 1
+        page.destroyed.connect(self.page_destroyed)
+        return page
+
+    def page_destroyed(self):
+        self.page_count -= 1
+        if self.page_count == 0 and self.profile is not None:
+            # Qt requires every page of a profile to be gone before it is
+            profile, self.profile = self.profile, None
+            profile.deleteLater()
+
 class SecureWebEngineView(QWebEngineView):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -291,7 +536,7 @@ class SecureWebEngineView(QWebEngineView):
             if menu is None:
                 return
 
-            hit_test = self.page().hitTestContent(event.pos())
+            hit_test = self.page().contextMenuData()
             actions = menu.actions()
 
             # Enhance existing actions
@@ -330,6 +575,10 @@ class SecureWebEngineView(QWebEngineView):
             view_source_action.triggered.connect(self.view_page_source)
             menu.addAction(view_source_action)
 
+            save_links_action = QAction("💾 Save All Links...", menu)
+            save_links_action.triggered.connect(self.save_all_links)
+            menu.addAction(save_links_action)
+
             menu.popup(event.globalPos())
         except Exception as e:
             print(f"Error in context menu: {e}")
@@ -366,165 +615,69 @@ class SecureWebEngineView(QWebEngineView):
 
     def save_link(self, url):
         try:
-            filename, _ = QFileDialog.getSaveFileName(self, "Save Link As", os.path.basename(url))
+            if not self.browser_window:
+                return
+            suggested = link_filename(url, self.browser_window.download_path, set())
+            filename, _ = QFileDialog.getSaveFileName(self, "Save Link As", suggested)
             if filename:
-                if self.browser_window:
-                    self.browser_window.status_label.setText(f"Saving link to {filename}")
+                self.browser_window.save_url(self.page(), url, filename)
+                self.browser_window.status_label.setText(f"📥 Saving link to {filename}")
         except Exception as e:
             print(f"Error saving link: {e}")
 
+    def save_all_links(self):
+        # One script run collects every link; the isolated world keeps page
+        # scripts from seeing or tampering with it
+        page = self.page()
+        page.runJavaScript(
+            "Array.from(new Set(Array.from(document.links, a => a.href)))"
+            ".filter(href => /^https?:/.test(href))",
+            QWebEngineScript.ApplicationWorld,
+            lambda links: self.browser_window and self.browser_window.save_all_links(page, links))
+
     def view_page_source(self):
         if self.browser_window:
             self.browser_window.show_page_source()
 
-# Enhanced Password Manager
-class PasswordManager(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("🔐 Password Manager")
-        self.setGeometry(300, 300, 700, 600)  # Larger dialog
-        self.passwords = {}
-        self.load_passwords()
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-        
-        # FIXED: Larger fonts throughout
-        # Header
-        header = QLabel("Saved Passwords")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
-        header.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header)
-
-        # Password list
-        self.password_tree = QTreeWidget()
-        self.password_tree.setHeaderLabels(["Website", "Username", "Password"])
-        self.password_tree.setColumnWidth(0, 250)
-        self.password_tree.setColumnWidth(1, 200)
-        self.password_tree.setFont(QFont("Arial", 11))
-        self.password_tree.setMinimumHeight(400)
-        self.load_password_list()
-        layout.addWidget(self.password_tree)
-
-        # Buttons with larger fonts
-        button_layout = QHBoxLayout()
-        
-        add_btn = QPushButton("➕ Add Password")
-        add_btn.setFont(QFont("Arial", 11))
-        add_btn.clicked.connect(self.add_password)
-        button_layout.addWidget(add_btn)
-
-        edit_btn = QPushButton("✏️ Edit")
-        edit_btn.setFont(QFont("Arial", 11))
-        edit_btn.clicked.connect(self.edit_password)
-        button_layout.addWidget(edit_btn)
-
-        delete_btn = QPushButton("🗑️ Delete")
-        delete_btn.setFont(QFont("Arial", 11))
-        delete_btn.clicked.connect(self.delete_password)
-        button_layout.addWidget(delete_btn)
-
-        close_btn = QPushButton("Close")
-        close_btn.setFont(QFont("Arial", 11))
-        close_btn.clicked.connect(self.close)
-        button_layout.addWidget(close_btn)
-
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-
-    def load_password_list(self):
-        self.password_tree.clear()
-        for site, data in self.passwords.items():
-            item = QTreeWidgetItem([site, data['username'], '*' * len(data['password'])])
-            self.password_tree.addTopLevelItem(item)
-
-    def add_password(self):
-        site, ok1 = QInputDialog.getText(self, 'Add Password', 'Website:')
-        if ok1 and site:
-            username, ok2 = QInputDialog.getText(self, 'Add Password', 'Username:')
-            if ok2:
-                password, ok3 = QInputDialog.getText(self, 'Add Password', 'Password:', QLineEdit.Password)
-                if ok3:
-                    self.passwords[site] = {'username': username, 'password': password}
-                    self.save_passwords()
-                    self.load_password_list()
-
-    def edit_password(self):
-        current = self.password_tree.currentItem()
-        if current:
-            site = current.text(0)
-            if site in self.passwords:
-                data = self.passwords[site]
-                username, ok1 = QInputDialog.getText(self, 'Edit Password', 'Username:', text=data['username'])
-                if ok1:
-                    password, ok2 = QInputDialog.getText(self, 'Edit Password', 'Password:', QLineEdit.Password, text=data['password'])
-                    if ok2:
-                        self.passwords[site] = {'username': username, 'password': password}
-                        self.save_passwords()
-                        self.load_password_list()
-
-    def delete_password(self):
-        current = self.password_tree.currentItem()
-        if current:
-            site = current.text(0)
-            reply = QMessageBox.question(self, 'Delete Password',
-                                       f'Delete password for {site}?',
-                                       QMessageBox.Yes | QMessageBox.No)
-            if reply == QMessageBox.Yes:
-                del self.passwords[site]
-                self.save_passwords()
-                self.load_password_list()
-
-    def save_passwords(self):
-        try:
-            encrypted_data = {}
-            for site, data in self.passwords.items():
-                encrypted_data[site] = {
-                    'username': base64.b64encode(data['username'].encode()).decode(),
-                    'password': base64.b64encode(data['password'].encode()).decode()
-                }
-            with open('passwords.json', 'w') as f:
-                json.dump(encrypted_data, f)
-        except Exception as e:
-            print(f"Error saving passwords: {e}")
-
-    def load_passwords(self):
-        try:
-            if os.path.exists('passwords.json'):
-                with open('passwords.json', 'r') as f:
-                    encrypted_data = json.load(f)
-                for site, data in encrypted_data.items():
-                    self.passwords[site] = {
-                        'username': base64.b64decode(data['username']).decode(),
-                        'password': base64.b64decode(data['password']).decode()
-                    }
-        except Exception as e:
-            print(f"Error loading passwords: {e}")
-
 # Enhanced Browser Tab
 class BrowserTab(QWidget):
-    def __init__(self, url="https://www.google.com", private_mode=False, browser_window=None):
+    def __init__(self, url="https://www.google.com", private_mode=False, browser_window=None,
+                 lazy=False, title="", history=None):
         super().__init__()
         self.is_loading = False
         self.private_mode = private_mode
         self.browser_window = browser_window
-        self.zoom_factor = 1.0
+        self.webview = None
+
+        # Lifecycle state, see TabLifecycleManager
+        self.pinned = False
+        self.automated = False  # used by a script over JSON-RPC
+        self.discarded = False
+        self.last_active = time.monotonic()
+        self.pending_scroll = None
+
+        # What the tab showed when its view was released
+        self.saved_url = url
+        self.saved_title = title
+        self.saved_history = history
+
+        # Serialized for session.json, redone only after the page changed
+        self.session_cache = None
 
         if not isinstance(url, str):
             print(f"Warning: Invalid URL type {type(url)}, using default")
             url = "https://www.google.com"
 
-        self.init_ui(url, private_mode)
+        self.init_ui(url, private_mode, lazy)
 
-    def init_ui(self, url, private_mode):
+    def init_ui(self, url, private_mode, lazy=False):
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
 
         # Main container
         self.main_container = QWidget()
-        main_layout = QVBoxLayout(self.main_container)
-        main_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_layout = QVBoxLayout(self.main_container)
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
 
         # Enhanced loader container
         self.loader_container = QWidget()
@@ -540,7 +693,22 @@ class BrowserTab(QWidget):
 
         loader_layout.addWidget(self.circular_loader, 0, Qt.AlignCenter)
         loader_layout.addWidget(self.loading_label)
+        self.main_layout.addWidget(self.loader_container)
+
+        if lazy:
+            # Restored from the session: the view is only built once the
+            # tab is first selected
+            self.discarded = True
+        else:
+            self.create_webview(url)
+
+        layout.addWidget(self.main_container)
+        self.setLayout(layout)
 
+        # Initially hide loader
+        self.loader_container.hide()
+
+    def create_webview(self, url, history=None):
         try:
             if not url or not isinstance(url, str):
                 url = "https://www.google.com"
@@ -552,46 +720,130 @@ class BrowserTab(QWidget):
                     url = "https://www.google.com"
 
             # Use secure WebEngine classes
-            if private_mode:
-                profile = QWebEngineProfile()
-                self.webview = SecureWebEngineView()
-                page = SecureWebEnginePage()
-                page.setProfile(profile)
-                self.webview.setPage(page)
+            filter_engine = getattr(self.browser_window, 'filter_engine', None)
+            self.webview = SecureWebEngineView()
+            # Parented to the view so the page goes away with it
+            if self.private_mode:
+                page = self.browser_window.private_profiles.create_page(
+                    self.webview, filter_engine=filter_engine)
             else:
-                self.webview = SecureWebEngineView()
-                page = SecureWebEnginePage()
-                self.webview.setPage(page)
+                page = SecureWebEnginePage(self.webview, filter_engine=filter_engine)
+            self.webview.setPage(page)
 
             # Set browser window reference
             self.webview.browser_window = self.browser_window
+            self.webview.setZoomFactor(self.site_zoom(QUrl(url)))
 
-            # FIXED: Set better initial zoom for readability
-            initial_zoom = 1.3  # 130% for much better readability
-            self.webview.setZoomFactor(initial_zoom)
-            self.zoom_factor = initial_zoom
-
-            self.webview.setUrl(QUrl(url))
+            if history is not None:
+                # Restores back/forward entries and loads the current one
+                QDataStream(history, QIODevice.ReadOnly) >> self.webview.history()
+            else:
+                self.webview.setUrl(QUrl(url))
 
             # Connect signals
             self.webview.loadStarted.connect(self.load_started)
             self.webview.loadProgress.connect(self.load_progress)
             self.webview.loadFinished.connect(self.load_finished)
 
-            main_layout.addWidget(self.loader_container)
-            main_layout.addWidget(self.webview)
+            self.main_layout.addWidget(self.webview)
 
         except Exception as e:
             print(f"Error creating browser tab: {e}")
             self.webview = SecureWebEngineView()
             self.webview.setUrl(QUrl("https://www.google.com"))
-            main_layout.addWidget(self.webview)
+            self.main_layout.addWidget(self.webview)
 
-        layout.addWidget(self.main_container)
-        self.setLayout(layout)
+        if self.browser_window is not None:
+            self.browser_window.connect_tab_signals(self)
 
-        # Initially hide loader
-        self.loader_container.hide()
+    def release_webview(self):
+        """Destroy the view and its renderer, keeping its URL, title and history."""
+        if self.webview is None:
+            return
+        self.saved_url = self.webview.url().toString() or self.saved_url
+        self.saved_title = self.webview.title() or self.saved_title
+        self.saved_history = QByteArray()
+        QDataStream(self.saved_history, QIODevice.WriteOnly) << self.webview.history()
+
+        self.main_layout.removeWidget(self.webview)
+        self.webview.deleteLater()
+        self.webview = None
+
+    def ensure_webview(self):
+        if self.webview is None:
+            self.create_webview(self.saved_url, self.saved_history)
+            self.saved_history = None
+        return self.webview
+
+    def session_entry(self):
+        if self.session_cache is None:
+            if self.webview is not None:
+                history = QByteArray()
+                QDataStream(history, QIODevice.WriteOnly) << self.webview.history()
+            else:
+                history = self.saved_history or QByteArray()
+            self.session_cache = {
+                'url': self.current_url(),
+                'title': self.current_title(),
+                'pinned': self.pinned,
+                'history': base64.b64encode(bytes(history)).decode('ascii'),
+            }
+        return self.session_cache
+
+    def current_url(self):
+        return self.webview.url().toString() if self.webview is not None else self.saved_url
+
+    def current_title(self):
+        return self.webview.title() if self.webview is not None else self.saved_title
+
+    def has_lifecycle_state(self):
+        # QWebEnginePage.setLifecycleState needs Qt 5.14
+        return self.webview is not None and hasattr(self.webview.page(), 'setLifecycleState')
+
+    def renderer_pid(self):
+        if self.webview is None or self.discarded:
+            return 0
+        page = self.webview.page()
+        return page.renderProcessPid() if hasattr(page, 'renderProcessPid') else 0
+
+    def is_playing_audio(self):
+        return self.webview is not None and self.webview.page().recentlyAudible()
+
+    def freeze(self):
+        """Stop script and timers of a hidden tab while keeping its renderer."""
+        if self.has_lifecycle_state():
+            page = self.webview.page()
+            if page.lifecycleState() == QWebEnginePage.Active:
+                page.setLifecycleState(QWebEnginePage.Frozen)
+                return True
+        return False
+
+    def discard(self):
+        """Free the renderer of a hidden tab; restore() reloads it."""
+        if self.discarded or self.webview is None:
+            return False
+        if self.private_mode and not self.has_lifecycle_state():
+            # Rebuilding the view could outlive the shared private profile
+            # and lose the tab's cookies
+            return False
+        self.pending_scroll = self.webview.page().scrollPosition()
+        if self.has_lifecycle_state():
+            self.webview.page().setLifecycleState(QWebEnginePage.Discarded)
+        else:
+            self.release_webview()
+        self.discarded = True
+        return True
+
+    def restore(self):
+        """Make the tab live again. Returns True if it had been discarded."""
+        was_discarded = self.discarded
+        self.discarded = False
+        self.ensure_webview()
+        if self.has_lifecycle_state():
+            page = self.webview.page()
+            if page.lifecycleState() != QWebEnginePage.Active:
+                page.setLifecycleState(QWebEnginePage.Active)
+        return was_discarded
 
     def load_started(self):
         self.is_loading = True
@@ -608,461 +860,243 @@ class BrowserTab(QWidget):
         self.loader_container.hide()
         if not success:
             self.loading_label.setText("Failed to load page")
+        elif self.pending_scroll is not None:
+            # Put a restored tab back where the user left it
+            position, self.pending_scroll = self.pending_scroll, None
+            self.webview.page().runJavaScript(
+                f"window.scrollTo({position.x()}, {position.y()});")
+
+    @property
+    def zoom_factor(self):
+        if self.webview is not None:
+            return self.webview.zoomFactor()
+        return self.site_zoom(QUrl(self.saved_url or ""))
+
+    def site_zoom(self, qurl):
+        web_settings = getattr(self.browser_window, 'web_settings', None)
+        return web_settings.zoom_for(qurl) if web_settings else DEFAULT_ZOOM
 
     def zoom_in(self):
-        self.zoom_factor = min(3.0, self.zoom_factor + 0.1)
-        self.webview.setZoomFactor(self.zoom_factor)
+        self.set_zoom(min(3.0, round(self.zoom_factor + 0.1, 2)))
 
     def zoom_out(self):
-        self.zoom_factor = max(0.5, self.zoom_factor - 0.1)
-        self.webview.setZoomFactor(self.zoom_factor)
+        self.set_zoom(max(0.5, round(self.zoom_factor - 0.1, 2)))
 
     def reset_zoom(self):
-        self.zoom_factor = 1.3  # Default 130%
-        self.webview.setZoomFactor(self.zoom_factor)
-
-# Download classes remain similar but with larger fonts
-class DownloadItem(QWidget):
-    def __init__(self, download_item):
-        super().__init__()
-        self.download = download_item
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QHBoxLayout()
-        
-        self.filename_label = QLabel(os.path.basename(self.download.path()))
-        self.filename_label.setFont(QFont("Arial", 11))
-        
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setMinimumHeight(24)
-        
-        self.status_label = QLabel("Downloading...")
-        self.status_label.setFont(QFont("Arial", 10))
-
-        layout.addWidget(self.filename_label)
-        layout.addWidget(self.progress_bar)
-        layout.addWidget(self.status_label)
-
-        self.setLayout(layout)
-
-        self.download.downloadProgress.connect(self.update_progress)
-        self.download.finished.connect(self.download_finished)
-
-    def update_progress(self, bytes_received, bytes_total):
-        if bytes_total > 0:
-            progress = int((bytes_received / bytes_total) * 100)
-            self.progress_bar.setValue(progress)
-            self.status_label.setText(f"{progress}% ({bytes_received}/{bytes_total} bytes)")
-
-    def download_finished(self):
-        self.status_label.setText("Completed")
-        self.progress_bar.setValue(100)
-
-class DownloadManager(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("📥 Download Manager")
-        self.setGeometry(300, 300, 800, 600)  # Larger dialog
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-
-        # Header with larger font
-        header = QLabel("Downloads")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
-        header.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header)
-
-        self.scroll_area = QScrollArea()
-        self.download_widget = QWidget()
-        self.download_layout = QVBoxLayout(self.download_widget)
-        self.scroll_area.setWidget(self.download_widget)
-        self.scroll_area.setWidgetResizable(True)
-        layout.addWidget(self.scroll_area)
-
-        # Buttons with larger fonts
-        button_layout = QHBoxLayout()
-        
-        clear_btn = QPushButton("🗑️ Clear Completed")
-        clear_btn.setFont(QFont("Arial", 11))
-        clear_btn.clicked.connect(self.clear_completed)
-        button_layout.addWidget(clear_btn)
-
-        close_btn = QPushButton("Close")
-        close_btn.setFont(QFont("Arial", 11))
-        close_btn.clicked.connect(self.close)
-        button_layout.addWidget(close_btn)
-
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-
-    def add_download(self, download_item):
-        download_widget = DownloadItem(download_item)
-        self.download_layout.addWidget(download_widget)
-
-    def clear_completed(self):
-        pass
-
-class BookmarkManager(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("🔖 Bookmark Manager")
-        self.setGeometry(300, 300, 700, 600)  # Larger dialog
-        self.parent_browser = parent
-        self.init_ui()
-        self.load_bookmarks()
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-
-        # Header with larger font
-        header = QLabel("Bookmarks")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
-        header.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header)
-
-        self.bookmark_list = QListWidget()
-        self.bookmark_list.setFont(QFont("Arial", 11))
-        self.bookmark_list.itemDoubleClicked.connect(self.open_bookmark)
-
-        button_layout = QHBoxLayout()
-        
-        open_btn = QPushButton("🌐 Open")
-        open_btn.setFont(QFont("Arial", 11))
-        open_btn.clicked.connect(self.open_selected_bookmark)
-        
-        delete_btn = QPushButton("🗑️ Delete")
-        delete_btn.setFont(QFont("Arial", 11))
-        delete_btn.clicked.connect(self.delete_bookmark)
-        
-        close_btn = QPushButton("Close")
-        close_btn.setFont(QFont("Arial", 11))
-        close_btn.clicked.connect(self.close)
-
-        button_layout.addWidget(open_btn)
-        button_layout.addWidget(delete_btn)
-        button_layout.addWidget(close_btn)
-
-        layout.addWidget(self.bookmark_list)
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-
-    def load_bookmarks(self):
-        if hasattr(self.parent_browser, 'bookmarks'):
-            self.bookmark_list.clear()
-            for title, url in self.parent_browser.bookmarks.items():
-                self.bookmark_list.addItem(f"🔖 {title} - {url}")
-
-    def open_bookmark(self, item):
-        url = item.text().split(" - ")[-1]
-        if self.parent_browser:
-            self.parent_browser.navigate_to_specific_url(url)
-        self.close()
-
-    def open_selected_bookmark(self):
-        current_item = self.bookmark_list.currentItem()
-        if current_item:
-            self.open_bookmark(current_item)
-
-    def delete_bookmark(self):
-        current_item = self.bookmark_list.currentItem()
-        if current_item:
-            title = current_item.text().split(" - ")[0].replace("🔖 ", "")
-            if title in self.parent_browser.bookmarks:
-                del self.parent_browser.bookmarks[title]
-                self.parent_browser.save_bookmarks()
-                self.load_bookmarks()
-
-class HistoryManager(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("📜 History")
-        self.setGeometry(300, 300, 800, 700)  # Larger dialog
-        self.parent_browser = parent
-        self.init_ui()
-        self.load_history()
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-
-        # Header with larger font
-        header = QLabel("Browsing History")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
-        header.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header)
-
-        self.history_list = QListWidget()
-        self.history_list.setFont(QFont("Arial", 11))
-        self.history_list.itemDoubleClicked.connect(self.open_history_item)
-
-        button_layout = QHBoxLayout()
-        
-        open_btn = QPushButton("🌐 Open")
-        open_btn.setFont(QFont("Arial", 11))
-        open_btn.clicked.connect(self.open_selected_item)
-        
-        clear_btn = QPushButton("🗑️ Clear History")
-        clear_btn.setFont(QFont("Arial", 11))
-        clear_btn.clicked.connect(self.clear_history)
-        
-        close_btn = QPushButton("Close")
-        close_btn.setFont(QFont("Arial", 11))
-        close_btn.clicked.connect(self.close)
-
-        button_layout.addWidget(open_btn)
-        button_layout.addWidget(clear_btn)
-        button_layout.addWidget(close_btn)
-
-        layout.addWidget(self.history_list)
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-
-    def load_history(self):
-        if hasattr(self.parent_browser, 'history'):
-            self.history_list.clear()
-            for entry in reversed(self.parent_browser.history):
-                timestamp = entry['timestamp']
-                title = entry['title']
-                url = entry['url']
-                self.history_list.addItem(f"🕒 [{timestamp}] {title} - {url}")
-
-    def open_history_item(self, item):
-        url = item.text().split(" - ")[-1]
-        if self.parent_browser:
-            self.parent_browser.navigate_to_specific_url(url)
-        self.close()
-
-    def open_selected_item(self):
-        current_item = self.history_list.currentItem()
-        if current_item:
-            self.open_history_item(current_item)
-
-    def clear_history(self):
-        reply = QMessageBox.question(self, 'Clear History',
-                                   'Are you sure you want to clear all history?',
-                                   QMessageBox.Yes | QMessageBox.No,
-                                   QMessageBox.No)
-        if reply == QMessageBox.Yes:
-            self.parent_browser.history = []
-            self.parent_browser.save_history()
-            self.load_history()
-
-class SettingsDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("⚙️ Settings")
-        self.setGeometry(300, 300, 600, 700)  # Larger dialog
-        self.parent_browser = parent
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-
-        # Header with larger font
-        header = QLabel("Browser Settings")
-        header.setFont(QFont("Arial", 18, QFont.Bold))
-        header.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header)
-
-        # Scroll area for settings
-        scroll = QScrollArea()
-        scroll_widget = QWidget()
-        scroll_layout = QVBoxLayout(scroll_widget)
-
-        # General Settings
-        general_group = QGroupBox("🌐 General")
-        general_group.setFont(QFont("Arial", 12, QFont.Bold))
-        general_layout = QFormLayout()
-
-        self.homepage_edit = QLineEdit(self.parent_browser.homepage)
-        self.homepage_edit.setFont(QFont("Arial", 11))
-        general_layout.addRow("Homepage:", self.homepage_edit)
-
-        self.download_path_edit = QLineEdit(self.parent_browser.download_path)
-        self.download_path_edit.setFont(QFont("Arial", 11))
-        general_layout.addRow("Download Path:", self.download_path_edit)
-
-        # Zoom level
-        self.zoom_slider = QSlider(Qt.Horizontal)
-        self.zoom_slider.setMinimum(50)
-        self.zoom_slider.setMaximum(300)
-        self.zoom_slider.setValue(140)  # Default 140%
-        self.zoom_label = QLabel("140%")
-        self.zoom_label.setFont(QFont("Arial", 11))
-        self.zoom_slider.valueChanged.connect(lambda v: self.zoom_label.setText(f"{v}%"))
-
-        zoom_layout = QHBoxLayout()
-        zoom_layout.addWidget(self.zoom_slider)
-        zoom_layout.addWidget(self.zoom_label)
-        general_layout.addRow("Default Zoom:", zoom_layout)
-
-        general_group.setLayout(general_layout)
-
-        # Privacy Settings
-        privacy_group = QGroupBox("🔒 Privacy & Security")
-        privacy_group.setFont(QFont("Arial", 12, QFont.Bold))
-        privacy_layout = QFormLayout()
-
-        self.private_browsing = QCheckBox("Enable Private Browsing by Default")
-        self.private_browsing.setFont(QFont("Arial", 11))
-        
-        self.javascript_enabled = QCheckBox("Enable JavaScript")
-        self.javascript_enabled.setFont(QFont("Arial", 11))
-        self.javascript_enabled.setChecked(True)
-
-        self.images_enabled = QCheckBox("Load Images")
-        self.images_enabled.setFont(QFont("Arial", 11))
-        self.images_enabled.setChecked(True)
-
-        self.plugins_enabled = QCheckBox("Enable Plugins")
-        self.plugins_enabled.setFont(QFont("Arial", 11))
-
-        self.ad_blocking = QCheckBox("Enable Ad Blocking")
-        self.ad_blocking.setFont(QFont("Arial", 11))
-        self.ad_blocking.setChecked(True)
-
-        privacy_layout.addRow(self.private_browsing)
-        privacy_layout.addRow(self.javascript_enabled)
-        privacy_layout.addRow(self.images_enabled)
-        privacy_layout.addRow(self.plugins_enabled)
-        privacy_layout.addRow(self.ad_blocking)
-
-        privacy_group.setLayout(privacy_layout)
-
-        # Advanced Settings
-        advanced_group = QGroupBox("🔧 Advanced")
-        advanced_group.setFont(QFont("Arial", 12, QFont.Bold))
-        advanced_layout = QFormLayout()
-
-        self.auto_save_session = QCheckBox("Auto-save Session")
-        self.auto_save_session.setFont(QFont("Arial", 11))
-        self.auto_save_session.setChecked(True)
-
-        self.developer_tools = QCheckBox("Enable Developer Tools")
-        self.developer_tools.setFont(QFont("Arial", 11))
-
-        self.smooth_scrolling = QCheckBox("Smooth Scrolling")
-        self.smooth_scrolling.setFont(QFont("Arial", 11))
-        self.smooth_scrolling.setChecked(True)
-
-        advanced_layout.addRow(self.auto_save_session)
-        advanced_layout.addRow(self.developer_tools)
-        advanced_layout.addRow(self.smooth_scrolling)
-
-        advanced_group.setLayout(advanced_layout)
-
-        scroll_layout.addWidget(general_group)
-        scroll_layout.addWidget(privacy_group)
-        scroll_layout.addWidget(advanced_group)
-
-        scroll.setWidget(scroll_widget)
-        scroll.setWidgetResizable(True)
-        layout.addWidget(scroll)
-
-        # Buttons with larger fonts
-        button_layout = QHBoxLayout()
-        
-        save_btn = QPushButton("💾 Save")
-        save_btn.setFont(QFont("Arial", 11))
-        save_btn.clicked.connect(self.save_settings)
-        
-        reset_btn = QPushButton("🔄 Reset to Defaults")
-        reset_btn.setFont(QFont("Arial", 11))
-        reset_btn.clicked.connect(self.reset_settings)
-        
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setFont(QFont("Arial", 11))
-        cancel_btn.clicked.connect(self.close)
-
-        button_layout.addWidget(save_btn)
-        button_layout.addWidget(reset_btn)
-        button_layout.addWidget(cancel_btn)
-
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
-
-    def save_settings(self):
-        self.parent_browser.homepage = self.homepage_edit.text()
-        self.parent_browser.download_path = self.download_path_edit.text()
-
-        # Apply zoom to all tabs
-        zoom_value = self.zoom_slider.value() / 100.0
-        for i in range(self.parent_browser.tabs.count()):
-            tab = self.parent_browser.tabs.widget(i)
-            if hasattr(tab, 'webview'):
-                tab.webview.setZoomFactor(zoom_value)
-                tab.zoom_factor = zoom_value
-
-        # Apply other settings
-        for i in range(self.parent_browser.tabs.count()):
-            tab = self.parent_browser.tabs.widget(i)
-            if hasattr(tab, 'webview'):
-                settings = tab.webview.settings()
-                settings.setAttribute(QWebEngineSettings.JavascriptEnabled,
-                                    self.javascript_enabled.isChecked())
-                settings.setAttribute(QWebEngineSettings.AutoLoadImages,
-                                    self.images_enabled.isChecked())
-                settings.setAttribute(QWebEngineSettings.PluginsEnabled,
-                                    self.plugins_enabled.isChecked())
-
-        self.parent_browser.save_settings()
-        QMessageBox.information(self, "Settings", "Settings saved successfully!")
-        self.close()
-
-    def reset_settings(self):
-        reply = QMessageBox.question(self, 'Reset Settings',
-                                   'Reset all settings to defaults?',
-                                   QMessageBox.Yes | QMessageBox.No)
-        if reply == QMessageBox.Yes:
-            self.homepage_edit.setText("https://www.google.com")
-            self.download_path_edit.setText(os.path.expanduser("~/Downloads"))
-            self.zoom_slider.setValue(140)
-            self.javascript_enabled.setChecked(True)
-            self.images_enabled.setChecked(True)
-            self.ad_blocking.setChecked(True)
-
-class ExtensionManager:
-    def __init__(self, browser):
+        self.set_zoom(None)
+
+    def set_zoom(self, factor):
+        """Zoom the site shown in this tab, or go back to the default with None."""
+        if self.browser_window is not None:
+            self.browser_window.set_site_zoom(QUrl(self.current_url()), factor)
+        elif self.webview is not None:
+            self.webview.setZoomFactor(factor or DEFAULT_ZOOM)
+
+    def sync_zoom(self):
+        """Catch up with a site or default zoom changed while in the background."""
+        if self.webview is not None:
+            zoom = self.site_zoom(self.webview.url())
+            if self.webview.zoomFactor() != zoom:
+                self.webview.setZoomFactor(zoom)
+
+    def request_counts(self):
+        if self.webview is None:
+            return 0, 0
+        interceptor = getattr(self.webview.page(), 'interceptor', None)
+        if interceptor is None:
+            return 0, 0
+        return interceptor.blocked_count, interceptor.allowed_count
+
+# Background tab lifecycle: freeze idle tabs, later discard them
+class TabLifecycleManager(QObject):
+    """Applies the freeze/discard policy to background tabs.
+
+    Tabs hidden for freeze_after seconds are frozen, which keeps the
+    renderer but stops script and timers. After discard_after seconds, or
+    once more than max_live_tabs tabs are live, the least recently used
+    tabs are discarded and reload when selected again. Pinned tabs, tabs
+    driven over JSON-RPC (see rpc_server.py) and tabs playing audio are
+    left alone.
+    """
+
+    def __init__(self, browser, freeze_after=300, discard_after=1800, max_live_tabs=20,
+                 check_interval=30000):
+        super().__init__(browser)
         self.browser = browser
-        self.extensions = {}
-        self.extension_dir = "extensions"
-        self.load_extensions()
+        self.freeze_after = freeze_after
+        self.discard_after = discard_after
+        self.max_live_tabs = max_live_tabs
+        self.discard_count = 0
+        self.restore_count = 0
+        self.current_tab = None
 
-    def load_extensions(self):
-        if not os.path.exists(self.extension_dir):
-            os.makedirs(self.extension_dir)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check_tabs)
+        self.timer.start(check_interval)
+
+    def browser_tabs(self):
+        tabs = self.browser.tabs
+        return [tabs.widget(i) for i in range(tabs.count())
+                if isinstance(tabs.widget(i), BrowserTab)]
+
+    def tab_activated(self, index):
+        now = time.monotonic()
+        if self.current_tab is not None:
+            # The previous tab starts idling now
+            self.current_tab.last_active = now
+
+        tab = self.browser.tabs.widget(index)
+        self.current_tab = tab if isinstance(tab, BrowserTab) else None
+        if self.current_tab is None:
+            return
+        tab.last_active = now
+        if tab.restore():
+            self.restore_count += 1
+            self.browser.tabs.tabBar().setTabTextColor(index, QColor())
+        tab.sync_zoom()
+        self.enforce_live_limit()
+        self.browser.update_lifecycle_label()
+
+    def can_discard(self, tab):
+        if (tab is self.browser.tabs.currentWidget() or tab.pinned or tab.automated
+                or tab.discarded):
+            return False
+        return not tab.is_playing_audio()
+
+    def discard_tab(self, tab):
+        if not self.can_discard(tab) or not tab.discard():
+            return False
+        self.discard_count += 1
+        index = self.browser.tabs.indexOf(tab)
+        self.browser.tabs.tabBar().setTabTextColor(index, QColor(150, 150, 150))
+        self.browser.update_lifecycle_label()
+        return True
+
+    def check_tabs(self):
+        now = time.monotonic()
+        for tab in self.browser_tabs():
+            if not self.can_discard(tab):
+                continue
+            idle = now - tab.last_active
+            if idle >= self.discard_after:
+                self.discard_tab(tab)
+            elif idle >= self.freeze_after:
+                tab.freeze()
+        self.enforce_live_limit()
+
+    def enforce_live_limit(self):
+        live = [tab for tab in self.browser_tabs() if not tab.discarded]
+        excess = len(live) - self.max_live_tabs
+        if excess <= 0:
+            return
+        candidates = sorted((tab for tab in live if self.can_discard(tab)),
+                            key=lambda tab: tab.last_active)
+        for tab in candidates[:excess]:
+            self.discard_tab(tab)
+
+    def discarded_count(self):
+        return sum(1 for tab in self.browser_tabs() if tab.discarded)
+
+# Renderer memory sampling and eviction under memory pressure
+class MemoryMonitor(QObject):
+    """Samples the RSS of the browser and its renderer processes.
+
+    The timer only collects pids on the GUI thread; the /proc reads run on
+    a worker thread and the result comes back through the sampled signal.
+    Only the renderers count toward budget_mb, since discarding tabs does
+    not shrink the browser process itself. When they exceed it, background
+    tabs are discarded through the TabLifecycleManager, largest renderers
+    first.
+    """
+    sampled = pyqtSignal(object)
+
+    def __init__(self, browser, budget_mb=MEMORY_BUDGET_MB, interval=SAMPLE_INTERVAL):
+        super().__init__(browser)
+        self.browser = browser
+        self.budget_mb = budget_mb
+        self.sampling = False
+        self.total_rss = 0
+        self.renderer_rss = 0
+        self.evict_count = 0
 
-        for filename in os.listdir(self.extension_dir):
-            if filename.endswith('.json'):
-                self.load_extension(filename)
+        self.sampled.connect(self.apply_sample)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sample)
+        self.timer.start(interval)
 
-    def load_extension(self, filename):
+    def sample(self):
+        if self.sampling:
+            return
+        pids = {os.getpid()}
+        for tab in self.browser.tab_lifecycle.browser_tabs():
+            pid = tab.renderer_pid()
+            if pid:
+                pids.add(pid)
+        self.sampling = True
+        threading.Thread(target=self.read_sample, args=(pids,), daemon=True).start()
+
+    def read_sample(self, pids):
         try:
-            with open(os.path.join(self.extension_dir, filename), 'r') as f:
-                extension_data = json.load(f)
-            self.extensions[extension_data['id']] = extension_data
-            print(f"Loaded extension: {extension_data['name']}")
+            rss_by_pid = sample_rss(pids)
         except Exception as e:
-            print(f"Error loading extension {filename}: {e}")
+            print(f"Error sampling memory: {e}")
+            rss_by_pid = {}
+        self.sampled.emit(rss_by_pid)
+
+    def apply_sample(self, rss_by_pid):
+        self.sampling = False
+        self.total_rss = sum(rss_by_pid.values())
+        self.renderer_rss = self.total_rss - rss_by_pid.get(os.getpid(), 0)
+        self.browser.update_memory_label()
+
+        budget = self.budget_mb * 1024 * 1024
+        if self.budget_mb and self.renderer_rss > budget:
+            self.evict(rss_by_pid, self.renderer_rss - budget)
+
+    def evict(self, rss_by_pid, excess):
+        lifecycle = self.browser.tab_lifecycle
+        live = [(tab, tab.renderer_pid()) for tab in lifecycle.browser_tabs()
+                if not tab.discarded]
+        candidates = [(tab, pid, tab.last_active) for tab, pid in live
+                      if pid and lifecycle.can_discard(tab)]
+        for tab in choose_evictions(candidates, [pid for _, pid in live], rss_by_pid, excess):
+            if lifecycle.discard_tab(tab):
+                self.evict_count += 1
+
+# Address bar suggestions
+class SuggestionModel(QAbstractListModel):
+    """Rows shown in the address bar completer popup.
+
+    The popup shows the display text while the completer inserts the URL
+    (EditRole). Open tab suggestions carry their tab in TabRole.
+    """
+    TabRole = Qt.UserRole + 1
 
-    def install_extension(self, extension_path):
-        try:
-            with open(extension_path, 'r') as f:
-                extension_data = json.load(f)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.suggestions = []  # (display text, url, tab or None)
 
-            filename = f"{extension_data['id']}.json"
-            target_path = os.path.join(self.extension_dir, filename)
+    def set_suggestions(self, suggestions):
+        self.beginResetModel()
+        self.suggestions = suggestions
+        self.endResetModel()
 
-            with open(target_path, 'w') as f:
-                json.dump(extension_data, f, indent=2)
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.suggestions)
 
-            self.extensions[extension_data['id']] = extension_data
-            QMessageBox.information(self.browser, "Extension Installed",
-                                  f"Extension '{extension_data['name']}' installed successfully!")
-        except Exception as e:
-            QMessageBox.critical(self.browser, "Error", f"Failed to install extension: {e}")
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        text, url, tab = self.suggestions[index.row()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.EditRole:
+            return url
+        if role == Qt.ToolTipRole:
+            return url
+        if role == self.TabRole:
+            return tab
+        return None
 
 # Main Browser Class
 class WebKitBrowser(QMainWindow):
@@ -1070,20 +1104,130 @@ class WebKitBrowser(QMainWindow):
         super().__init__()
         self.homepage = "https://www.google.com"
         self.download_path = os.path.expanduser("~/Downloads")
-        self.bookmarks = {}
-        self.history = []
+        self.bookmarks = BookmarkStore()
+        self.bookmarks_writable = True
+        self.bookmark_importer = None
+        # Bookmarks, settings, passwords and the session; written off the GUI thread
+        self.storage = JsonStore()
+        # Everything else lives in the data directory too, copied over from
+        # where older versions kept it
+        self.history_store = HistoryStore(data_path(HISTORY_DB, suffixes=("-wal", "-shm")),
+                                          legacy_path=data_path(LEGACY_HISTORY_FILE))
+        self.suggestion_index = SuggestionIndex()
+        self.completed_url = None
         self.private_mode = False
+        self.filter_engine = FilterEngine()
+        self.web_settings = BrowserSettings()
+        self.download_profiles = {}
+        self.pending_saves = {}  # path -> (url, priority, time, page) for page.download() calls
+        self.link_backlog = deque()  # (page, url, path) not handed to QtWebEngine yet
+        self.tab_lifecycle = TabLifecycleManager(self)
+        self.memory_monitor = MemoryMonitor(self)
+        self.restore_tabs = True
+
+        # Session changes are written once things have been quiet for a bit
+        self.session_timer = QTimer(self)
+        self.session_timer.setSingleShot(True)
+        self.session_timer.setInterval(SAVE_DELAY)
+        self.session_timer.timeout.connect(self.save_session)
         
-        self.init_ui()
-        self.load_settings()
-        self.load_bookmarks()
-        self.load_history()
+        with startup_timeline.phase("ui-build"):
+            self.init_ui()
+        # Created after the tab widget so the profile is destroyed after
+        # the pages using it
+        self.private_profiles = PrivateProfileManager(self, self.web_settings)
+        # The download, password and extension managers are built the first
+        # time they are used, see the properties below; the limits live here
+        # so settings don't have to build the download manager
+        self.download_queue = DownloadQueue()
+        self._download_manager = None
+        self._password_manager = None
+        self._extension_manager = None
+        self.rpc_server = None
+        with startup_timeline.phase("settings-load"):
+            self.load_settings()
+            self.apply_web_settings()
+            self.load_bookmarks()
         self.setup_shortcuts()
 
-        # Managers
-        self.extension_manager = ExtensionManager(self)
-        self.download_manager = DownloadManager(self)
-        self.password_manager = PasswordManager(self)
+        with startup_timeline.phase("first-tab"):
+            if not (self.restore_tabs and self.restore_session()):
+                self.add_new_tab()
+
+        # Compiled filter lists are mmapped from the cache, or rebuilt in the
+        # background when the lists in filter_lists/ have changed
+        threading.Thread(target=self.load_filter_lists, daemon=True).start()
+
+        # The address bar index is filled from history.db off the GUI thread;
+        # visits recorded meanwhile are merged when it is swapped in
+        self.reload_suggestions()
+
+    # The managers and dialogs live in downloads.py and dialogs.py, which are
+    # imported the first time one of them is needed rather than at startup
+
+    @property
+    def download_manager(self):
+        if self._download_manager is None:
+            from downloads import DownloadManager
+            self._download_manager = DownloadManager(self, self.download_queue)
+        return self._download_manager
+
+    @property
+    def password_manager(self):
+        # Reads passwords.json, so only when the password manager is opened
+        if self._password_manager is None:
+            from dialogs import PasswordManager
+            self._password_manager = PasswordManager(self)
+        return self._password_manager
+
+    @property
+    def extension_manager(self):
+        # Scans the extensions directory, so only when extensions are used
+        if self._extension_manager is None:
+            from dialogs import ExtensionManager
+            self._extension_manager = ExtensionManager(self)
+        return self._extension_manager
+
+    def schedule_downloads(self):
+        # Nothing can be waiting before the first download built the manager
+        if self._download_manager is not None:
+            self._download_manager.schedule()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        startup_timeline.mark("first-paint")
+
+    def apply_web_settings(self):
+        self.web_settings.apply(QWebEngineProfile.defaultProfile())
+        if self.private_profiles.profile is not None:
+            self.web_settings.apply(self.private_profiles.profile)
+
+        current_tab = self.tabs.currentWidget()
+        if isinstance(current_tab, BrowserTab):
+            current_tab.sync_zoom()
+        self.update_zoom_label()
+
+    def load_filter_lists(self):
+        try:
+            self.filter_engine.load_lists(cache_path=data_path(CACHE_FILE))
+        except Exception as e:
+            print(f"Error loading filter lists: {e}")
+
+    def reload_suggestions(self):
+        bookmarks = [(bookmark.url, bookmark.title) for bookmark in self.bookmarks]
+        marker = self.suggestion_index.begin_load()
+        threading.Thread(target=self.load_suggestions, args=(bookmarks, marker),
+                         daemon=True).start()
+
+    def load_suggestions(self, bookmarks, marker):
+        try:
+            # Visits queued before begin_load() have to be in the snapshot;
+            # later ones are replayed unless the snapshot already has them
+            self.history_store.flush()
+            rows, cutoff = self.history_store.frecency_snapshot()
+            self.suggestion_index.load(rows, bookmarks, cutoff, marker)
+        except Exception as e:
+            print(f"Error loading address bar suggestions: {e}")
 
     def init_geometry(self):
         """FIXED: Proper window sizing and positioning for different screen sizes"""
@@ -1125,7 +1269,11 @@ class WebKitBrowser(QMainWindow):
         # Custom tab widget
         self.tabs = CustomTabWidget(self)
         self.tabs.tabCloseRequested.connect(self.close_current_tab)
+        # Restore a discarded tab before anything reads its view
+        self.tabs.currentChanged.connect(self.tab_lifecycle.tab_activated)
         self.tabs.currentChanged.connect(self.update_url_bar)
+        self.tabs.currentChanged.connect(lambda index: self.schedule_session_save())
+        self.tabs.tabBar().tabMoved.connect(lambda start, end: self.schedule_session_save())
 
         # Create enhanced toolbar
         self.create_toolbar()
@@ -1137,9 +1285,6 @@ class WebKitBrowser(QMainWindow):
         main_widget.setLayout(main_layout)
         self.setCentralWidget(main_widget)
 
-        # Start with one tab
-        self.add_new_tab()
-
     def create_menu_bar(self):
         menubar = self.menuBar()
         
@@ -1188,6 +1333,10 @@ class WebKitBrowser(QMainWindow):
         save_page_action.triggered.connect(self.save_page)
         file_menu.addAction(save_page_action)
 
+        save_links_action = QAction('💾 Save All Links...', self)
+        save_links_action.triggered.connect(self.save_all_links_in_page)
+        file_menu.addAction(save_links_action)
+
         file_menu.addSeparator()
 
         close_tab_action = QAction('❌ Close Tab', self)
@@ -1241,6 +1390,10 @@ class WebKitBrowser(QMainWindow):
         add_bookmark_action.triggered.connect(self.add_bookmark)
         bookmarks_menu.addAction(add_bookmark_action)
 
+        import_bookmarks_action = QAction('📥 Import Bookmarks...', self)
+        import_bookmarks_action.triggered.connect(self.import_bookmarks)
+        bookmarks_menu.addAction(import_bookmarks_action)
+
         manage_bookmarks_action = QAction('📂 Manage Bookmarks', self)
         manage_bookmarks_action.triggered.connect(self.show_bookmark_manager)
         bookmarks_menu.addAction(manage_bookmarks_action)
@@ -1357,15 +1510,27 @@ class WebKitBrowser(QMainWindow):
             }
         """)
         self.url_bar.returnPressed.connect(self.navigate_to_url)
+        self.url_bar.textEdited.connect(self.update_suggestions)
         nav_bar.addWidget(self.url_bar)
 
+        # Suggestions are ranked by SuggestionIndex, so the completer only
+        # shows the rows it is given instead of filtering them itself
+        self.suggestion_model = SuggestionModel(self)
+        self.completer = QCompleter(self.suggestion_model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(10)
+        self.completer.setWidget(self.url_bar)
+        self.completer.popup().setFont(QFont("Arial", 11))
+        self.completer.activated[QModelIndex].connect(self.open_suggestion)
+
         nav_bar.addSeparator()
 
         # Action buttons
-        bookmark_btn = QAction("⭐", self)
-        bookmark_btn.setToolTip("Add Bookmark (Ctrl+D)")
-        bookmark_btn.triggered.connect(self.add_bookmark)
-        nav_bar.addAction(bookmark_btn)
+        # Filled in when the current page is bookmarked, see update_bookmark_button
+        self.bookmark_btn = QAction("☆", self)
+        self.bookmark_btn.setToolTip("Add Bookmark (Ctrl+D)")
+        self.bookmark_btn.triggered.connect(self.toggle_bookmark)
+        nav_bar.addAction(self.bookmark_btn)
 
         # Zoom controls
         zoom_out_btn = QAction("🔍➖", self)
@@ -1398,12 +1563,33 @@ class WebKitBrowser(QMainWindow):
         self.status_bar.addPermanentWidget(QLabel(" | "))
 
         # Zoom level
-        self.zoom_level_label = QLabel("140%")
+        self.zoom_level_label = QLabel(f"{round(self.web_settings.default_zoom * 100)}%")
         self.zoom_level_label.setFont(QFont("Arial", 10))
         self.status_bar.addPermanentWidget(self.zoom_level_label)
 
         self.status_bar.addPermanentWidget(QLabel(" | "))
 
+        # Browser plus renderer memory, sampled by MemoryMonitor
+        self.memory_label = QLabel("🧠 —")
+        self.memory_label.setFont(QFont("Arial", 10))
+        self.status_bar.addPermanentWidget(self.memory_label)
+
+        self.status_bar.addPermanentWidget(QLabel(" | "))
+
+        # Blocked requests in the current tab
+        self.blocked_label = QLabel("🛡️ 0 blocked")
+        self.blocked_label.setFont(QFont("Arial", 10))
+        self.status_bar.addPermanentWidget(self.blocked_label)
+
+        self.status_bar.addPermanentWidget(QLabel(" | "))
+
+        # Discarded background tabs
+        self.lifecycle_label = QLabel("💤 0 discarded")
+        self.lifecycle_label.setFont(QFont("Arial", 10))
+        self.status_bar.addPermanentWidget(self.lifecycle_label)
+
+        self.status_bar.addPermanentWidget(QLabel(" | "))
+
         # Security indicator
         self.security_label = QLabel("🔒 Secure")
         self.security_label.setFont(QFont("Arial", 10))
@@ -1434,7 +1620,7 @@ class WebKitBrowser(QMainWindow):
         new_tab_shortcut = QShortcut(QKeySequence("Ctrl+T"), self)
         new_tab_shortcut.activated.connect(self.add_new_tab)
 
-    def add_new_tab(self, url=None):
+    def add_new_tab(self, url=None, background=False):
         try:
             if url is None or not isinstance(url, str):
                 url = self.homepage
@@ -1448,31 +1634,9 @@ class WebKitBrowser(QMainWindow):
                 title = "🔒 Private Tab"
 
             i = self.tabs.addTab(browser_tab, title)
-            self.tabs.setCurrentIndex(i)
-
-            if hasattr(browser_tab, 'webview') and browser_tab.webview:
-                try:
-                    browser_tab.webview.urlChanged.connect(
-                        lambda qurl: self.update_tab_title(qurl, browser_tab)
-                    )
-
-                    browser_tab.webview.titleChanged.connect(
-                        lambda title: self.update_tab_title_with_text(title, browser_tab)
-                    )
-
-                    browser_tab.webview.loadFinished.connect(
-                        lambda ok: self.page_load_finished(ok, browser_tab)
-                    )
-
-                    # Connect download signal if available
-                    try:
-                        if hasattr(browser_tab.webview.page(), 'profile'):
-                            browser_tab.webview.page().profile().downloadRequested.connect(self.handle_download)
-                    except:
-                        pass
-
-                except Exception as signal_error:
-                    print(f"Warning: Could not connect signals: {signal_error}")
+            if not background:
+                self.tabs.setCurrentIndex(i)
+            self.schedule_session_save()
 
             return browser_tab
 
@@ -1482,6 +1646,140 @@ class WebKitBrowser(QMainWindow):
             QMessageBox.critical(self, "Error", error_msg)
             return None
 
+    def connect_tab_signals(self, browser_tab):
+        # Called by BrowserTab each time it creates a view, including when a
+        # discarded tab is rebuilt
+        try:
+            browser_tab.webview.urlChanged.connect(
+                lambda qurl: self.update_tab_title(qurl, browser_tab)
+            )
+
+            browser_tab.webview.titleChanged.connect(
+                lambda title: self.update_tab_title_with_text(title, browser_tab)
+            )
+
+            browser_tab.webview.loadFinished.connect(
+                lambda ok: self.page_load_finished(ok, browser_tab)
+            )
+
+            browser_tab.webview.urlChanged.connect(
+                lambda qurl: self.schedule_session_save(browser_tab)
+            )
+            browser_tab.webview.titleChanged.connect(
+                lambda title: self.schedule_session_save(browser_tab)
+            )
+
+            self.watch_downloads(browser_tab.webview.page().profile())
+
+        except Exception as signal_error:
+            print(f"Warning: Could not connect signals: {signal_error}")
+
+    def watch_downloads(self, profile):
+        # Tabs share profiles, so connect each profile only once or a single
+        # download would be handled once per open tab
+        key = id(profile)
+        if key in self.download_profiles:
+            return
+        self.download_profiles[key] = profile
+        profile.downloadRequested.connect(self.handle_download)
+        profile.destroyed.connect(lambda: self.download_profiles.pop(key, None))
+
+    def set_tab_pinned(self, browser_tab, pinned):
+        browser_tab.pinned = pinned
+        index = self.tabs.indexOf(browser_tab)
+        self.tabs.setTabToolTip(index, "📌 Pinned: never discarded" if pinned else "")
+        self.schedule_session_save(browser_tab)
+
+    def schedule_session_save(self, browser_tab=None):
+        if browser_tab is not None:
+            browser_tab.session_cache = None
+        self.session_timer.start()
+
+    def save_session(self):
+        if not self.restore_tabs:
+            return
+        tabs = []
+        current = 0
+        for i in range(self.tabs.count()):
+            browser_tab = self.tabs.widget(i)
+            if not isinstance(browser_tab, BrowserTab) or browser_tab.private_mode:
+                continue
+            if browser_tab is self.tabs.currentWidget():
+                current = len(tabs)
+            tabs.append(browser_tab.session_entry())
+        save_session(self.storage, tabs, current)
+
+    def restore_session(self):
+        """Reopen the saved tabs. Only the selected one builds its view now."""
+        session = load_session(self.storage)
+        if not session:
+            return False
+
+        # Adding the first tab would select it and build its view
+        self.tabs.blockSignals(True)
+        try:
+            for entry in session['tabs']:
+                url = entry.get('url') or self.homepage
+                title = entry.get('title') or url
+                history = entry.get('history')
+                history = QByteArray(base64.b64decode(history)) if history else None
+                browser_tab = self.add_lazy_tab(url, title, history)
+                if entry.get('pinned'):
+                    self.set_tab_pinned(browser_tab, True)
+
+            current = min(max(session.get('current', 0), 0), self.tabs.count() - 1)
+            self.tabs.setCurrentIndex(current)
+        finally:
+            self.tabs.blockSignals(False)
+
+        self.tab_lifecycle.tab_activated(current)
+        self.update_url_bar(current)
+        return True
+
+    def update_lifecycle_label(self):
+        manager = self.tab_lifecycle
+        self.lifecycle_label.setText(f"💤 {manager.discarded_count()} discarded")
+        self.lifecycle_label.setToolTip(
+            f"Background tabs discarded: {manager.discard_count}, "
+            f"restored: {manager.restore_count}")
+
+    def update_memory_label(self):
+        monitor = self.memory_monitor
+        if not monitor.total_rss:
+            return
+        self.memory_label.setText(f"🧠 {format_bytes(monitor.total_rss)}")
+        self.memory_label.setToolTip(
+            f"Renderers: {format_bytes(monitor.renderer_rss)}, "
+            f"renderer budget: {format_bytes(monitor.budget_mb * 1024 * 1024)}, "
+            f"tabs evicted for memory: {monitor.evict_count}")
+
+    def add_lazy_tab(self, url, title=None, history=None):
+        """Add a background tab that builds its view when first selected."""
+        title = title or url
+        browser_tab = BrowserTab(url, False, self, lazy=True, title=title, history=history)
+        icon = "🔒" if url.startswith("https") else "🔓"
+        label = title if len(title) <= 20 else title[:17] + "..."
+        i = self.tabs.addTab(browser_tab, f"{icon} {label}")
+        self.tabs.tabBar().setTabTextColor(i, QColor(150, 150, 150))
+        return browser_tab
+
+    def open_urls(self, urls):
+        """Open URLs from the command line or forwarded by a later launch.
+
+        Only the last one loads now; the others are lazy tabs, so a batch of
+        hundreds doesn't start hundreds of renderers at once.
+        """
+        urls = [url for url in urls if url.strip()]
+        for url in urls[:-1]:
+            self.add_lazy_tab(url)
+        if urls:
+            self.add_new_tab(urls[-1])
+
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
     def add_private_tab(self):
         old_private_mode = self.private_mode
         self.private_mode = True
@@ -1493,28 +1791,54 @@ class WebKitBrowser(QMainWindow):
         if self.tabs.count() <= 1:
             self.close()
         else:
+            browser_tab = self.tabs.widget(index)
             self.tabs.removeTab(index)
+            if browser_tab is not None:
+                # removeTab() keeps the widget, and with it the renderer, alive
+                browser_tab.deleteLater()
+            self.update_lifecycle_label()
+            self.schedule_session_save()
 
     def zoom_in(self):
         current_tab = self.tabs.currentWidget()
         if current_tab and hasattr(current_tab, 'zoom_in'):
             current_tab.zoom_in()
-            zoom_percent = int(current_tab.zoom_factor * 100)
-            self.zoom_level_label.setText(f"{zoom_percent}%")
 
     def zoom_out(self):
         current_tab = self.tabs.currentWidget()
         if current_tab and hasattr(current_tab, 'zoom_out'):
             current_tab.zoom_out()
-            zoom_percent = int(current_tab.zoom_factor * 100)
-            self.zoom_level_label.setText(f"{zoom_percent}%")
 
     def reset_zoom(self):
         current_tab = self.tabs.currentWidget()
         if current_tab and hasattr(current_tab, 'reset_zoom'):
             current_tab.reset_zoom()
-            zoom_percent = int(current_tab.zoom_factor * 100)
-            self.zoom_level_label.setText(f"{zoom_percent}%")
+
+    def set_site_zoom(self, qurl, factor):
+        """Remember a zoom for qurl's host, or forget it with None.
+
+        Every open tab on the host is updated in the same pass; discarded
+        tabs get it when their page is loaded again.
+        """
+        host = qurl.host()
+        if factor is None:
+            self.web_settings.site_zoom.pop(host, None)
+        else:
+            self.web_settings.site_zoom[host] = factor
+        zoom = self.web_settings.zoom_for(qurl)
+
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if isinstance(tab, BrowserTab) and tab.webview is not None:
+                if tab.webview.url().host() == host and tab.webview.zoomFactor() != zoom:
+                    tab.webview.setZoomFactor(zoom)
+        self.update_zoom_label()
+        self.save_settings()
+
+    def update_zoom_label(self):
+        current_tab = self.tabs.currentWidget()
+        if isinstance(current_tab, BrowserTab):
+            self.zoom_level_label.setText(f"{round(current_tab.zoom_factor * 100)}%")
 
     def toggle_fullscreen(self):
         if self.isFullScreen():
@@ -1530,6 +1854,11 @@ class WebKitBrowser(QMainWindow):
             if filename:
                 current_tab.webview.page().toHtml(lambda html: self.save_html_to_file(html, filename))
 
+    def save_all_links_in_page(self):
+        browser = self.current_browser()
+        if browser:
+            browser.save_all_links()
+
     def save_html_to_file(self, html, filename):
         try:
             with open(filename, 'w', encoding='utf-8') as f:
@@ -1566,7 +1895,76 @@ class WebKitBrowser(QMainWindow):
     def show_password_manager(self):
         self.password_manager.show()
 
+    def save_url(self, page, url, path, priority=PRIORITY_NORMAL):
+        """Download url to path in the background through page's profile."""
+        qurl = QUrl(url)
+        self.pending_saves[path] = (qurl.toString(), priority, time.monotonic(), page)
+        # The file name comes back as suggestedFileName() even after a
+        # redirect, when the download's URL no longer matches
+        page.download(qurl, os.path.basename(path))
+
+    def pop_pending_save(self, download):
+        """(path, request) of the save_url() call a download belongs to, or None."""
+        # The same URL may be saved to several paths, so match the file
+        # name too; after a redirect only the page and the name are left
+        url = download.url().toString()
+        page = download.page()
+        name = download.suggestedFileName()
+        candidates = [path for path in self.pending_saves if os.path.basename(path) == name]
+        for path in candidates:
+            if self.pending_saves[path][0] == url:
+                return path, self.pending_saves.pop(path)
+        for path in candidates:
+            if self.pending_saves[path][3] is page:
+                return path, self.pending_saves.pop(path)
+        return None
+
+    def save_all_links(self, page, links):
+        if not links:
+            self.status_label.setText("No links to save on this page")
+            return
+        directory = QFileDialog.getExistingDirectory(
+            self, f"Save {len(links)} Links To", self.download_path)
+        if not directory:
+            return
+
+        taken = set()
+        for url in links:
+            self.link_backlog.append((page, url, link_filename(url, directory, taken)))
+        self.status_label.setText(f"📥 Saving {len(links)} links to {directory}")
+        self.feed_link_saves()
+        self.download_manager.show()
+
+    def feed_link_saves(self):
+        # Keep only a few bulk saves inside QtWebEngine at a time; each
+        # finished download pulls the next ones from the backlog
+        queue = self.download_queue
+        # A save QtWebEngine never turned into a download must not hold a slot
+        stale = time.monotonic() - 30
+        for path in [path for path, pending in self.pending_saves.items() if pending[2] < stale]:
+            del self.pending_saves[path]
+
+        # Paused downloads are not transferring and leave their slot free
+        while self.link_backlog and len(self.pending_saves) + queue.unpaused() < MAX_PENDING_LINK_SAVES:
+            page, url, path = self.link_backlog.popleft()
+            try:
+                self.save_url(page, url, path, PRIORITY_LOW)
+            except RuntimeError:
+                pass  # the tab was closed meanwhile
+
     def handle_download(self, download):
+        pending = self.pop_pending_save(download)
+        if pending is not None:
+            # Requested by save_url, the path is already chosen
+            path, (_, priority, _, _) = pending
+            download.setPath(path)
+            download.accept()
+            self.download_manager.add_download(download, priority)
+            download.finished.connect(self.feed_link_saves)
+            download.isPausedChanged.connect(lambda paused: self.feed_link_saves())
+            self.feed_link_saves()
+            return
+
         try:
             path, _ = QFileDialog.getSaveFileName(self, "Save File", 
                                                 os.path.join(self.download_path, download.suggestedFileName()))
@@ -1640,6 +2038,9 @@ class WebKitBrowser(QMainWindow):
 
             if browser_tab == self.tabs.currentWidget():
                 self.url_bar.setText(qurl.toString())
+                # The new site may have its own zoom
+                self.update_zoom_label()
+                self.update_bookmark_button()
 
         except Exception as e:
             print(f"Error updating tab title: {e}")
@@ -1660,17 +2061,21 @@ class WebKitBrowser(QMainWindow):
             print(f"Error updating tab title with text: {e}")
 
     def page_load_finished(self, success, browser_tab):
+        if success and not startup_timeline.has("first-load"):
+            startup_timeline.mark("first-load")
+            startup_timeline.save(self.storage)
+            startup_timeline.write_trace()
         try:
             if success and browser_tab == self.tabs.currentWidget():
                 url = browser_tab.webview.url().toString()
                 title = browser_tab.webview.title() or url
 
                 # Add to history (if not private mode)
-                current_tab_private = "🔒" in self.tabs.tabText(self.tabs.indexOf(browser_tab))
-                if not current_tab_private:
+                if not browser_tab.private_mode:
                     self.add_to_history(title, url)
 
                 self.status_label.setText("✅ Ready")
+                self.update_blocked_label()
             elif not success:
                 self.status_label.setText("❌ Failed to load page")
 
@@ -1679,23 +2084,11 @@ class WebKitBrowser(QMainWindow):
 
     def add_to_history(self, title, url):
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            history_entry = {
-                'timestamp': timestamp,
-                'title': title,
-                'url': url
-            }
-
-            # Avoid duplicates
-            if not any(entry['url'] == url for entry in self.history[-10:]):
-                self.history.append(history_entry)
-
-            # Keep only last 1000 entries
-            if len(self.history) > 1000:
-                self.history = self.history[-1000:]
-
-            self.save_history()
-
+            # Queued and written to history.db in batches off the GUI thread.
+            # The same time goes to both so a reload can tell them apart
+            visit_time = time.time()
+            self.history_store.add_visit(url, title, visit_time)
+            self.suggestion_index.add_visit(url, title, visit_time)
         except Exception as e:
             print(f"Error adding to history: {e}")
 
@@ -1703,9 +2096,56 @@ class WebKitBrowser(QMainWindow):
         current_widget = self.tabs.currentWidget()
         return current_widget.webview if current_widget and hasattr(current_widget, 'webview') else None
 
+    def update_suggestions(self, text):
+        self.completed_url = None
+        needle = text.strip().lower()
+        suggestions = []
+        if needle:
+            current = self.tabs.currentWidget()
+            for i in range(self.tabs.count()):
+                tab = self.tabs.widget(i)
+                if tab is current or not isinstance(tab, BrowserTab):
+                    continue
+                url = tab.current_url()
+                title = tab.current_title() or url
+                if needle in url.lower() or needle in title.lower():
+                    suggestions.append((f"🗂️ {title} — switch to tab", url, tab))
+                    if len(suggestions) == 3:
+                        break
+
+            open_urls = {url for _, url, _ in suggestions}
+            for suggestion in self.suggestion_index.suggest(text):
+                if suggestion.url not in open_urls:
+                    icon = "⭐" if suggestion.bookmarked else "🕘"
+                    label = suggestion.title or suggestion.url
+                    suggestions.append((f"{icon} {label} — {suggestion.url}", suggestion.url, None))
+
+        self.suggestion_model.set_suggestions(suggestions)
+        if suggestions:
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def open_suggestion(self, index):
+        url = index.data(Qt.EditRole)
+        tab = index.data(SuggestionModel.TabRole)
+        if tab is not None and self.tabs.indexOf(tab) >= 0:
+            self.tabs.setCurrentWidget(tab)
+        else:
+            self.url_bar.setText(url)
+            self.navigate_to_specific_url(url)
+
+        # The popup passes the Return key on to the address bar afterwards;
+        # don't load the page a second time from navigate_to_url
+        self.completed_url = self.url_bar.text()
+        QTimer.singleShot(0, self.reset_completed_url)
+
+    def reset_completed_url(self):
+        self.completed_url = None
+
     def navigate_to_url(self):
         url = self.url_bar.text().strip()
-        if not url:
+        if not url or url == self.completed_url:
             return
 
         # Enhanced URL processing
@@ -1737,11 +2177,17 @@ class WebKitBrowser(QMainWindow):
             qurl = browser.url()
             self.url_bar.setText(qurl.toString())
 
-            # Update zoom level display
-            current_tab = self.tabs.currentWidget()
-            if current_tab and hasattr(current_tab, 'zoom_factor'):
-                zoom_percent = int(current_tab.zoom_factor * 100)
-                self.zoom_level_label.setText(f"{zoom_percent}%")
+            self.update_zoom_label()
+            self.update_bookmark_button()
+            self.update_blocked_label()
+
+    def update_blocked_label(self):
+        current_tab = self.tabs.currentWidget()
+        if current_tab and hasattr(current_tab, 'request_counts'):
+            blocked, allowed = current_tab.request_counts()
+            self.blocked_label.setText(f"🛡️ {blocked} blocked")
+            self.blocked_label.setToolTip(
+                f"Requests in this tab: {blocked} blocked, {allowed} allowed")
 
     def go_back(self):
         browser = self.current_browser()
@@ -1784,22 +2230,103 @@ class WebKitBrowser(QMainWindow):
             bookmark_name, ok = QInputDialog.getText(self, '⭐ Add Bookmark',
                                                    'Bookmark name:', text=title)
             if ok and bookmark_name:
-                self.bookmarks[bookmark_name] = url
-                self.save_bookmarks()
-                QMessageBox.information(self, "Bookmark", "Bookmark added successfully! ⭐")
+                folder, ok = self.ask_bookmark_folder(self)
+                if ok:
+                    self.bookmarks.add(url, bookmark_name, folder)
+                    self.save_bookmarks()
+                    self.suggestion_index.add_bookmark(url, bookmark_name)
+                    self.update_bookmark_button()
+                    QMessageBox.information(self, "Bookmark", "Bookmark added successfully! ⭐")
+
+    def ask_bookmark_folder(self, parent, folder=""):
+        # Editable, so typing a new path creates the folder
+        folders = self.bookmarks.folders()
+        if folder not in folders:
+            folders.append(folder)
+        return QInputDialog.getItem(parent, '⭐ Bookmark Folder', 'Folder (use / for subfolders):',
+                                    folders, folders.index(folder), True)
+
+    def toggle_bookmark(self):
+        browser = self.current_browser()
+        if not browser:
+            return
+        url = browser.url().toString()
+        if not self.bookmarks.is_bookmarked(url):
+            self.add_bookmark()
+            return
+        reply = QMessageBox.question(self, '⭐ Bookmarked', 'Remove the bookmark for this page?',
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.bookmarks.remove_url(url)
+            self.suggestion_index.remove_bookmark(url)
+            self.save_bookmarks()
+            self.update_bookmark_button()
+
+    def update_bookmark_button(self):
+        # One dict lookup, so it can run on every URL change
+        browser = self.current_browser()
+        bookmarked = bool(browser) and self.bookmarks.is_bookmarked(browser.url().toString())
+        self.bookmark_btn.setText("⭐" if bookmarked else "☆")
+        self.bookmark_btn.setToolTip("Remove Bookmark" if bookmarked else "Add Bookmark (Ctrl+D)")
+
+    def import_bookmarks(self):
+        if self.bookmark_importer is not None:
+            QMessageBox.information(self, "Import Bookmarks", "An import is already running.")
+            return False
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Bookmarks", "",
+                                                   "Bookmark files (*.html *.htm)")
+        if not file_path:
+            return False
+        from dialogs import BookmarkImporter
+        self.bookmark_importer = BookmarkImporter(file_path, self)
+        self.bookmark_importer.batch_ready.connect(self.add_imported_bookmarks)
+        self.bookmark_importer.finished.connect(self.bookmark_import_finished)
+        self.bookmark_importer.start()
+        self.status_bar.showMessage("📥 Importing bookmarks...")
+        return True
+
+    def add_imported_bookmarks(self, batch):
+        for url, title, folder, tags, added in batch:
+            self.bookmarks.add(url, title, folder, tags, added)
+        self.status_bar.showMessage(f"📥 Importing bookmarks... {len(self.bookmarks)}")
+
+    def bookmark_import_finished(self, count, error):
+        self.bookmark_importer.deleteLater()
+        self.bookmark_importer = None
+        self.status_bar.clearMessage()
+        self.save_bookmarks()
+        self.update_bookmark_button()
+        # Rebuilt off the GUI thread rather than inserting entries one by one
+        self.reload_suggestions()
+        if error:
+            QMessageBox.warning(self, "Import Bookmarks",
+                                f"Imported {count} bookmarks before an error: {error}")
+        else:
+            QMessageBox.information(self, "Import Bookmarks", f"Imported {count} bookmarks ⭐")
 
     def show_bookmark_manager(self):
+        from dialogs import BookmarkManager
         bookmark_manager = BookmarkManager(self)
         bookmark_manager.exec_()
 
     def show_history(self):
+        from dialogs import HistoryManager
         history_manager = HistoryManager(self)
         history_manager.exec_()
 
     def show_download_manager(self):
         self.download_manager.show()
 
+    def start_rpc_server(self, path=None):
+        """Accept JSON-RPC commands from scripts on a Unix socket (--rpc)."""
+        from rpc_server import RpcServer
+        if self.rpc_server is None:
+            self.rpc_server = RpcServer(self, path)
+            self.rpc_server.listen()
+        return self.rpc_server
+
     def show_settings(self):
+        from dialogs import SettingsDialog
         settings_dialog = SettingsDialog(self)
         settings_dialog.exec_()
 
@@ -1810,57 +2337,66 @@ class WebKitBrowser(QMainWindow):
                                   "🛠️ Developer tools would be integrated here in a full implementation.")
 
     def save_bookmarks(self):
-        try:
-            with open('bookmarks.json', 'w') as f:
-                json.dump(self.bookmarks, f, indent=2)
-        except Exception as e:
-            print(f"Error saving bookmarks: {e}")
+        if not self.bookmarks_writable:
+            print(f"Not saving bookmarks: {BOOKMARKS_FILE} could not be read")
+            return
+        # to_json() builds new dicts, so later edits don't race the writer thread
+        self.storage.save(BOOKMARKS_FILE, self.bookmarks.to_json(), indent=2)
 
     def load_bookmarks(self):
+        # The old {title: url} format is converted on load
+        self.bookmarks_writable = True
         try:
-            if os.path.exists('bookmarks.json'):
-                with open('bookmarks.json', 'r') as f:
-                    self.bookmarks = json.load(f)
-        except Exception as e:
+            self.bookmarks = BookmarkStore.from_json(self.storage.load(BOOKMARKS_FILE))
+        except ValueError as e:
+            # Don't overwrite a file this version can't read, e.g. from a newer one
             print(f"Error loading bookmarks: {e}")
-
-    def save_history(self):
-        try:
-            with open('history.json', 'w') as f:
-                json.dump(self.history, f, indent=2)
-        except Exception as e:
-            print(f"Error saving history: {e}")
-
-    def load_history(self):
-        try:
-            if os.path.exists('history.json'):
-                with open('history.json', 'r') as f:
-                    self.history = json.load(f)
-        except Exception as e:
-            print(f"Error loading history: {e}")
+            self.bookmarks = BookmarkStore()
+            self.bookmarks_writable = False
 
     def save_settings(self):
         settings = {
             'homepage': self.homepage,
             'download_path': self.download_path,
+            'ad_blocking': self.filter_engine.enabled,
+            'tab_freeze_after': self.tab_lifecycle.freeze_after,
+            'tab_discard_after': self.tab_lifecycle.discard_after,
+            'max_live_tabs': self.tab_lifecycle.max_live_tabs,
+            'memory_budget_mb': self.memory_monitor.budget_mb,
+            'restore_session': self.restore_tabs,
+            'javascript_enabled': self.web_settings.javascript_enabled,
+            'images_enabled': self.web_settings.images_enabled,
+            'plugins_enabled': self.web_settings.plugins_enabled,
+            'default_zoom': self.web_settings.default_zoom,
+            'site_zoom': dict(self.web_settings.site_zoom),
+            'max_active_downloads': self.download_queue.max_active,
+            'max_downloads_per_host': self.download_queue.max_per_host,
             'window_geometry': self.saveGeometry().toBase64().data().decode('utf-8')
         }
 
-        try:
-            with open('settings.json', 'w') as f:
-                json.dump(settings, f, indent=2)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        self.storage.save('settings.json', settings, indent=2)
 
     def load_settings(self):
         try:
-            if os.path.exists('settings.json'):
-                with open('settings.json', 'r') as f:
-                    settings = json.load(f)
-
+            settings = self.storage.load('settings.json')
+            if settings:
                 self.homepage = settings.get('homepage', 'https://www.google.com')
                 self.download_path = settings.get('download_path',
                                                 os.path.expanduser("~/Downloads"))
+                self.filter_engine.enabled = settings.get('ad_blocking', True)
+                self.tab_lifecycle.freeze_after = settings.get('tab_freeze_after', 300)
+                self.tab_lifecycle.discard_after = settings.get('tab_discard_after', 1800)
+                self.tab_lifecycle.max_live_tabs = settings.get('max_live_tabs', 20)
+                self.memory_monitor.budget_mb = settings.get('memory_budget_mb', MEMORY_BUDGET_MB)
+                self.restore_tabs = settings.get('restore_session', True)
+                self.web_settings.javascript_enabled = settings.get('javascript_enabled', True)
+                self.web_settings.images_enabled = settings.get('images_enabled', True)
+                self.web_settings.plugins_enabled = settings.get('plugins_enabled', False)
+                self.web_settings.default_zoom = settings.get('default_zoom', DEFAULT_ZOOM)
+                self.web_settings.site_zoom = settings.get('site_zoom', {})
+                queue = self.download_queue
+                queue.max_active = settings.get('max_active_downloads', MAX_ACTIVE_DOWNLOADS)
+                queue.max_per_host = settings.get('max_downloads_per_host', MAX_DOWNLOADS_PER_HOST)
 
                 # Restore window geometry (but ensure it's on screen)
                 geometry_data = settings.get('window_geometry')
@@ -1871,18 +2407,44 @@ class WebKitBrowser(QMainWindow):
             print(f"Error loading settings: {e}")
 
     def closeEvent(self, event):
+        self.session_timer.stop()
+        self.save_session()
         self.save_settings()
         self.save_bookmarks()
-        self.save_history()
+        self.history_store.close()
+        if self._download_manager is not None:
+            self._download_manager.hasher.close()
+        if self.rpc_server is not None:
+            self.rpc_server.close()
+        # One final flush of everything still waiting to be written
+        self.storage.close()
+        # Closed before any page finished loading
+        startup_timeline.write_trace()
         event.accept()
 
 
 if __name__ == "__main__":
+    startup_timeline.add_phase("imports", 0, startup_timeline.mark("imports"))
+    startup_timeline.trace_path = args.profile_startup
+
     # FIXED: Enable proper high DPI scaling
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
-    app = QApplication(sys.argv)
+    with startup_timeline.phase("qapplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
+
+    # Later launches forward their URLs here instead of starting a browser.
+    # The name is claimed before the slow part of startup, so a launch in
+    # the meantime waits for this browser instead of starting another
+    instance_server = None
+    if not args.batch and not args.new_instance:
+        instance_server = InstanceServer(app)
+        if not instance_server.listen():
+            instance_server = None
+            # Another browser started since forward_urls() was tried above
+            if forward_urls(args.urls):
+                sys.exit(0)
     app.setApplicationName("Browser_2.0")
     app.setApplicationVersion("2.0")
 
@@ -1893,8 +2455,39 @@ if __name__ == "__main__":
     # Set application style for better appearance
     app.setStyle('Fusion')
 
+    # Brings up QtWebEngine and its default profile
+    with startup_timeline.phase("webengine-init"):
+        QWebEngineProfile.defaultProfile()
+
+    if args.batch:
+        from batch_render import FORMATS, run_batch
+        formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+        if not formats or set(formats) - set(FORMATS):
+            sys.exit(f"--formats takes png, html and pdf, not {args.formats}")
+        try:
+            viewport = tuple(int(size) for size in args.viewport.split("x"))
+        except ValueError:
+            viewport = ()
+        if len(viewport) != 2:
+            sys.exit(f"--viewport takes WIDTHxHEIGHT, not {args.viewport}")
+        sys.exit(run_batch(app, args.batch, args.out,
+                           lambda parent, profile: SecureWebEnginePage(parent, profile=profile),
+                           args.pool, formats, args.page_timeout, viewport))
+
     # Create and show browser
-    window = WebKitBrowser()
-    window.show()
+    with startup_timeline.phase("window"):
+        window = WebKitBrowser()
+        window.show()
+    startup_timeline.mark("window-shown")
+
+    if args.urls:
+        window.open_urls(args.urls)
+
+    if instance_server is not None:
+        # Connections that came in meanwhile are handled once the event loop runs
+        instance_server.urls_received.connect(window.open_urls)
+
+    if args.rpc is not None:
+        window.start_rpc_server(args.rpc or None)
 
     sys.exit(app.exec_())
@@ -0,0 +1,752 @@
+import base64
+import json
+import os
+import threading
+from datetime import datetime
+
+from PyQt5.QtWidgets import (
+    QWidget, QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, QScrollArea,
+    QLabel, QLineEdit, QPushButton, QCheckBox, QSpinBox, QSlider, QMessageBox,
+    QInputDialog, QTreeWidget, QTreeWidgetItem, QTableView, QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt, QObject, QTimer, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QFont
+
+from bookmark_store import read_netscape_bookmarks, split_tags
+from browser_settings import DEFAULT_ZOOM
+from download_queue import MAX_ACTIVE_DOWNLOADS, MAX_DOWNLOADS_PER_HOST
+
+# Enhanced Password Manager
+class PasswordManager(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("🔐 Password Manager")
+        self.setGeometry(300, 300, 700, 600)  # Larger dialog
+        self.passwords = {}
+        self.storage = parent.storage
+        self.load_passwords()
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        
+        # FIXED: Larger fonts throughout
+        # Header
+        header = QLabel("Saved Passwords")
+        header.setFont(QFont("Arial", 16, QFont.Bold))
+        header.setAlignment(Qt.AlignCenter)
+        layout.addWidget(header)
+
+        # Password list
+        self.password_tree = QTreeWidget()
+        self.password_tree.setHeaderLabels(["Website", "Username", "Password"])
+        self.password_tree.setColumnWidth(0, 250)
+        self.password_tree.setColumnWidth(1, 200)
+        self.password_tree.setFont(QFont("Arial", 11))
+        self.password_tree.setMinimumHeight(400)
+        self.load_password_list()
+        layout.addWidget(self.password_tree)
+
+        # Buttons with larger fonts
+        button_layout = QHBoxLayout()
+        
+        add_btn = QPushButton("➕ Add Password")
+        add_btn.setFont(QFont("Arial", 11))
+        add_btn.clicked.connect(self.add_password)
+        button_layout.addWidget(add_btn)
+
+        edit_btn = QPushButton("✏️ Edit")
+        edit_btn.setFont(QFont("Arial", 11))
+        edit_btn.clicked.connect(self.edit_password)
+        button_layout.addWidget(edit_btn)
+
+        delete_btn = QPushButton("🗑️ Delete")
+        delete_btn.setFont(QFont("Arial", 11))
+        delete_btn.clicked.connect(self.delete_password)
+        button_layout.addWidget(delete_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.setFont(QFont("Arial", 11))
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def load_password_list(self):
+        self.password_tree.clear()
+        for site, data in self.passwords.items():
+            item = QTreeWidgetItem([site, data['username'], '*' * len(data['password'])])
+            self.password_tree.addTopLevelItem(item)
+
+    def add_password(self):
+        site, ok1 = QInputDialog.getText(self, 'Add Password', 'Website:')
+        if ok1 and site:
+            username, ok2 = QInputDialog.getText(self, 'Add Password', 'Username:')
+            if ok2:
+                password, ok3 = QInputDialog.getText(self, 'Add Password', 'Password:', QLineEdit.Password)
+                if ok3:
+                    self.passwords[site] = {'username': username, 'password': password}
+                    self.save_passwords()
+                    self.load_password_list()
+
+    def edit_password(self):
+        current = self.password_tree.currentItem()
+        if current:
+            site = current.text(0)
+            if site in self.passwords:
+                data = self.passwords[site]
+                username, ok1 = QInputDialog.getText(self, 'Edit Password', 'Username:', text=data['username'])
+                if ok1:
+                    password, ok2 = QInputDialog.getText(self, 'Edit Password', 'Password:', QLineEdit.Password, text=data['password'])
+                    if ok2:
+                        self.passwords[site] = {'username': username, 'password': password}
+                        self.save_passwords()
+                        self.load_password_list()
+
+    def delete_password(self):
+        current = self.password_tree.currentItem()
+        if current:
+            site = current.text(0)
+            reply = QMessageBox.question(self, 'Delete Password',
+                                       f'Delete password for {site}?',
+                                       QMessageBox.Yes | QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                del self.passwords[site]
+                self.save_passwords()
+                self.load_password_list()
+
+    def save_passwords(self):
+        try:
+            encrypted_data = {}
+            for site, data in self.passwords.items():
+                encrypted_data[site] = {
+                    'username': base64.b64encode(data['username'].encode()).decode(),
+                    'password': base64.b64encode(data['password'].encode()).decode()
+                }
+            self.storage.save('passwords.json', encrypted_data)
+        except Exception as e:
+            print(f"Error saving passwords: {e}")
+
+    def load_passwords(self):
+        try:
+            encrypted_data = self.storage.load('passwords.json')
+            if encrypted_data:
+                for site, data in encrypted_data.items():
+                    self.passwords[site] = {
+                        'username': base64.b64decode(data['username']).decode(),
+                        'password': base64.b64decode(data['password']).decode()
+                    }
+        except Exception as e:
+            print(f"Error loading passwords: {e}")
+
+# Lazily populated table model used by the history and bookmark dialogs
+class PagedTableModel(QAbstractTableModel):
+    UrlRole = Qt.UserRole + 1
+    IdRole = Qt.UserRole + 2
+
+    def __init__(self, headers, fetch_page, page_size=200, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.page_size = page_size
+        self.fetch_page = fetch_page
+        self.rows = []
+        self.cursor = None
+        self.exhausted = False
+
+    def reset(self, fetch_page=None):
+        self.beginResetModel()
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+        self.rows = []
+        self.cursor = None
+        self.exhausted = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row_id, url, cells = self.rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return cells[index.column()]
+        if role == self.UrlRole:
+            return url
+        if role == self.IdRole:
+            return row_id
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        # fetch_page(cursor, limit) returns ([(id, url, cells), ...], next_cursor)
+        if parent.isValid() or self.exhausted:
+            return
+        rows, self.cursor = self.fetch_page(self.cursor, self.page_size)
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        if rows:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+def create_paged_table_view(model):
+    view = QTableView()
+    view.setModel(model)
+    view.setFont(QFont("Arial", 11))
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.setSelectionMode(QAbstractItemView.SingleSelection)
+    view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    view.setWordWrap(False)
+    view.setShowGrid(False)
+    view.verticalHeader().hide()
+    # Fixed row heights and column widths keep layout independent of row count
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setDefaultSectionSize(28)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+    view.horizontalHeader().setStretchLastSection(True)
+    return view
+
+# Netscape bookmark HTML import
+class BookmarkImporter(QObject):
+    """Reads and parses a bookmark file on a worker thread.
+
+    Parsed bookmarks come back to the GUI thread in batches through
+    batch_ready, so even a file with tens of thousands of entries never
+    blocks the UI for more than one small batch.
+    """
+    batch_ready = pyqtSignal(object)
+    finished = pyqtSignal(int, str)  # bookmarks read, error message
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+
+    def start(self):
+        threading.Thread(target=self.read, daemon=True).start()
+
+    def read(self):
+        count = 0
+        try:
+            for batch in read_netscape_bookmarks(self.path):
+                count += len(batch)
+                self.batch_ready.emit(batch)
+        except Exception as e:
+            print(f"Error importing bookmarks: {e}")
+            self.finished.emit(count, str(e))
+            return
+        self.finished.emit(count, "")
+
+class BookmarkManager(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("🔖 Bookmark Manager")
+        self.setGeometry(300, 300, 700, 600)  # Larger dialog
+        self.parent_browser = parent
+        self.init_ui()
+        self.load_bookmarks()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Header with larger font
+        header = QLabel("Bookmarks")
+        header.setFont(QFont("Arial", 16, QFont.Bold))
+        header.setAlignment(Qt.AlignCenter)
+        layout.addWidget(header)
+
+        self.bookmark_model = PagedTableModel(["Title", "URL", "Folder", "Tags"],
+                                              self.fetch_bookmarks, parent=self)
+        self.bookmark_view = create_paged_table_view(self.bookmark_model)
+        self.bookmark_view.setColumnWidth(0, 260)
+        self.bookmark_view.setColumnWidth(1, 220)
+        self.bookmark_view.setColumnWidth(2, 120)
+        self.bookmark_view.doubleClicked.connect(self.open_bookmark)
+
+        button_layout = QHBoxLayout()
+        
+        open_btn = QPushButton("🌐 Open")
+        open_btn.setFont(QFont("Arial", 11))
+        open_btn.clicked.connect(self.open_selected_bookmark)
+
+        edit_btn = QPushButton("✏️ Edit")
+        edit_btn.setFont(QFont("Arial", 11))
+        edit_btn.clicked.connect(self.edit_bookmark)
+        
+        delete_btn = QPushButton("🗑️ Delete")
+        delete_btn.setFont(QFont("Arial", 11))
+        delete_btn.clicked.connect(self.delete_bookmark)
+
+        import_btn = QPushButton("📥 Import...")
+        import_btn.setFont(QFont("Arial", 11))
+        import_btn.clicked.connect(self.import_bookmarks)
+        
+        close_btn = QPushButton("Close")
+        close_btn.setFont(QFont("Arial", 11))
+        close_btn.clicked.connect(self.close)
+
+        button_layout.addWidget(open_btn)
+        button_layout.addWidget(edit_btn)
+        button_layout.addWidget(delete_btn)
+        button_layout.addWidget(import_btn)
+        button_layout.addWidget(close_btn)
+
+        layout.addWidget(self.bookmark_view)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def fetch_bookmarks(self, cursor, limit):
+        # The cursor is the last id shown; the store's sorted id index finds
+        # the next page from it, so bookmarks added meanwhile (an import)
+        # don't break paging and no fetch copies the whole list
+        bookmarks = self.parent_browser.bookmarks.page(cursor or 0, limit)
+        rows = [(bookmark.id, bookmark.url,
+                 [f"🔖 {bookmark.title}", bookmark.url, bookmark.folder, ", ".join(bookmark.tags)])
+                for bookmark in bookmarks]
+        return rows, bookmarks[-1].id if bookmarks else cursor
+
+    def load_bookmarks(self):
+        self.bookmark_model.reset()
+
+    def open_bookmark(self, index):
+        url = index.data(PagedTableModel.UrlRole)
+        if url and self.parent_browser:
+            self.parent_browser.navigate_to_specific_url(url)
+        self.close()
+
+    def open_selected_bookmark(self):
+        index = self.bookmark_view.currentIndex()
+        if index.isValid():
+            self.open_bookmark(index)
+
+    def edit_bookmark(self):
+        index = self.bookmark_view.currentIndex()
+        if not index.isValid():
+            return
+        store = self.parent_browser.bookmarks
+        bookmark = store.get(index.data(PagedTableModel.IdRole))
+        if bookmark is None:
+            return
+        title, ok1 = QInputDialog.getText(self, 'Edit Bookmark', 'Name:', text=bookmark.title)
+        if ok1 and title:
+            folder, ok2 = self.parent_browser.ask_bookmark_folder(self, bookmark.folder)
+            if ok2:
+                tags, ok3 = QInputDialog.getText(self, 'Edit Bookmark', 'Tags (comma separated):',
+                                                 text=", ".join(bookmark.tags))
+                if ok3:
+                    store.update(bookmark.id, title=title, folder=folder, tags=split_tags(tags))
+                    self.parent_browser.save_bookmarks()
+                    self.load_bookmarks()
+
+    def delete_bookmark(self):
+        index = self.bookmark_view.currentIndex()
+        if index.isValid():
+            store = self.parent_browser.bookmarks
+            bookmark = store.remove(index.data(PagedTableModel.IdRole))
+            if bookmark is not None:
+                if not store.is_bookmarked(bookmark.url):
+                    self.parent_browser.suggestion_index.remove_bookmark(bookmark.url)
+                self.parent_browser.save_bookmarks()
+                self.parent_browser.update_bookmark_button()
+                self.load_bookmarks()
+
+    def import_bookmarks(self):
+        if self.parent_browser.import_bookmarks():
+            self.close()
+
+class HistoryManager(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("📜 History")
+        self.setGeometry(300, 300, 800, 700)  # Larger dialog
+        self.parent_browser = parent
+        self.init_ui()
+        self.load_history()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Header with larger font
+        header = QLabel("Browsing History")
+        header.setFont(QFont("Arial", 16, QFont.Bold))
+        header.setAlignment(Qt.AlignCenter)
+        layout.addWidget(header)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("🔍 Search history...")
+        self.search_edit.setFont(QFont("Arial", 12))
+        self.search_edit.textChanged.connect(self.schedule_search)
+        layout.addWidget(self.search_edit)
+
+        # Restarted on every keystroke so only the latest text is queried
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(50)
+        self.search_timer.timeout.connect(self.load_history)
+
+        self.history_model = PagedTableModel(["Visited", "Title", "URL"], self.fetch_visits,
+                                             parent=self)
+        self.history_view = create_paged_table_view(self.history_model)
+        self.history_view.setColumnWidth(0, 170)
+        self.history_view.setColumnWidth(1, 280)
+        self.history_view.doubleClicked.connect(self.open_history_item)
+
+        button_layout = QHBoxLayout()
+        
+        open_btn = QPushButton("🌐 Open")
+        open_btn.setFont(QFont("Arial", 11))
+        open_btn.clicked.connect(self.open_selected_item)
+        
+        clear_btn = QPushButton("🗑️ Clear History")
+        clear_btn.setFont(QFont("Arial", 11))
+        clear_btn.clicked.connect(self.clear_history)
+        
+        close_btn = QPushButton("Close")
+        close_btn.setFont(QFont("Arial", 11))
+        close_btn.clicked.connect(self.close)
+
+        button_layout.addWidget(open_btn)
+        button_layout.addWidget(clear_btn)
+        button_layout.addWidget(close_btn)
+
+        layout.addWidget(self.history_view)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def load_history(self):
+        query = self.search_edit.text().strip()
+        if query:
+            self.history_model.reset(lambda cursor, limit: self.fetch_search(query, cursor, limit))
+        else:
+            self.history_model.reset(self.fetch_visits)
+
+    @staticmethod
+    def format_time(timestamp):
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+    def fetch_visits(self, cursor, limit):
+        # Keyset paging on (visit_time, id) keeps deep pages as cheap as the first
+        visits = self.parent_browser.history_store.recent_visits(limit, cursor)
+        rows = [(visit_id, url, [f"🕒 {self.format_time(visit_time)}", title, url])
+                for visit_id, visit_time, title, url in visits]
+        if visits:
+            cursor = (visits[-1][1], visits[-1][0])
+        return rows, cursor
+
+    def fetch_search(self, query, cursor, limit):
+        offset = cursor or 0
+        results = self.parent_browser.history_store.search(query, limit, offset)
+        rows = [(url_id, url, [f"🕒 {self.format_time(last_visit)}", title, url])
+                for url_id, title, url, last_visit, _ in results]
+        return rows, offset + len(results)
+
+    def open_history_item(self, index):
+        url = index.data(PagedTableModel.UrlRole)
+        if url and self.parent_browser:
+            self.parent_browser.navigate_to_specific_url(url)
+        self.close()
+
+    def open_selected_item(self):
+        index = self.history_view.currentIndex()
+        if index.isValid():
+            self.open_history_item(index)
+
+    def clear_history(self):
+        reply = QMessageBox.question(self, 'Clear History',
+                                   'Are you sure you want to clear all history?',
+                                   QMessageBox.Yes | QMessageBox.No,
+                                   QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.parent_browser.history_store.clear()
+            self.parent_browser.history_store.flush()
+            self.parent_browser.suggestion_index.clear()
+            for bookmark in self.parent_browser.bookmarks:
+                self.parent_browser.suggestion_index.add_bookmark(bookmark.url, bookmark.title)
+            self.load_history()
+
+class SettingsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("⚙️ Settings")
+        self.setGeometry(300, 300, 600, 700)  # Larger dialog
+        self.parent_browser = parent
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Header with larger font
+        header = QLabel("Browser Settings")
+        header.setFont(QFont("Arial", 18, QFont.Bold))
+        header.setAlignment(Qt.AlignCenter)
+        layout.addWidget(header)
+
+        # Scroll area for settings
+        scroll = QScrollArea()
+        scroll_widget = QWidget()
+        scroll_layout = QVBoxLayout(scroll_widget)
+
+        # General Settings
+        general_group = QGroupBox("🌐 General")
+        general_group.setFont(QFont("Arial", 12, QFont.Bold))
+        general_layout = QFormLayout()
+
+        self.homepage_edit = QLineEdit(self.parent_browser.homepage)
+        self.homepage_edit.setFont(QFont("Arial", 11))
+        general_layout.addRow("Homepage:", self.homepage_edit)
+
+        self.download_path_edit = QLineEdit(self.parent_browser.download_path)
+        self.download_path_edit.setFont(QFont("Arial", 11))
+        general_layout.addRow("Download Path:", self.download_path_edit)
+
+        download_queue = self.parent_browser.download_queue
+        self.max_active_downloads = QSpinBox()
+        self.max_active_downloads.setRange(1, 20)
+        self.max_active_downloads.setValue(download_queue.max_active)
+        self.max_active_downloads.setFont(QFont("Arial", 11))
+        general_layout.addRow("Simultaneous Downloads:", self.max_active_downloads)
+
+        self.max_downloads_per_host = QSpinBox()
+        self.max_downloads_per_host.setRange(1, 20)
+        self.max_downloads_per_host.setValue(download_queue.max_per_host)
+        self.max_downloads_per_host.setFont(QFont("Arial", 11))
+        general_layout.addRow("Downloads per Site:", self.max_downloads_per_host)
+
+        # Zoom level
+        self.zoom_slider = QSlider(Qt.Horizontal)
+        self.zoom_slider.setMinimum(50)
+        self.zoom_slider.setMaximum(300)
+        web_settings = self.parent_browser.web_settings
+        default_zoom = round(web_settings.default_zoom * 100)
+        self.zoom_slider.setValue(default_zoom)
+        self.zoom_label = QLabel(f"{default_zoom}%")
+        self.zoom_label.setFont(QFont("Arial", 11))
+        self.zoom_slider.valueChanged.connect(lambda v: self.zoom_label.setText(f"{v}%"))
+
+        zoom_layout = QHBoxLayout()
+        zoom_layout.addWidget(self.zoom_slider)
+        zoom_layout.addWidget(self.zoom_label)
+        general_layout.addRow("Default Zoom:", zoom_layout)
+
+        general_group.setLayout(general_layout)
+
+        # Privacy Settings
+        privacy_group = QGroupBox("🔒 Privacy & Security")
+        privacy_group.setFont(QFont("Arial", 12, QFont.Bold))
+        privacy_layout = QFormLayout()
+
+        self.private_browsing = QCheckBox("Enable Private Browsing by Default")
+        self.private_browsing.setFont(QFont("Arial", 11))
+        
+        self.javascript_enabled = QCheckBox("Enable JavaScript")
+        self.javascript_enabled.setFont(QFont("Arial", 11))
+        self.javascript_enabled.setChecked(web_settings.javascript_enabled)
+
+        self.images_enabled = QCheckBox("Load Images")
+        self.images_enabled.setFont(QFont("Arial", 11))
+        self.images_enabled.setChecked(web_settings.images_enabled)
+
+        self.plugins_enabled = QCheckBox("Enable Plugins")
+        self.plugins_enabled.setFont(QFont("Arial", 11))
+        self.plugins_enabled.setChecked(web_settings.plugins_enabled)
+
+        self.ad_blocking = QCheckBox("Enable Ad Blocking")
+        self.ad_blocking.setFont(QFont("Arial", 11))
+        self.ad_blocking.setChecked(self.parent_browser.filter_engine.enabled)
+
+        privacy_layout.addRow(self.private_browsing)
+        privacy_layout.addRow(self.javascript_enabled)
+        privacy_layout.addRow(self.images_enabled)
+        privacy_layout.addRow(self.plugins_enabled)
+        privacy_layout.addRow(self.ad_blocking)
+
+        privacy_group.setLayout(privacy_layout)
+
+        # Advanced Settings
+        advanced_group = QGroupBox("🔧 Advanced")
+        advanced_group.setFont(QFont("Arial", 12, QFont.Bold))
+        advanced_layout = QFormLayout()
+
+        self.auto_save_session = QCheckBox("Auto-save Session")
+        self.auto_save_session.setFont(QFont("Arial", 11))
+        self.auto_save_session.setChecked(self.parent_browser.restore_tabs)
+
+        self.developer_tools = QCheckBox("Enable Developer Tools")
+        self.developer_tools.setFont(QFont("Arial", 11))
+
+        self.smooth_scrolling = QCheckBox("Smooth Scrolling")
+        self.smooth_scrolling.setFont(QFont("Arial", 11))
+        self.smooth_scrolling.setChecked(True)
+
+        # Background tab policy
+        tab_lifecycle = self.parent_browser.tab_lifecycle
+        self.freeze_after = QSpinBox()
+        self.freeze_after.setRange(1, 1440)
+        self.freeze_after.setSuffix(" min")
+        self.freeze_after.setValue(tab_lifecycle.freeze_after // 60)
+        self.freeze_after.setFont(QFont("Arial", 11))
+
+        self.discard_after = QSpinBox()
+        self.discard_after.setRange(1, 1440)
+        self.discard_after.setSuffix(" min")
+        self.discard_after.setValue(tab_lifecycle.discard_after // 60)
+        self.discard_after.setFont(QFont("Arial", 11))
+
+        self.max_live_tabs = QSpinBox()
+        self.max_live_tabs.setRange(1, 500)
+        self.max_live_tabs.setValue(tab_lifecycle.max_live_tabs)
+        self.max_live_tabs.setFont(QFont("Arial", 11))
+
+        advanced_layout.addRow(self.auto_save_session)
+        advanced_layout.addRow(self.developer_tools)
+        advanced_layout.addRow(self.smooth_scrolling)
+        advanced_layout.addRow("Freeze idle tabs after:", self.freeze_after)
+        advanced_layout.addRow("Discard idle tabs after:", self.discard_after)
+        advanced_layout.addRow("Max live tabs:", self.max_live_tabs)
+
+        self.memory_budget = QSpinBox()
+        self.memory_budget.setRange(256, 65536)
+        self.memory_budget.setSingleStep(256)
+        self.memory_budget.setSuffix(" MB")
+        self.memory_budget.setValue(self.parent_browser.memory_monitor.budget_mb)
+        self.memory_budget.setFont(QFont("Arial", 11))
+        advanced_layout.addRow("Tab memory budget:", self.memory_budget)
+
+        advanced_group.setLayout(advanced_layout)
+
+        scroll_layout.addWidget(general_group)
+        scroll_layout.addWidget(privacy_group)
+        scroll_layout.addWidget(advanced_group)
+
+        scroll.setWidget(scroll_widget)
+        scroll.setWidgetResizable(True)
+        layout.addWidget(scroll)
+
+        # Buttons with larger fonts
+        button_layout = QHBoxLayout()
+        
+        save_btn = QPushButton("💾 Save")
+        save_btn.setFont(QFont("Arial", 11))
+        save_btn.clicked.connect(self.save_settings)
+        
+        reset_btn = QPushButton("🔄 Reset to Defaults")
+        reset_btn.setFont(QFont("Arial", 11))
+        reset_btn.clicked.connect(self.reset_settings)
+        
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setFont(QFont("Arial", 11))
+        cancel_btn.clicked.connect(self.close)
+
+        button_layout.addWidget(save_btn)
+        button_layout.addWidget(reset_btn)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def save_settings(self):
+        self.parent_browser.homepage = self.homepage_edit.text()
+        self.parent_browser.download_path = self.download_path_edit.text()
+        self.parent_browser.filter_engine.enabled = self.ad_blocking.isChecked()
+        self.parent_browser.restore_tabs = self.auto_save_session.isChecked()
+
+        download_queue = self.parent_browser.download_queue
+        download_queue.max_active = self.max_active_downloads.value()
+        download_queue.max_per_host = self.max_downloads_per_host.value()
+        self.parent_browser.schedule_downloads()
+
+        tab_lifecycle = self.parent_browser.tab_lifecycle
+        tab_lifecycle.freeze_after = self.freeze_after.value() * 60
+        tab_lifecycle.discard_after = self.discard_after.value() * 60
+        tab_lifecycle.max_live_tabs = self.max_live_tabs.value()
+        tab_lifecycle.enforce_live_limit()
+        self.parent_browser.memory_monitor.budget_mb = self.memory_budget.value()
+
+        # Content settings go on the profiles; background tabs take the new
+        # default zoom when they are next selected
+        web_settings = self.parent_browser.web_settings
+        web_settings.javascript_enabled = self.javascript_enabled.isChecked()
+        web_settings.images_enabled = self.images_enabled.isChecked()
+        web_settings.plugins_enabled = self.plugins_enabled.isChecked()
+        web_settings.default_zoom = self.zoom_slider.value() / 100.0
+        self.parent_browser.apply_web_settings()
+
+        self.parent_browser.save_settings()
+        QMessageBox.information(self, "Settings", "Settings saved successfully!")
+        self.close()
+
+    def reset_settings(self):
+        reply = QMessageBox.question(self, 'Reset Settings',
+                                   'Reset all settings to defaults?',
+                                   QMessageBox.Yes | QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.homepage_edit.setText("https://www.google.com")
+            self.download_path_edit.setText(os.path.expanduser("~/Downloads"))
+            self.zoom_slider.setValue(round(DEFAULT_ZOOM * 100))
+            self.javascript_enabled.setChecked(True)
+            self.images_enabled.setChecked(True)
+            self.plugins_enabled.setChecked(False)
+            self.ad_blocking.setChecked(True)
+            self.freeze_after.setValue(5)
+            self.discard_after.setValue(30)
+            self.max_live_tabs.setValue(20)
+            self.memory_budget.setValue(2048)
+            self.max_active_downloads.setValue(MAX_ACTIVE_DOWNLOADS)
+            self.max_downloads_per_host.setValue(MAX_DOWNLOADS_PER_HOST)
+
+class ExtensionManager:
+    def __init__(self, browser):
+        self.browser = browser
+        self.extensions = {}
+        self.extension_dir = "extensions"
+        self.load_extensions()
+
+    def load_extensions(self):
+        if not os.path.exists(self.extension_dir):
+            os.makedirs(self.extension_dir)
+
+        for filename in os.listdir(self.extension_dir):
+            if filename.endswith('.json'):
+                self.load_extension(filename)
+
+    def load_extension(self, filename):
+        try:
+            with open(os.path.join(self.extension_dir, filename), 'r') as f:
+                extension_data = json.load(f)
+            self.extensions[extension_data['id']] = extension_data
+            print(f"Loaded extension: {extension_data['name']}")
+        except Exception as e:
+            print(f"Error loading extension {filename}: {e}")
+
+    def install_extension(self, extension_path):
+        try:
+            with open(extension_path, 'r') as f:
+                extension_data = json.load(f)
+
+            filename = f"{extension_data['id']}.json"
+            target_path = os.path.join(self.extension_dir, filename)
+
+            with open(target_path, 'w') as f:
+                json.dump(extension_data, f, indent=2)
+
+            self.extensions[extension_data['id']] = extension_data
+            QMessageBox.information(self.browser, "Extension Installed",
+                                  f"Extension '{extension_data['name']}' installed successfully!")
+        except Exception as e:
+            QMessageBox.critical(self.browser, "Error", f"Failed to install extension: {e}")
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+
+from storage import write_json_atomic
+
+DOWNLOAD_INDEX = "download_index.json"
+HASH_CHUNK_SIZE = 1 << 20
+CLOSE_TIMEOUT = 10.0  # seconds to let a running job finish at shutdown
+
+
+def hash_file(path, chunk_size=HASH_CHUNK_SIZE):
+    """SHA-256 of a file read in chunks, as (hex digest, size in bytes)."""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    size = 0
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+            size += count
+    return digest.hexdigest(), size
+
+
+def same_content(path, other_path, chunk_size=HASH_CHUNK_SIZE):
+    """Whether two files hold the same bytes, read side by side in chunks.
+
+    Not filecmp.cmp(): its cache trusts size and mtime, which is exactly
+    what can't be trusted here.
+    """
+    with open(path, 'rb') as f, open(other_path, 'rb') as other:
+        while True:
+            chunk = f.read(chunk_size)
+            if chunk != other.read(chunk_size):
+                return False
+            if not chunk:
+                return True
+
+
+class DownloadIndex:
+    """Content index of finished downloads: path -> SHA-256, size and URL.
+
+    Lets a new download that matches a file already on disk be replaced by
+    a hard link to it. Not thread-safe; DownloadHasher only touches it from
+    its worker thread.
+    """
+
+    def __init__(self, path=DOWNLOAD_INDEX):
+        self.path = path
+        self.files = {}
+        self.by_digest = {}
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    self.files = json.load(f)
+        except Exception as e:
+            print(f"Error loading download index: {e}")
+            self.files = {}
+        self.by_digest = {}
+        for file_path, entry in self.files.items():
+            self.by_digest.setdefault(entry['sha256'], []).append(file_path)
+
+    def save(self):
+        # Already on the hasher's worker thread
+        try:
+            write_json_atomic(self.path, self.files, indent=2)
+        except Exception as e:
+            print(f"Error saving download index: {e}")
+
+    def record(self, file_path, digest, size, url=""):
+        old = self.files.get(file_path)
+        if old is not None and file_path in self.by_digest.get(old['sha256'], ()):
+            self.by_digest[old['sha256']].remove(file_path)
+        # A file with another inode, size or mtime has changed since it was
+        # hashed; matching ones are still compared before linking
+        stat = os.stat(file_path)
+        self.files[file_path] = {'sha256': digest, 'size': size, 'url': url,
+                                 'time': time.time(), 'mtime_ns': stat.st_mtime_ns,
+                                 'inode': stat.st_ino}
+        self.by_digest.setdefault(digest, []).append(file_path)
+
+    def find_duplicate(self, file_path, digest, size):
+        """Another indexed file that still holds the same bytes as file_path.
+
+        Candidates come from the recorded hash; each is then compared with
+        file_path byte for byte, since a file rewritten in place can keep
+        its size, inode and even its mtime.
+        """
+        for other in self.by_digest.get(digest, ()):
+            if other == file_path:
+                continue
+            try:
+                if self.may_be_unchanged(other, size) and same_content(file_path, other):
+                    return other
+            except OSError:
+                continue
+        return None
+
+    def may_be_unchanged(self, other, size):
+        """Cheap check that rules out files changed since they were hashed."""
+        entry = self.files[other]
+        stat = os.stat(other)
+        if stat.st_size != size:
+            return False
+        if 'mtime_ns' in entry:
+            return stat.st_mtime_ns == entry['mtime_ns'] and stat.st_ino == entry['inode']
+        return True  # Recorded by an older version without stat details
+
+
+def link_duplicate(file_path, existing):
+    """Replace file_path with a hard link to existing. Returns True if linked."""
+    try:
+        new_stat, old_stat = os.stat(file_path), os.stat(existing)
+        if new_stat.st_dev != old_stat.st_dev:
+            return False  # hard links can't cross file systems
+        if new_stat.st_ino == old_stat.st_ino:
+            return True
+        temp_path = file_path + ".link"
+        os.link(existing, temp_path)
+        try:
+            os.replace(temp_path, file_path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+        return True
+    except OSError as e:
+        print(f"Error linking duplicate download: {e}")
+        return False
+
+
+class HashResult:
+    __slots__ = ("path", "sha256", "size", "seconds", "duplicate_of", "linked",
+                 "expected", "error")
+
+    def __init__(self, path):
+        self.path = path
+        self.sha256 = ""
+        self.size = 0
+        self.seconds = 0.0
+        self.duplicate_of = None
+        self.linked = False
+        self.expected = None
+        self.error = None
+
+    @property
+    def verified(self):
+        """True/False against the expected checksum, None if none was given."""
+        if not self.expected or not self.sha256:
+            return None
+        return self.sha256 == self.expected.strip().lower()
+
+    @property
+    def throughput(self):
+        """Hashing speed in MB/s."""
+        return self.size / self.seconds / 1e6 if self.seconds > 0 else 0.0
+
+
+class DownloadHasher:
+    """Hashes finished downloads on one worker thread.
+
+    Each file is hashed in chunks, recorded in the DownloadIndex and, when
+    dedup is on and the content is already on disk, replaced by a hard
+    link. on_result(HashResult) is called from the worker thread.
+    """
+
+    def __init__(self, on_result, index_path=DOWNLOAD_INDEX, dedup=True):
+        self.on_result = on_result
+        self.index_path = index_path
+        self.dedup = dedup
+        self.jobs = queue.Queue()
+        self.index = None
+        self.worker = threading.Thread(target=self.run, name="download-hasher", daemon=True)
+        self.worker.start()
+
+    def submit(self, path, url="", expected=None):
+        self.jobs.put((path, url, expected))
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """Stop after the queued jobs, waiting up to timeout for them."""
+        self.jobs.put(None)
+        self.worker.join(timeout)
+        if self.worker.is_alive():
+            print("Warning: download hashing still running at shutdown")
+
+    def run(self):
+        self.index = DownloadIndex(self.index_path)
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            result = self.process(*job)
+            try:
+                self.on_result(result)
+            except Exception as e:
+                print(f"Error reporting download hash: {e}")
+
+    def process(self, path, url, expected):
+        result = HashResult(path)
+        result.expected = expected
+        try:
+            start = time.perf_counter()
+            result.sha256, result.size = hash_file(path)
+            result.seconds = time.perf_counter() - start
+
+            result.duplicate_of = self.index.find_duplicate(path, result.sha256, result.size)
+            if result.duplicate_of and self.dedup:
+                result.linked = link_duplicate(path, result.duplicate_of)
+            self.index.record(path, result.sha256, result.size, url)
+            self.index.save()
+        except Exception as e:
+            result.error = str(e)
+        return result
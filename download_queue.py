@@ -0,0 +1,161 @@
+import heapq
+import itertools
+import os
+import posixpath
+from urllib.parse import unquote, urlsplit
+from collections import Counter, deque
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITY_NAMES = {PRIORITY_HIGH: "High", PRIORITY_NORMAL: "Normal", PRIORITY_LOW: "Low"}
+
+MAX_ACTIVE_DOWNLOADS = 3
+MAX_DOWNLOADS_PER_HOST = 2
+
+# Bulk link saves are handed to QtWebEngine a few at a time; the rest wait
+MAX_PENDING_LINK_SAVES = 8
+
+PROGRESS_INTERVAL = 250  # ms between progress samples (4 Hz)
+RATE_WINDOW = 3.0  # seconds of samples behind speed and ETA
+
+
+class DownloadQueue:
+    """Decides which downloads may transfer at the same time.
+
+    Waiting jobs sit in a heap ordered by (priority, arrival). schedule()
+    starts jobs while fewer than max_active are running, skipping any whose
+    host already has max_per_host transfers. Paused jobs are held out until
+    resumed and keep their place in line. Jobs are any hashable objects.
+    """
+
+    def __init__(self, max_active=MAX_ACTIVE_DOWNLOADS, max_per_host=MAX_DOWNLOADS_PER_HOST):
+        self.max_active = max_active
+        self.max_per_host = max_per_host
+        self.waiting = []  # (priority, seq, job), may hold stale entries
+        self.active = set()
+        self.paused = set()
+        self.host_active = Counter()
+        self.jobs = {}  # job -> [host, priority, seq]
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def unpaused(self):
+        """Jobs running or waiting to run, leaving out paused ones."""
+        return len(self.jobs) - len(self.paused)
+
+    def add(self, job, host, priority=PRIORITY_NORMAL):
+        seq = next(self._seq)
+        self.jobs[job] = [host, priority, seq]
+        heapq.heappush(self.waiting, (priority, seq, job))
+
+    def is_waiting(self, job):
+        return job in self.jobs and job not in self.active and job not in self.paused
+
+    def _is_current(self, entry):
+        priority, seq, job = entry
+        info = self.jobs.get(job)
+        return (info is not None and info[1] == priority and info[2] == seq
+                and job not in self.active and job not in self.paused)
+
+    def set_priority(self, job, priority):
+        info = self.jobs.get(job)
+        if info is None or info[1] == priority:
+            return
+        info[1] = priority
+        if self.is_waiting(job):
+            # The old heap entry goes stale and is skipped
+            heapq.heappush(self.waiting, (priority, info[2], job))
+
+    def _stop(self, job):
+        if job in self.active:
+            self.active.discard(job)
+            self.host_active[self.jobs[job][0]] -= 1
+
+    def pause(self, job):
+        if job in self.jobs:
+            self._stop(job)
+            self.paused.add(job)
+
+    def resume(self, job):
+        if job in self.paused:
+            self.paused.discard(job)
+            host, priority, seq = self.jobs[job]
+            heapq.heappush(self.waiting, (priority, seq, job))
+
+    def remove(self, job):
+        """Forget a finished or cancelled job, freeing its slot."""
+        if job in self.jobs:
+            self._stop(job)
+            self.paused.discard(job)
+            del self.jobs[job]
+
+    def schedule(self):
+        """Mark as active and return the jobs that may start now."""
+        started = []
+        blocked = []
+        while self.waiting and len(self.active) < self.max_active:
+            entry = heapq.heappop(self.waiting)
+            if not self._is_current(entry):
+                continue
+            job = entry[2]
+            host = self.jobs[job][0]
+            if self.host_active[host] >= self.max_per_host:
+                blocked.append(entry)
+                continue
+            self.active.add(job)
+            self.host_active[host] += 1
+            started.append(job)
+        for entry in blocked:
+            heapq.heappush(self.waiting, entry)
+        return started
+
+
+def link_filename(url, directory, taken):
+    """A path in directory for saving url that no other save is using."""
+    name = posixpath.basename(unquote(urlsplit(url).path).rstrip('/'))
+    name = "".join(c for c in name if c not in '\\/:*?"<>|') or "index.html"
+    stem, ext = os.path.splitext(name)
+    candidate = os.path.join(directory, name)
+    counter = 1
+    while candidate in taken or os.path.exists(candidate):
+        candidate = os.path.join(directory, f"{stem} ({counter}){ext}")
+        counter += 1
+    taken.add(candidate)
+    return candidate
+
+
+class TransferRate:
+    """Throughput of one transfer over a sliding window of samples.
+
+    Samples are (time, bytes received). The rate is taken between the
+    newest sample and the oldest one still inside the window, which
+    smooths out the bursty progress reports of fast transfers.
+    """
+
+    def __init__(self, window=RATE_WINDOW):
+        self.window = window
+        self.samples = deque()
+
+    def add(self, now, received):
+        self.samples.append((now, received))
+        # Keep one sample at or before the window start so the rate spans it
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+
+    def rate(self):
+        """Bytes per second, 0 until two samples exist."""
+        if len(self.samples) < 2:
+            return 0.0
+        (start, first), (end, last) = self.samples[0], self.samples[-1]
+        return max(last - first, 0) / (end - start) if end > start else 0.0
+
+    def eta(self, remaining):
+        """Seconds left for remaining bytes, or None when stalled."""
+        rate = self.rate()
+        return remaining / rate if rate > 0 else None
+
+    def reset(self):
+        self.samples.clear()
@@ -0,0 +1,319 @@
+import os
+import time
+
+from PyQt5.QtWidgets import (
+    QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+    QProgressBar, QScrollArea, QInputDialog
+)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont
+from PyQt5.QtWebEngineWidgets import QWebEngineDownloadItem
+
+from download_index import DOWNLOAD_INDEX, DownloadHasher
+from download_queue import (
+    DownloadQueue, TransferRate, PRIORITY_NORMAL, PRIORITY_NAMES, PROGRESS_INTERVAL
+)
+from memory_monitor import format_bytes
+from storage import data_path
+
+# Download classes remain similar but with larger fonts
+class DownloadItem(QWidget):
+    def __init__(self, download_item, manager=None, priority=PRIORITY_NORMAL):
+        super().__init__()
+        self.download = download_item
+        self.manager = manager
+        self.priority = priority
+        self.rate = TransferRate()
+        self.expected_checksum = None
+        self.hash_result = None
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QHBoxLayout()
+        
+        self.filename_label = QLabel(os.path.basename(self.download.path()))
+        self.filename_label.setFont(QFont("Arial", 11))
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMinimumHeight(24)
+        
+        self.status_label = QLabel("⏳ Queued")
+        self.status_label.setFont(QFont("Arial", 10))
+
+        self.priority_combo = QComboBox()
+        self.priority_combo.setFont(QFont("Arial", 10))
+        for priority, name in PRIORITY_NAMES.items():
+            self.priority_combo.addItem(name, priority)
+        self.priority_combo.setCurrentIndex(self.priority_combo.findData(self.priority))
+        self.priority_combo.currentIndexChanged.connect(self.priority_changed)
+
+        self.pause_btn = QPushButton("⏸️")
+        self.pause_btn.setToolTip("Pause")
+        self.pause_btn.setFont(QFont("Arial", 11))
+        self.pause_btn.clicked.connect(self.toggle_pause)
+
+        self.cancel_btn = QPushButton("❌")
+        self.cancel_btn.setToolTip("Cancel")
+        self.cancel_btn.setFont(QFont("Arial", 11))
+        self.cancel_btn.clicked.connect(self.download.cancel)
+
+        self.checksum_btn = QPushButton("🔐")
+        self.checksum_btn.setToolTip("Verify SHA-256 checksum")
+        self.checksum_btn.setFont(QFont("Arial", 11))
+        self.checksum_btn.clicked.connect(self.ask_expected_checksum)
+
+        layout.addWidget(self.filename_label)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.priority_combo)
+        layout.addWidget(self.pause_btn)
+        layout.addWidget(self.cancel_btn)
+        layout.addWidget(self.checksum_btn)
+
+        self.setLayout(layout)
+
+        # Progress is sampled by DownloadManager.refresh_progress rather
+        # than on every downloadProgress signal
+        self.download.finished.connect(self.download_finished)
+
+    def refresh(self, now):
+        """Sample the transfer and update the widgets; returns bytes/second."""
+        received = self.download.receivedBytes()
+        total = self.download.totalBytes()
+        self.rate.add(now, received)
+        speed = self.rate.rate()
+
+        parts = []
+        if total > 0:
+            progress = int(received * 100 / total)
+            if progress != self.progress_bar.value():
+                self.progress_bar.setValue(progress)
+            parts.append(f"{progress}%")
+            parts.append(f"{format_bytes(received)} of {format_bytes(total)}")
+        else:
+            parts.append(format_bytes(received))
+        parts.append(f"{format_bytes(speed)}/s")
+        eta = self.rate.eta(total - received) if total > 0 else None
+        if eta is not None:
+            minutes, seconds = divmod(int(eta), 60)
+            parts.append(f"{minutes}:{seconds:02d} left")
+
+        text = " · ".join(parts)
+        if text != self.status_label.text():
+            self.status_label.setText(text)
+        return speed
+
+    def set_queued(self):
+        self.status_label.setText("⏳ Queued")
+        self.pause_btn.setText("⏸️")
+        self.pause_btn.setToolTip("Pause")
+
+    def set_paused(self):
+        self.rate.reset()
+        self.status_label.setText("⏸️ Paused")
+        self.pause_btn.setText("▶️")
+        self.pause_btn.setToolTip("Resume")
+
+    def set_running(self):
+        self.status_label.setText("Downloading...")
+        self.pause_btn.setText("⏸️")
+        self.pause_btn.setToolTip("Pause")
+
+    def toggle_pause(self):
+        if self.manager is None:
+            return
+        if self.manager.is_paused(self.download):
+            self.manager.resume_download(self.download)
+        else:
+            self.manager.pause_download(self.download)
+
+    def priority_changed(self, index):
+        self.priority = self.priority_combo.itemData(index)
+        if self.manager is not None:
+            self.manager.set_priority(self.download, self.priority)
+
+    def ask_expected_checksum(self):
+        checksum, ok = QInputDialog.getText(self, "🔐 Verify Download",
+                                            "Expected SHA-256 checksum:",
+                                            text=self.expected_checksum or "")
+        if ok:
+            self.expected_checksum = checksum.strip().lower() or None
+            if self.hash_result is not None:
+                self.hash_result.expected = self.expected_checksum
+                self.set_hash_result(self.hash_result)
+
+    def set_hash_result(self, result):
+        self.hash_result = result
+        if result.error:
+            self.status_label.setText(f"Completed · hashing failed: {result.error}")
+            return
+
+        parts = ["Completed", f"SHA-256 {result.sha256[:12]}…",
+                 f"{result.throughput:.0f} MB/s"]
+        if result.linked:
+            parts.append(f"🔗 same as {os.path.basename(result.duplicate_of)}")
+        if result.verified is True:
+            parts.append("✅ verified")
+        elif result.verified is False:
+            parts.append("⚠️ checksum mismatch")
+        self.status_label.setText(" · ".join(parts))
+        self.status_label.setToolTip(f"SHA-256: {result.sha256}")
+
+    def download_finished(self):
+        state = self.download.state()
+        if state == QWebEngineDownloadItem.DownloadCompleted:
+            self.status_label.setText("Completed · hashing…")
+            self.progress_bar.setValue(100)
+        elif state == QWebEngineDownloadItem.DownloadCancelled:
+            self.status_label.setText("Cancelled")
+        else:
+            self.status_label.setText(f"❌ {self.download.interruptReasonString()}")
+        for widget in (self.priority_combo, self.pause_btn, self.cancel_btn):
+            widget.setEnabled(False)
+
+class DownloadManager(QDialog):
+    """Download list plus the scheduler deciding which transfers run.
+
+    QtWebEngine starts a download as soon as it is accepted, so every
+    download is accepted and then paused until DownloadQueue gives it a
+    slot; finishing or pausing one lets the next waiting download resume.
+    Completed files are hashed by DownloadHasher off the GUI thread.
+    """
+    hash_finished = pyqtSignal(object)
+
+    def __init__(self, parent=None, queue=None):
+        super().__init__(parent)
+        self.setWindowTitle("📥 Download Manager")
+        self.setGeometry(300, 300, 800, 600)  # Larger dialog
+        self.queue = queue if queue is not None else DownloadQueue()
+        self.items = {}  # QWebEngineDownloadItem -> DownloadItem
+        self.init_ui()
+
+        # One timer samples every running download, however many there are
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(PROGRESS_INTERVAL)
+        self.progress_timer.timeout.connect(self.refresh_progress)
+
+        # Emitted from the hashing thread, delivered on the GUI thread
+        self.hash_finished.connect(self.show_hash_result)
+        self.hasher = DownloadHasher(self.hash_finished.emit, data_path(DOWNLOAD_INDEX))
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Header with larger font
+        header = QLabel("Downloads")
+        header.setFont(QFont("Arial", 16, QFont.Bold))
+        header.setAlignment(Qt.AlignCenter)
+        layout.addWidget(header)
+
+        self.bandwidth_label = QLabel("No active downloads")
+        self.bandwidth_label.setFont(QFont("Arial", 11))
+        self.bandwidth_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.bandwidth_label)
+
+        self.scroll_area = QScrollArea()
+        self.download_widget = QWidget()
+        self.download_layout = QVBoxLayout(self.download_widget)
+        self.scroll_area.setWidget(self.download_widget)
+        self.scroll_area.setWidgetResizable(True)
+        layout.addWidget(self.scroll_area)
+
+        # Buttons with larger fonts
+        button_layout = QHBoxLayout()
+        
+        clear_btn = QPushButton("🗑️ Clear Completed")
+        clear_btn.setFont(QFont("Arial", 11))
+        clear_btn.clicked.connect(self.clear_completed)
+        button_layout.addWidget(clear_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.setFont(QFont("Arial", 11))
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def add_download(self, download_item, priority=PRIORITY_NORMAL):
+        """Queue an accepted download; it only transfers once scheduled."""
+        download_widget = DownloadItem(download_item, self, priority)
+        self.items[download_item] = download_widget
+        self.download_layout.addWidget(download_widget)
+        download_item.finished.connect(lambda: self.download_finished(download_item))
+
+        self.queue.add(download_item, download_item.url().host(), priority)
+        self.schedule()
+        if self.queue.is_waiting(download_item):
+            download_item.pause()
+
+    def schedule(self):
+        for download_item in self.queue.schedule():
+            if download_item.isPaused():
+                download_item.resume()
+            self.items[download_item].set_running()
+        if self.queue.active and not self.progress_timer.isActive():
+            self.progress_timer.start()
+
+    def refresh_progress(self):
+        now = time.monotonic()
+        total_speed = 0.0
+        # Batch the label and bar changes into a single repaint
+        self.download_widget.setUpdatesEnabled(False)
+        try:
+            for download_item in self.queue.active:
+                total_speed += self.items[download_item].refresh(now)
+        finally:
+            self.download_widget.setUpdatesEnabled(True)
+
+        active = len(self.queue.active)
+        if active:
+            waiting = len(self.queue) - active - len(self.queue.paused)
+            self.bandwidth_label.setText(
+                f"⬇️ {format_bytes(total_speed)}/s · {active} active · {waiting} queued")
+        else:
+            self.bandwidth_label.setText("No active downloads")
+            self.progress_timer.stop()
+
+    def is_paused(self, download_item):
+        return download_item in self.queue.paused
+
+    def pause_download(self, download_item):
+        self.queue.pause(download_item)
+        download_item.pause()
+        self.items[download_item].set_paused()
+        self.schedule()
+
+    def resume_download(self, download_item):
+        self.queue.resume(download_item)
+        self.items[download_item].set_queued()
+        self.schedule()
+
+    def set_priority(self, download_item, priority):
+        self.queue.set_priority(download_item, priority)
+
+    def download_finished(self, download_item):
+        self.queue.remove(download_item)
+        self.schedule()
+        if download_item.state() == QWebEngineDownloadItem.DownloadCompleted:
+            self.hasher.submit(download_item.path(), download_item.url().toString(),
+                               self.items[download_item].expected_checksum)
+
+    def show_hash_result(self, result):
+        for download_item, download_widget in self.items.items():
+            if download_item.path() == result.path:
+                download_widget.set_hash_result(result)
+                break
+
+    def active_count(self):
+        return len(self.queue.active)
+
+    def clear_completed(self):
+        for download_item, download_widget in list(self.items.items()):
+            if not download_item.isFinished():
+                continue
+            del self.items[download_item]
+            self.download_layout.removeWidget(download_widget)
+            download_widget.deleteLater()
+            # Finished items otherwise live as long as their profile
+            download_item.deleteLater()
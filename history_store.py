@@ -0,0 +1,339 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+HISTORY_DB = "history.db"
+LEGACY_HISTORY_FILE = "history.json"
+FLUSH_INTERVAL = 0.5  # seconds between batched writes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    host TEXT NOT NULL DEFAULT '',
+    visit_count INTEGER NOT NULL DEFAULT 0,
+    last_visit REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS visits (
+    id INTEGER PRIMARY KEY,
+    url_id INTEGER NOT NULL REFERENCES urls(id) ON DELETE CASCADE,
+    visit_time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS visits_time ON visits(visit_time);
+CREATE INDEX IF NOT EXISTS visits_url ON visits(url_id);
+CREATE INDEX IF NOT EXISTS urls_last_visit ON urls(last_visit);
+CREATE INDEX IF NOT EXISTS urls_host ON urls(host);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Full-text index over urls, kept in sync by triggers. The prefix indexes
+# make the as-you-type "term*" queries cheap for short prefixes. Its rowid
+# is not urls.id but a recency key: seconds before a far-off date in the
+# high bits and the id in the low URL_ID_BITS, so FTS5 hands out matches
+# most recently visited first and a search can stop after
+# SEARCH_CANDIDATES of them without touching the rest. A visit moves the
+# URL's entry to its new key.
+URL_ID_BITS = 29
+FTS_LAYOUT = "recency-key"
+_RECENCY_KEY = (f"((((1 << 34) - 1 - CAST({{row}}.last_visit AS INTEGER)) << {URL_ID_BITS})"
+                " | {row}.id)")
+FTS_SCHEMA = """
+CREATE VIEW IF NOT EXISTS urls_by_recency AS
+SELECT {urls_key} AS recency_key, title, url, host FROM urls;
+CREATE VIRTUAL TABLE IF NOT EXISTS urls_fts USING fts5(
+    title, url, host,
+    content='urls_by_recency', content_rowid='recency_key', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS urls_fts_insert AFTER INSERT ON urls BEGIN
+    INSERT INTO urls_fts (rowid, title, url, host)
+    VALUES ({new_key}, new.title, new.url, new.host);
+END;
+CREATE TRIGGER IF NOT EXISTS urls_fts_delete AFTER DELETE ON urls BEGIN
+    INSERT INTO urls_fts (urls_fts, rowid, title, url, host)
+    VALUES ('delete', {old_key}, old.title, old.url, old.host);
+END;
+CREATE TRIGGER IF NOT EXISTS urls_fts_update AFTER UPDATE OF title, last_visit ON urls
+WHEN old.title IS NOT new.title OR {old_key} != {new_key} BEGIN
+    INSERT INTO urls_fts (urls_fts, rowid, title, url, host)
+    VALUES ('delete', {old_key}, old.title, old.url, old.host);
+    INSERT INTO urls_fts (rowid, title, url, host)
+    VALUES ({new_key}, new.title, new.url, new.host);
+END;
+""".format(urls_key=_RECENCY_KEY.format(row="urls"), new_key=_RECENCY_KEY.format(row="new"),
+           old_key=_RECENCY_KEY.format(row="old"))
+_DROP_FTS = """
+DROP TRIGGER IF EXISTS urls_fts_insert;
+DROP TRIGGER IF EXISTS urls_fts_delete;
+DROP TRIGGER IF EXISTS urls_fts_update;
+DROP TABLE IF EXISTS urls_fts;
+DROP VIEW IF EXISTS urls_by_recency;
+"""
+
+# Ranking every match of a broad prefix like "gi*" costs far more than a
+# keystroke allows, so only the SEARCH_CANDIDATES most recently visited
+# matching URLs are ranked. Queries with fewer matches than that are ranked
+# exactly.
+SEARCH_CANDIDATES = 1000
+
+# The candidates are ranked by where each word matched, weighted like the
+# bm25 columns were (a title word 10, a host label 5, only the URL 2), times
+# a boost of up to 6x for frequently visited URLs. Unlike bm25() this needs
+# no position lists from the index, which cost more than the whole query
+# for common words.
+_SEARCH_FTS = """
+SELECT urls.id, urls.title, urls.url, urls.last_visit, urls.visit_count
+FROM (
+    SELECT rowid FROM urls_fts WHERE urls_fts MATCH :match
+    ORDER BY rowid LIMIT :candidates
+) AS hits JOIN urls ON urls.id = hits.rowid & {id_mask}
+ORDER BY ({text_score}) * (1.0 + min(urls.visit_count, 50) / 10.0) DESC,
+    urls.last_visit DESC
+LIMIT :limit OFFSET :offset
+"""
+_SEARCH_TERM_SCORE = ("max(10 * (instr(' ' || lower(urls.title), ' ' || :term{i}) > 0), "
+                      "5 * (instr('.' || urls.host, '.' || :term{i}) > 0), 2)")
+
+_SEARCH_LIKE = """
+SELECT id, title, url, last_visit, visit_count FROM urls
+WHERE title LIKE ? ESCAPE '\\' OR url LIKE ? ESCAPE '\\'
+ORDER BY visit_count DESC, last_visit DESC
+LIMIT ? OFFSET ?
+"""
+
+_SEARCH_TERM_RE = re.compile(r"\w+")
+
+_UPSERT_URL = """
+INSERT INTO urls (url, title, host, visit_count, last_visit) VALUES (?, ?, ?, 1, ?)
+ON CONFLICT(url) DO UPDATE SET
+    title = CASE WHEN excluded.title != '' THEN excluded.title ELSE urls.title END,
+    visit_count = urls.visit_count + 1,
+    last_visit = MAX(urls.last_visit, excluded.last_visit)
+"""
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+class HistoryStore:
+    """Browsing history in SQLite with writes batched on a background thread.
+
+    add_visit() only appends to an in-memory queue, so it is safe to call
+    from the GUI thread on every page load. The writer thread wakes up,
+    waits FLUSH_INTERVAL to collect more visits and commits them in a
+    single transaction. Reads use a separate connection; WAL mode lets them
+    run while a batch is being written.
+    """
+
+    def __init__(self, path=HISTORY_DB, flush_interval=FLUSH_INTERVAL,
+                 legacy_path=LEGACY_HISTORY_FILE):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._closed = False
+
+        self.conn = _connect(path)
+        self.conn.executescript(SCHEMA)
+        self.has_fts = self._create_fts()
+        self.migrate_legacy_history(legacy_path)
+
+        self._writer = threading.Thread(target=self._run_writer, name="history-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def _create_fts(self):
+        existed = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'urls_fts'").fetchone()
+        layout = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'fts_layout'").fetchone()
+        try:
+            if existed and layout != (FTS_LAYOUT,):
+                # Keyed by urls.id by older versions; built again below
+                self.conn.executescript(_DROP_FTS)
+                existed = None
+            self.conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print(f"Full-text history search unavailable: {e}")
+            return False
+        if not existed:
+            # Index rows written before the full-text table existed
+            with self.conn:
+                self.conn.execute("INSERT INTO urls_fts (urls_fts) VALUES ('rebuild')")
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) "
+                                  "VALUES ('fts_layout', ?)", (FTS_LAYOUT,))
+        return True
+
+    def migrate_legacy_history(self, legacy_path):
+        """Import history.json once, the first time the database is opened."""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+        entries = []
+        try:
+            if legacy_path and os.path.exists(legacy_path):
+                with open(legacy_path, 'r') as f:
+                    entries = json.load(f)
+        except Exception as e:
+            print(f"Error reading legacy history: {e}")
+
+        with self.conn:
+            for entry in entries:
+                try:
+                    visit_time = datetime.strptime(entry['timestamp'],
+                                                   "%Y-%m-%d %H:%M:%S").timestamp()
+                except (KeyError, ValueError):
+                    visit_time = time.time()
+                self._write_visit(self.conn, entry.get('url', ''), entry.get('title', ''),
+                                  visit_time)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)",
+                              (str(len(entries)),))
+
+    @staticmethod
+    def _write_visit(conn, url, title, visit_time):
+        if not url:
+            return
+        host = urlparse(url).hostname or ''
+        conn.execute(_UPSERT_URL, (url, title or '', host, visit_time))
+        url_id = conn.execute("SELECT id FROM urls WHERE url = ?", (url,)).fetchone()[0]
+        conn.execute("INSERT INTO visits (url_id, visit_time) VALUES (?, ?)",
+                     (url_id, visit_time))
+
+    def add_visit(self, url, title, visit_time=None):
+        self._queue(('visit', url, title, visit_time or time.time()))
+
+    def clear(self):
+        self._queue(('clear',))
+
+    def _queue(self, op):
+        with self._lock:
+            if self._closed:
+                return
+            self._pending.append(op)
+            self._idle.clear()
+        self._wake.set()
+
+    def _run_writer(self):
+        conn = _connect(self.path)
+        try:
+            while True:
+                self._wake.wait()
+                # Coalesce everything that arrives during the interval
+                self._stop.wait(self.flush_interval)
+                with self._lock:
+                    ops, self._pending = self._pending, []
+                    self._wake.clear()
+                try:
+                    self._apply(conn, ops)
+                except Exception as e:
+                    print(f"Error writing history: {e}")
+                with self._lock:
+                    if not self._pending:
+                        self._idle.set()
+                    if self._closed and not self._pending:
+                        break
+        finally:
+            conn.close()
+
+    def _apply(self, conn, ops):
+        with conn:
+            for op in ops:
+                if op[0] == 'visit':
+                    self._write_visit(conn, *op[1:])
+                elif op[0] == 'clear':
+                    conn.execute("DELETE FROM visits")
+                    conn.execute("DELETE FROM urls")
+
+    def flush(self, timeout=None):
+        """Block until every queued write has been committed."""
+        self._wake.set()
+        return self._idle.wait(timeout)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._stop.set()
+        self._wake.set()
+        self._writer.join()
+        self.conn.close()
+
+    def visit_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM visits").fetchone()[0]
+
+    def frecency_rows(self):
+        """Every URL as (url, title, visit_count, last_visit)."""
+        return self.frecency_snapshot()[0]
+
+    def frecency_snapshot(self):
+        """frecency_rows() and the newest visit time they include.
+
+        Both are read in one transaction, so a visit is either counted in
+        the rows or later than the returned time. Uses its own connection
+        so the address bar index can be built on a worker thread.
+        """
+        conn = _connect(self.path)
+        try:
+            with conn:
+                conn.execute("BEGIN")
+                cutoff = conn.execute("SELECT MAX(visit_time) FROM visits").fetchone()[0]
+                rows = conn.execute(
+                    "SELECT url, title, visit_count, last_visit FROM urls").fetchall()
+            return rows, cutoff
+        finally:
+            conn.close()
+
+    def recent_visits(self, limit=-1, before=None):
+        """Visits newest first as (visit_id, visit_time, title, url) tuples.
+
+        before is the (visit_time, visit_id) of the last row of the previous
+        page; paging by key rather than OFFSET keeps every page an index seek.
+        """
+        if before is None:
+            before = (float('inf'), 0)
+        return self.conn.execute(
+            "SELECT visits.id, visits.visit_time, urls.title, urls.url FROM visits "
+            "JOIN urls ON urls.id = visits.url_id "
+            "WHERE (visits.visit_time, visits.id) < (?, ?) "
+            "ORDER BY visits.visit_time DESC, visits.id DESC LIMIT ?",
+            (before[0], before[1], limit)).fetchall()
+
+    def search(self, query, limit=100, offset=0):
+        """Ranked matches for query over titles, URLs and host names.
+
+        Every word is matched as a prefix and all words must match. Returns
+        (url_id, title, url, last_visit, visit_count) tuples, best first.
+        """
+        terms = _SEARCH_TERM_RE.findall(query.lower())
+        if not terms:
+            return []
+        if self.has_fts:
+            # A word still being typed adds little but a one-letter prefix
+            # expands to most of the index, so wait for a second letter
+            terms = [term for term in terms if len(term) > 1] or terms
+            params = {'match': " ".join(f'"{term}"*' for term in terms),
+                      'candidates': max(SEARCH_CANDIDATES, limit + offset),
+                      'limit': limit, 'offset': offset}
+            params.update((f'term{i}', term) for i, term in enumerate(terms))
+            sql = _SEARCH_FTS.format(
+                id_mask=(1 << URL_ID_BITS) - 1,
+                text_score=" + ".join(_SEARCH_TERM_SCORE.format(i=i) for i in range(len(terms))))
+            return self.conn.execute(sql, params).fetchall()
+
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self.conn.execute(_SEARCH_LIKE, (pattern, pattern, limit, offset)).fetchall()
@@ -0,0 +1,52 @@
+from collections import Counter
+
+MEMORY_BUDGET_MB = 2048
+SAMPLE_INTERVAL = 10000  # ms
+
+
+def read_rss(pid):
+    """Resident set size of a process in bytes, 0 if it can't be read."""
+    try:
+        with open(f"/proc/{pid}/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def sample_rss(pids):
+    """One pass over /proc for every pid, as {pid: rss_bytes}."""
+    return {pid: read_rss(pid) for pid in pids}
+
+
+def choose_evictions(candidates, live_pids, rss_by_pid, excess):
+    """Pick tabs to discard so that about excess bytes are freed.
+
+    candidates are (tab, pid, last_active) for the tabs that may be
+    discarded, live_pids the renderer pid of every live tab. Tabs sharing a
+    renderer are charged an equal share of its RSS. The largest shares go
+    first, least recently used first among equals.
+    """
+    tabs_per_pid = Counter(live_pids)
+    charged = []
+    for tab, pid, last_active in candidates:
+        share = rss_by_pid.get(pid, 0) // max(tabs_per_pid[pid], 1)
+        charged.append((-share, last_active, id(tab), tab))
+    charged.sort()
+
+    evicted = []
+    freed = 0
+    for negative_share, _, _, tab in charged:
+        if freed >= excess:
+            break
+        evicted.append(tab)
+        freed -= negative_share
+    return evicted
+
+
+def format_bytes(count):
+    if count >= 1 << 30:
+        return f"{count / (1 << 30):.1f} GB"
+    return f"{count / (1 << 20):.0f} MB"
@@ -0,0 +1,218 @@
+import bisect
+import heapq
+import math
+import threading
+import time
+
+# Frecency: every visit adds a weight that halves every HALF_LIFE seconds.
+# Scores are kept as log(sum(weight * exp(DECAY * (t - EPOCH)))), so the
+# ordering between two URLs never changes as time passes and stored scores
+# never need to be recomputed.
+HALF_LIFE = 14 * 24 * 3600
+DECAY = math.log(2) / HALF_LIFE
+EPOCH = 1.7e9
+BOOKMARK_WEIGHT = 10.0
+
+# Prefix ranges up to this size are scanned directly; broader prefixes walk
+# the URLs in score order and stop after enough matches
+SCAN_LIMIT = 2000
+
+_KEY_SEPARATOR = "\x00"
+
+
+def _logaddexp(a, b):
+    if a < b:
+        a, b = b, a
+    if b == -math.inf:
+        return a
+    return a + math.log1p(math.exp(b - a))
+
+
+def visit_score(visit_time, weight=1.0):
+    return DECAY * (visit_time - EPOCH) + math.log(weight)
+
+
+def normalize(text):
+    """Lowercase and drop the scheme and a leading www. for prefix matching."""
+    text = text.strip().lower()
+    for scheme in ("https://", "http://"):
+        if text.startswith(scheme):
+            text = text[len(scheme):]
+            break
+    if text.startswith("www."):
+        text = text[4:]
+    return text
+
+
+class Suggestion:
+    __slots__ = ("url", "title", "score", "bookmarked", "keys")
+
+    def __init__(self, url, title, score=-math.inf):
+        self.url = url
+        self.title = title
+        self.score = score
+        self.bookmarked = False
+        self.keys = ()
+
+
+class SuggestionIndex:
+    """In-memory frecency index behind the address bar suggestions.
+
+    Every URL is reachable through two keys in a sorted list, the
+    normalized URL and the lowercased title, so a typed prefix maps to a
+    contiguous range found with bisect. A second list keeps the URLs
+    ordered by score. Updates insert into both lists in place.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.keys = []
+        self.ranked = []  # (-score, url), best first
+        self._lock = threading.Lock()
+        # Updates made while a load() is running, replayed on top of it
+        self._log = None
+        self._loads = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _keys_for(self, entry):
+        keys = [normalize(entry.url) + _KEY_SEPARATOR + entry.url]
+        title = entry.title.strip().lower()
+        if title:
+            keys.append(title + _KEY_SEPARATOR + entry.url)
+        return tuple(keys)
+
+    def _remove(self, entry):
+        for key in entry.keys:
+            i = bisect.bisect_left(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                del self.keys[i]
+        i = bisect.bisect_left(self.ranked, (-entry.score, entry.url))
+        if i < len(self.ranked) and self.ranked[i][1] == entry.url:
+            del self.ranked[i]
+
+    def _insert(self, entry):
+        entry.keys = self._keys_for(entry)
+        for key in entry.keys:
+            bisect.insort(self.keys, key)
+        bisect.insort(self.ranked, (-entry.score, entry.url))
+
+    def _update(self, url, title, score, bookmarked=False):
+        entry = self.entries.get(url)
+        if entry is None:
+            entry = self.entries[url] = Suggestion(url, title or "")
+        else:
+            self._remove(entry)
+        if title:
+            entry.title = title
+        entry.score = _logaddexp(entry.score, score)
+        entry.bookmarked = entry.bookmarked or bookmarked
+        self._insert(entry)
+
+    def add_visit(self, url, title="", visit_time=None):
+        visit_time = visit_time or time.time()
+        with self._lock:
+            self._update(url, title, visit_score(visit_time))
+            if self._log is not None:
+                self._log.append(('visit', url, title, visit_time))
+
+    def add_bookmark(self, url, title=""):
+        now = time.time()
+        with self._lock:
+            self._update(url, title, visit_score(now, BOOKMARK_WEIGHT), True)
+            if self._log is not None:
+                self._log.append(('bookmark', url, title, now))
+
+    def remove_bookmark(self, url):
+        """Drop the bookmark flag; the bookmark's score boost stays with the URL."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                entry.bookmarked = False
+            if self._log is not None:
+                self._log.append(('unbookmark', url))
+
+    def begin_load(self):
+        """Start recording updates for a load() that is about to run.
+
+        Call it when the bookmark list for the load is taken, and pass the
+        returned marker to load().
+        """
+        with self._lock:
+            if self._loads == 0:
+                self._log = []
+            self._loads += 1
+            return len(self._log)
+
+    def load(self, history_rows, bookmarks=(), cutoff=None, marker=None):
+        """Bulk load from (url, title, visit_count, last_visit) rows.
+
+        Builds the sorted lists off to the side, so it can run on a worker
+        thread. Updates recorded since begin_load() returned marker are
+        replayed on top, except visits at or before cutoff, the newest
+        visit time the rows include, which are already counted in them.
+        """
+        entries = {}
+        for url, title, visit_count, last_visit in history_rows:
+            entry = Suggestion(url, title or "",
+                               visit_score(last_visit, max(visit_count, 1)))
+            entries[url] = entry
+        now = time.time()
+        for url, title in bookmarks:
+            entry = entries.get(url)
+            if entry is None:
+                entry = entries[url] = Suggestion(url, title or "")
+            entry.score = _logaddexp(entry.score, visit_score(now, BOOKMARK_WEIGHT))
+            entry.bookmarked = True
+
+        keys = []
+        for entry in entries.values():
+            entry.keys = self._keys_for(entry)
+            keys.extend(entry.keys)
+        keys.sort()
+        ranked = sorted((-entry.score, url) for url, entry in entries.items())
+
+        with self._lock:
+            self.entries, self.keys, self.ranked = entries, keys, ranked
+            if marker is None:
+                return
+            for op in self._log[marker:]:
+                if op[0] == 'visit' and (cutoff is None or op[3] > cutoff):
+                    self._update(op[1], op[2], visit_score(op[3]))
+                elif op[0] == 'bookmark':
+                    self._update(op[1], op[2], visit_score(op[3], BOOKMARK_WEIGHT), True)
+                elif op[0] == 'unbookmark' and op[1] in self.entries:
+                    self.entries[op[1]].bookmarked = False
+                elif op[0] == 'clear':
+                    self.entries, self.keys, self.ranked = {}, [], []
+            self._loads -= 1
+            if self._loads == 0:
+                self._log = None
+
+    def suggest(self, text, limit=8):
+        """Best matching Suggestion objects for the typed text, by frecency."""
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        with self._lock:
+            lo = bisect.bisect_left(self.keys, prefix)
+            hi = bisect.bisect_left(self.keys, prefix + "￿", lo)
+            if hi - lo <= SCAN_LIMIT:
+                urls = {key.rpartition(_KEY_SEPARATOR)[2] for key in self.keys[lo:hi]}
+                best = heapq.nlargest(limit, urls, key=lambda url: self.entries[url].score)
+            else:
+                best = []
+                for _, url in self.ranked:
+                    entry = self.entries[url]
+                    if any(key.startswith(prefix) for key in entry.keys):
+                        best.append(url)
+                        if len(best) == limit:
+                            break
+            return [self.entries[url] for url in best]
+
+    def clear(self):
+        with self._lock:
+            self.entries, self.keys, self.ranked = {}, [], []
+            if self._log is not None:
+                self._log.append(('clear',))
@@ -0,0 +1,132 @@
+"""Asyncio client for the browser's JSON-RPC endpoint (--rpc).
+
+Requests are pipelined: every call is written straight away and its
+future resolves when the matching response arrives, in whatever order the
+browser finishes them. Run many calls at once with asyncio.gather():
+
+    async with await RpcClient.connect() as client:
+        tabs = await asyncio.gather(*(client.open_tab(url) for url in urls))
+        await asyncio.gather(*(client.wait_load(tab) for tab in tabs))
+
+Unix only; the server listens on a Unix socket, RPC_SOCKET in the data
+directory unless --rpc was given a path.
+"""
+import asyncio
+import base64
+import itertools
+import json
+import os
+
+from storage import data_dir
+
+RPC_SOCKET = "rpc.sock"
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024  # HTML and screenshots come back in one line
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000  # the command failed, e.g. the tab was closed
+TIMEOUT_ERROR = -32001
+
+
+def rpc_socket_path():
+    return os.path.join(data_dir(), RPC_SOCKET)
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{message} ({code})")
+        self.code = code
+        self.message = message
+
+
+class RpcClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count(1)
+        self.pending = {}  # request id -> future
+        self.reader_task = asyncio.get_running_loop().create_task(self.read_responses())
+
+    @classmethod
+    async def connect(cls, path=None):
+        reader, writer = await asyncio.open_unix_connection(path or rpc_socket_path(),
+                                                            limit=MAX_MESSAGE_BYTES)
+        return cls(reader, writer)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def call(self, method, **params):
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        message = {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+        return await future
+
+    async def read_responses(self):
+        error = ConnectionError("Connection to the browser closed")
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self.pending.pop(response.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in response:
+                    future.set_exception(RpcError(response['error'].get('code'),
+                                                  response['error'].get('message')))
+                else:
+                    future.set_result(response.get('result'))
+        except Exception as e:
+            error = e
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending.clear()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self.reader_task
+
+    # Commands, see RpcServer in rpc_server.py
+    async def open_tab(self, url=None, background=True):
+        return (await self.call('open_tab', url=url, background=background))['tab']
+
+    async def navigate(self, tab, url):
+        return await self.call('navigate', tab=tab, url=url)
+
+    async def wait_load(self, tab, timeout=30):
+        return await self.call('wait_load', tab=tab, timeout=timeout)
+
+    async def run_js(self, tab, script):
+        return await self.call('run_js', tab=tab, script=script)
+
+    async def get_html(self, tab):
+        return await self.call('get_html', tab=tab)
+
+    async def screenshot(self, tab, path=None):
+        """PNG bytes, or written to path (as seen by the browser) if given."""
+        result = await self.call('screenshot', tab=tab, path=path)
+        if path:
+            return result['path']
+        return base64.b64decode(result['png'])
+
+    async def close_tab(self, tab):
+        return await self.call('close_tab', tab=tab)
+
+    async def list_tabs(self):
+        return await self.call('list_tabs')
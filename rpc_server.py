@@ -0,0 +1,290 @@
+import base64
+import inspect
+import json
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, QTimer, QUrl
+from PyQt5.QtGui import QColor
+from PyQt5.QtNetwork import QLocalServer
+
+from rpc_client import (
+    INVALID_PARAMS, INVALID_REQUEST, MAX_MESSAGE_BYTES, METHOD_NOT_FOUND, PARSE_ERROR,
+    SERVER_ERROR, TIMEOUT_ERROR, RpcError, rpc_socket_path
+)
+from single_instance import server_running
+
+SCREENSHOT_DELAY = 100  # ms for a tab brought to the front to paint before grabbing
+
+
+class RpcServer(QObject):
+    """JSON-RPC 2.0 over a Unix socket, for driving the browser from scripts.
+
+    Each request is one JSON line. Requests are handled as they arrive and
+    the slow ones (wait_load, run_js, get_html, screenshot) answer from Qt
+    callbacks, so a client can keep many commands in flight across tabs and
+    match responses by id. Tabs are referred to by integer ids handed out
+    by open_tab and list_tabs. Tabs used over RPC are marked automated,
+    which keeps TabLifecycleManager from freezing or discarding them.
+    """
+
+    def __init__(self, browser, path=None):
+        super().__init__(browser)
+        self.browser = browser
+        self.path = path or rpc_socket_path()
+        self.clients = set()
+        self.tabs = {}  # id -> BrowserTab
+        self.tab_ids = {}  # BrowserTab -> id
+        self.next_tab_id = 1
+        self.watched_views = {}  # tab id -> the view whose load signals are connected
+        self.expecting_load = set()  # tab ids navigated whose load hasn't finished
+        self.load_results = {}  # tab id -> ok of the last finished load
+        self.load_waiters = {}  # tab id -> [(respond, timer)]
+
+        self.methods = {
+            'open_tab': self.open_tab,
+            'navigate': self.navigate,
+            'wait_load': self.wait_load,
+            'run_js': self.run_js,
+            'get_html': self.get_html,
+            'screenshot': self.screenshot,
+            'close_tab': self.close_tab,
+            'list_tabs': self.list_tabs,
+        }
+
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.accept_connections)
+
+    def listen(self):
+        # listen() would replace a live socket; see InstanceServer.listen()
+        if server_running(self.path):
+            print(f"Error starting JSON-RPC server: {self.path} is in use by another browser")
+            return False
+        if not self.server.listen(self.path):
+            # A socket file left by a browser that didn't shut down cleanly
+            QLocalServer.removeServer(self.path)
+            self.server.listen(self.path)
+        if self.server.isListening():
+            print(f"JSON-RPC listening on {self.server.fullServerName()}")
+            return True
+        print(f"Error starting JSON-RPC server: {self.server.errorString()}")
+        return False
+
+    def close(self):
+        self.server.close()
+
+    # Connections and framing
+    def accept_connections(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.clients.add(socket)
+            socket.readyRead.connect(lambda socket=socket: self.read_requests(socket))
+            socket.disconnected.connect(lambda socket=socket: self.client_disconnected(socket))
+
+    def client_disconnected(self, socket):
+        self.clients.discard(socket)
+        socket.deleteLater()
+
+    def read_requests(self, socket):
+        while socket.canReadLine():
+            self.handle_request(socket, bytes(socket.readLine()))
+        if socket.bytesAvailable() > MAX_MESSAGE_BYTES:
+            socket.abort()
+
+    def send(self, socket, message):
+        # The client may have gone while a command was running
+        if socket in self.clients:
+            socket.write(json.dumps(message, default=str).encode() + b"\n")
+
+    def handle_request(self, socket, line):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self.send(socket, {'jsonrpc': '2.0', 'id': None,
+                               'error': {'code': PARSE_ERROR, 'message': str(e)}})
+            return
+        request_id = request.get('id') if isinstance(request, dict) else None
+        answered = False
+
+        def respond(result=None, error=None):
+            nonlocal answered
+            if answered or request_id is None:
+                return  # Already answered, or a notification
+            answered = True
+            message = {'jsonrpc': '2.0', 'id': request_id}
+            if error is not None:
+                message['error'] = {'code': error.code, 'message': error.message}
+            else:
+                message['result'] = result
+            self.send(socket, message)
+
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                raise RpcError(INVALID_REQUEST, "Expected an object with a method")
+            method = self.methods.get(request['method'])
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Unknown method {request['method']}")
+            params = request.get('params') or {}
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            try:
+                inspect.signature(method).bind(respond, **params)
+            except TypeError as e:
+                raise RpcError(INVALID_PARAMS, str(e))
+            method(respond, **params)
+        except RpcError as e:
+            respond(error=e)
+        except Exception as e:
+            print(f"Error handling JSON-RPC {request.get('method')}: {e}")
+            respond(error=RpcError(SERVER_ERROR, str(e)))
+
+    # Tabs
+    def tab_id(self, tab):
+        if tab not in self.tab_ids:
+            self.tab_ids[tab] = self.next_tab_id
+            self.tabs[self.next_tab_id] = tab
+            self.next_tab_id += 1
+        return self.tab_ids[tab]
+
+    def forget_tab(self, tab_id):
+        tab = self.tabs.pop(tab_id, None)
+        self.tab_ids.pop(tab, None)
+        self.watched_views.pop(tab_id, None)
+        self.expecting_load.discard(tab_id)
+        self.load_results.pop(tab_id, None)
+        for respond, timer in self.load_waiters.pop(tab_id, ()):
+            timer.stop()
+            timer.deleteLater()
+            respond(error=RpcError(SERVER_ERROR, f"Tab {tab_id} was closed"))
+
+    def live_tab(self, tab_id):
+        """The tab for tab_id with its view built and connected."""
+        tab = self.tabs.get(tab_id)
+        if tab is None or self.browser.tabs.indexOf(tab) == -1:
+            self.forget_tab(tab_id)
+            raise RpcError(SERVER_ERROR, f"No tab {tab_id}")
+        tab.automated = True
+        # Building a lazy tab's view or bringing back a discarded one starts
+        # a load, possibly before loadStarted is connected below
+        reloading = tab.webview is None or tab.discarded
+        if tab.restore():
+            self.browser.tab_lifecycle.restore_count += 1
+            self.browser.tabs.tabBar().setTabTextColor(self.browser.tabs.indexOf(tab), QColor())
+        view = tab.webview
+        if self.watched_views.get(tab_id) is not view:
+            self.watched_views[tab_id] = view
+            view.loadStarted.connect(lambda: self.load_started(tab_id))
+            view.loadFinished.connect(lambda ok: self.load_finished(tab_id, ok))
+        if reloading:
+            self.expecting_load.add(tab_id)
+        return tab
+
+    def load_started(self, tab_id):
+        if tab_id in self.tabs:
+            self.expecting_load.add(tab_id)
+
+    def load_finished(self, tab_id, ok):
+        if tab_id not in self.tabs:
+            return
+        self.expecting_load.discard(tab_id)
+        self.load_results[tab_id] = ok
+        for respond, timer in self.load_waiters.pop(tab_id, ()):
+            timer.stop()
+            timer.deleteLater()
+            respond(self.load_state(tab_id, ok))
+
+    def load_state(self, tab_id, ok):
+        view = self.tabs[tab_id].webview
+        return {'ok': ok, 'url': view.url().toString(), 'title': view.title()}
+
+    # Commands
+    def open_tab(self, respond, url=None, background=True):
+        tab = self.browser.add_new_tab(url, background=background)
+        if tab is None:
+            raise RpcError(SERVER_ERROR, "Could not create the tab")
+        tab_id = self.tab_id(tab)
+        self.live_tab(tab_id)
+        self.expecting_load.add(tab_id)
+        respond({'tab': tab_id})
+
+    def navigate(self, respond, tab, url):
+        # setUrl() only starts the load; loadStarted comes later
+        self.live_tab(tab).webview.setUrl(QUrl(url))
+        self.expecting_load.add(tab)
+        respond()
+
+    def wait_load(self, respond, tab, timeout=30):
+        """Answer when the tab's current load finishes, or now if it isn't loading."""
+        browser_tab = self.live_tab(tab)
+        if tab not in self.expecting_load and not browser_tab.is_loading:
+            respond(self.load_state(tab, self.load_results.get(tab, True)))
+            return
+
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        waiter = (respond, timer)
+
+        def timed_out():
+            waiters = self.load_waiters.get(tab, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+            respond(error=RpcError(TIMEOUT_ERROR, f"Tab {tab} still loading after {timeout} s"))
+            timer.deleteLater()
+
+        timer.timeout.connect(timed_out)
+        timer.start(int(timeout * 1000))
+        self.load_waiters.setdefault(tab, []).append(waiter)
+
+    def run_js(self, respond, tab, script):
+        self.live_tab(tab).webview.page().runJavaScript(script, lambda result: respond(result))
+
+    def get_html(self, respond, tab):
+        self.live_tab(tab).webview.page().toHtml(lambda html: respond(html))
+
+    def screenshot(self, respond, tab, path=None):
+        """PNG of the tab's view. Hidden views don't paint, so the tab is
+        brought to the front first."""
+        browser_tab = self.live_tab(tab)
+        if self.browser.tabs.currentWidget() is browser_tab:
+            delay = 0
+        else:
+            self.browser.tabs.setCurrentWidget(browser_tab)
+            delay = SCREENSHOT_DELAY
+
+        def grab():
+            if self.tabs.get(tab) is not browser_tab or browser_tab.webview is None:
+                respond(error=RpcError(SERVER_ERROR, f"Tab {tab} was closed"))
+                return
+            pixmap = browser_tab.webview.grab()
+            if path:
+                if not pixmap.save(path, "PNG"):
+                    respond(error=RpcError(SERVER_ERROR, f"Could not write {path}"))
+                    return
+                respond({'path': path})
+                return
+            data = QByteArray()
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.WriteOnly)
+            pixmap.save(buffer, "PNG")
+            respond({'png': base64.b64encode(bytes(data)).decode('ascii')})
+
+        QTimer.singleShot(delay, grab)
+
+    def close_tab(self, respond, tab):
+        browser_tab = self.live_tab(tab)
+        self.forget_tab(tab)
+        if self.browser.tabs.count() <= 1:
+            # Closing the last tab would close the browser
+            self.browser.add_new_tab()
+        self.browser.close_current_tab(self.browser.tabs.indexOf(browser_tab))
+        respond()
+
+    def list_tabs(self, respond):
+        tabs = []
+        for tab in self.browser.tab_lifecycle.browser_tabs():
+            view = tab.webview
+            tabs.append({'tab': self.tab_id(tab),
+                         'url': view.url().toString() if view else tab.saved_url,
+                         'title': view.title() if view else tab.saved_title,
+                         'loading': tab.is_loading,
+                         'current': tab is self.browser.tabs.currentWidget()})
+        respond(tabs)
@@ -0,0 +1,21 @@
+SESSION_FILE = "session.json"
+SESSION_VERSION = 1
+SAVE_DELAY = 1000  # ms of quiet before a changed session is handed to the store
+
+
+def load_session(store):
+    """The session saved in a JsonStore as {"current": index, "tabs": [...]}, or None."""
+    session = store.load(SESSION_FILE)
+    if (not isinstance(session, dict) or session.get('version') != SESSION_VERSION
+            or not session.get('tabs')):
+        return None
+    return session
+
+
+def save_session(store, tabs, current):
+    """Hand the tab list to the store's writer thread, which writes it atomically.
+
+    tabs must not be mutated afterwards; session entries are replaced, not
+    edited, when a tab changes.
+    """
+    store.save(SESSION_FILE, {'version': SESSION_VERSION, 'current': current, 'tabs': tabs})
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import pathlib
+from urllib.parse import quote_plus
+
+# Only QtCore and QtNetwork: a second launch gets here before QtWidgets or
+# QtWebEngine are imported
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+from storage import APP_DIR_NAME, data_dir
+
+CONNECT_TIMEOUT = 250  # ms to reach a running browser before starting a new one
+REPLY_TIMEOUT = 30000  # ms for it to confirm the URLs were taken; it may still be starting
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+def server_name():
+    """Socket name shared by every launch using the same data directory."""
+    digest = hashlib.sha1(data_dir().encode()).hexdigest()[:12]
+    return f"{APP_DIR_NAME}-{digest}"
+
+
+def normalize_url(arg):
+    """Turn a command line argument into a URL the way the address bar would.
+
+    Paths are resolved here, in the launching process, since the running
+    browser has its own working directory.
+    """
+    if os.path.exists(arg):
+        return pathlib.Path(arg).resolve().as_uri()
+    if "://" in arg or arg.startswith(("about:", "data:")):
+        return arg
+    if "." in arg and " " not in arg:
+        return "https://" + arg
+    return "https://www.google.com/search?q=" + quote_plus(arg)
+
+
+def server_running(name, timeout=CONNECT_TIMEOUT):
+    """Whether a live process accepts connections on the local socket name."""
+    socket = QLocalSocket()
+    socket.connectToServer(name)
+    running = socket.waitForConnected(timeout)
+    socket.abort()
+    return running
+
+
+def forward_urls(urls, name=None, timeout=CONNECT_TIMEOUT):
+    """Hand urls to a running browser. Returns False if none is running.
+
+    The whole batch goes as one JSON line; the browser answers once it has
+    queued the tabs, so returning True means the URLs were delivered.
+    Blocking calls only, so no QCoreApplication or event loop is needed.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(name or server_name())
+    if not socket.waitForConnected(timeout):
+        return False
+    socket.write(json.dumps({'urls': list(urls)}).encode() + b"\n")
+    while socket.bytesToWrite() and socket.waitForBytesWritten(REPLY_TIMEOUT):
+        pass
+    while not socket.canReadLine() and socket.waitForReadyRead(REPLY_TIMEOUT):
+        pass
+    delivered = bytes(socket.readLine()).strip() == b"ok"
+    if not delivered:
+        print(f"Error forwarding URLs to the running browser: {socket.errorString()}")
+    socket.disconnectFromServer()
+    return delivered
+
+
+class InstanceServer(QObject):
+    """Listens for later launches and passes on the URLs they forward.
+
+    Each connection sends one JSON line, {"urls": [...]}, and gets "ok"
+    back after urls_received has been emitted with the list.
+    """
+    urls_received = pyqtSignal(object)
+
+    def __init__(self, parent=None, name=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self.server = QLocalServer(self)
+        # Other users on the machine can't open tabs in this browser
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.accept_connections)
+
+    def listen(self):
+        """Claim the name. False if another browser holds it or it failed."""
+        # Asked first: with socket options set, Qt binds elsewhere and renames
+        # the socket into place, which would replace a live browser's socket
+        if server_running(self.name):
+            return False  # Another launch claimed it while this one started
+        if self.server.listen(self.name):
+            return True
+        # Left behind by a browser that crashed
+        QLocalServer.removeServer(self.name)
+        if self.server.listen(self.name):
+            return True
+        print(f"Error listening for other launches: {self.server.errorString()}")
+        return False
+
+    def accept_connections(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self.read_request(socket))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def read_request(self, socket):
+        if not socket.canReadLine():
+            if socket.bytesAvailable() > MAX_REQUEST_BYTES:
+                socket.abort()
+            return
+        try:
+            urls = json.loads(bytes(socket.readLine()))['urls']
+            urls = [url for url in urls if isinstance(url, str)]
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Error reading forwarded URLs: {e}")
+            socket.abort()
+            return
+        self.urls_received.emit(urls)
+        socket.write(b"ok\n")
+        socket.disconnectFromServer()
+
+    def close(self):
+        self.server.close()
@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+STARTUP_LOG = "startup_log.json"
+STARTUP_LOG_RUNS = 100  # runs kept in the log
+STARTUP_TRACE = "startup_trace.json"
+
+
+class StartupTimeline:
+    """Named points in time since the process started its Python code.
+
+    mark() records a name once; later marks with the same name are
+    ignored, so hooks like "first-paint" can run on every event. Times are
+    in milliseconds relative to when the timeline was created, which should
+    be as early as possible in the main script. Phases are named spans of
+    startup work; with trace_path set (--profile-startup) they are written
+    out as a Chrome trace once startup is over.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = {}  # name -> ms since origin, in the order reached
+        self.phases = {}  # name -> (start ms, end ms)
+        self.trace_path = None
+        self.trace_written = False
+
+    def now(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = self.now()
+        return self.marks[name]
+
+    def add_phase(self, name, start, end):
+        self.phases.setdefault(name, (start, end))
+
+    @contextmanager
+    def phase(self, name):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start, self.now())
+
+    def has(self, name):
+        return name in self.marks
+
+    def summary(self):
+        return "  ".join(f"{name} {ms:.0f} ms" for name, ms in self.marks.items())
+
+    def breakdown(self):
+        lines = [f"  {name:16} {end - start:8.1f} ms  (at {start:.1f} ms)"
+                 for name, (start, end) in sorted(self.phases.items(), key=lambda item: item[1])]
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Phases and marks in the Trace Event Format read by chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        events = [{'name': name, 'cat': 'startup', 'ph': 'X', 'pid': pid, 'tid': 1,
+                   'ts': start * 1000, 'dur': (end - start) * 1000}
+                  for name, (start, end) in self.phases.items()]
+        events += [{'name': name, 'cat': 'startup', 'ph': 'i', 's': 'g', 'pid': pid, 'tid': 1,
+                    'ts': ms * 1000} for name, ms in self.marks.items()]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self):
+        """Write the Chrome trace once, if profiling was asked for."""
+        if not self.trace_path or self.trace_written:
+            return
+        self.trace_written = True
+        try:
+            with open(self.trace_path, 'w') as f:
+                json.dump(self.chrome_trace(), f, indent=1)
+            print(f"Startup: {self.summary()}\nStartup phases:\n{self.breakdown()}\n"
+                  f"Trace written to {self.trace_path}")
+        except Exception as e:
+            print(f"Error writing startup trace: {e}")
+
+    def save(self, storage):
+        """Append this run to the startup log, keeping the last STARTUP_LOG_RUNS.
+
+        The log is read on a worker thread and written atomically by the
+        JsonStore's writer, so the GUI thread does no file I/O.
+        """
+        record = {'time': time.time(), 'marks': dict(self.marks)}
+
+        def append():
+            runs = storage.load(STARTUP_LOG, [])
+            if not isinstance(runs, list):
+                runs = []
+            storage.save(STARTUP_LOG, runs[-(STARTUP_LOG_RUNS - 1):] + [record])
+
+        threading.Thread(target=append, name="startup-log", daemon=True).start()
@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+APP_DIR_NAME = "Browser_2.0"
+WRITE_DELAY = 1.0  # seconds of quiet before dirty files are written
+MAX_WRITE_DELAY = 5.0  # ... but a steady stream of saves waits no longer than this
+# Older versions kept their files next to the script (run from its own
+# directory). Only that directory is migrated from, never an arbitrary
+# working directory whose files happen to share a name.
+LEGACY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def data_dir():
+    """Per-user data directory, $XDG_DATA_HOME/Browser_2.0 by default."""
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"),
+                                                            ".local", "share")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def migrate_file(name, directory, legacy_dir=LEGACY_DIR, suffixes=()):
+    """Copy name over from legacy_dir if only legacy_dir has it.
+
+    The legacy copy is left where it is. Files named name + suffix (an
+    SQLite database's -wal and -shm) are copied first, and name itself last
+    through a temp file, so an interrupted copy is redone on the next call.
+    """
+    path = os.path.join(directory, name)
+    if legacy_dir is None or os.path.exists(path):
+        return
+    legacy_path = os.path.join(legacy_dir, name)
+    if not os.path.exists(legacy_path):
+        return
+    try:
+        for suffix in suffixes:
+            if os.path.exists(legacy_path + suffix):
+                shutil.copy2(legacy_path + suffix, path + suffix)
+        shutil.copy2(legacy_path, path + ".tmp")
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Error copying {name} to {directory}: {e}")
+
+
+def data_path(name, legacy_dir=LEGACY_DIR, suffixes=()):
+    """Path of name in data_dir(), copied from where older versions kept it."""
+    directory = data_dir()
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    migrate_file(name, directory, legacy_dir, suffixes)
+    return os.path.join(directory, name)
+
+
+def write_json_atomic(path, data, indent=None):
+    """Write data as JSON so that path holds either the old or the new file.
+
+    The temp file is fsynced before the rename and the directory after it,
+    so a crash at any point never leaves a truncated file behind.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    try:
+        dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return  # Directories can't be opened on Windows
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class JsonStore:
+    """JSON files in the data directory, written on a background thread.
+
+    save() only records the latest data for a file name and marks it dirty,
+    so it is cheap enough to call after every change on the GUI thread.
+    Callers pass a snapshot the GUI will not mutate afterwards. The writer
+    thread waits until saves have been quiet for `delay` (at most
+    MAX_WRITE_DELAY), then writes each dirty file once with
+    write_json_atomic. Files older versions left in LEGACY_DIR are copied
+    over the first time they are loaded.
+    """
+
+    def __init__(self, directory=None, delay=WRITE_DELAY, legacy_dir=LEGACY_DIR):
+        self.directory = directory or data_dir()
+        self.delay = delay
+        self.legacy_dir = legacy_dir
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+        self._dirty = {}  # name -> (data, indent)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._urgent = False  # skip the debounce, set by flush() and close()
+        self._closed = False
+        self.write_count = 0
+
+        self._writer = threading.Thread(target=self._run_writer, name="store-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def migrate(self, name):
+        """Copy name over from the legacy directory if only it has a copy."""
+        migrate_file(name, self.directory, self.legacy_dir)
+
+    def load(self, name, default=None):
+        self.migrate(name)
+        with self._lock:
+            if name in self._dirty:
+                # Not written yet; the pending data is the newest
+                return self._dirty[name][0]
+        try:
+            path = self.path(name)
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading {name}: {e}")
+        return default
+
+    def save(self, name, data, indent=None):
+        with self._lock:
+            if self._closed:
+                return
+            self._dirty[name] = (data, indent)
+            self._idle.clear()
+        self._wake.set()
+
+    def _run_writer(self):
+        while True:
+            self._wake.wait()
+            # Debounce: keep waiting while saves keep arriving
+            deadline = time.monotonic() + MAX_WRITE_DELAY
+            while True:
+                self._wake.clear()
+                timeout = min(self.delay, deadline - time.monotonic())
+                if self._urgent or timeout <= 0 or not self._wake.wait(timeout):
+                    break
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+            for name, (data, indent) in dirty.items():
+                try:
+                    write_json_atomic(self.path(name), data, indent)
+                    self.write_count += 1
+                except Exception as e:
+                    print(f"Error saving {name}: {e}")
+            with self._lock:
+                if self._dirty:
+                    self._wake.set()
+                else:
+                    self._urgent = self._closed
+                    self._idle.set()
+                    if self._closed:
+                        break
+
+    def flush(self, timeout=None):
+        """Write everything dirty now and block until it is on disk."""
+        with self._lock:
+            if self._idle.is_set():
+                return True
+            self._urgent = True
+        self._wake.set()
+        return self._idle.wait(timeout)
+
+    def close(self):
+        """Final flush; later saves are ignored."""
+        with self._lock:
+            self._urgent = True
+            self._closed = True
+        self._wake.set()
+        self._writer.join()